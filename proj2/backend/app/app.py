@@ -48,11 +48,11 @@ def create_app(config_name):
     login_manager.login_view = None  
     login_manager.session_protection = None  
 
-    # Reload the user object from the stored session id for authenticated requests.
+    # Reload the user identity from the stored session id, served from a bounded TTL cache.
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models import Users
-        return Users.query.filter_by(id=int(user_id)).first()
+        from app.services.user_service import UserService
+        return UserService().load_session_user(int(user_id))
 
     # Standard unauthorized handler returning JSON 401 for API clients.
     @login_manager.unauthorized_handler
@@ -76,5 +76,9 @@ def create_app(config_name):
     app.register_blueprint(supplier_bp)
     app.register_blueprint(driver_bp)
 
+    # Register maintenance CLI commands (flask <command>).
+    from app.commands import register_commands
+    register_commands(app)
+
     # Return the configured application instance.
     return app
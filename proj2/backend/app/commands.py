@@ -0,0 +1,42 @@
+import click
+
+
+def register_commands(app):
+    """Attach maintenance commands to the app's Flask CLI.
+
+    Args:
+        app: The Flask application instance.
+    """
+
+    # Release expired seat holds; meant to run every minute or so from cron
+    @app.cli.command('sweep-seat-holds')
+    @click.option('--batch-size', default=500, show_default=True, help='Holds deleted per statement.')
+    def sweep_seat_holds(batch_size):
+        from app.services.seat_hold_service import SeatHoldService
+        removed = SeatHoldService().sweep_expired(batch_size=batch_size)
+        click.echo(f'Released {removed} expired seat holds')
+
+    # Rebuild "customers also added" neighbors from delivery history; meant to run nightly
+    @app.cli.command('build-product-neighbors')
+    @click.option('--top-k', default=10, show_default=True, help='Neighbors kept per product.')
+    @click.option('--batch-size', default=5000, show_default=True, help='History rows streamed per round trip.')
+    def build_product_neighbors(top_k, batch_size):
+        from app.services.co_purchase_service import CoPurchaseService
+        written = CoPurchaseService().build_neighbors(top_k=top_k, batch_size=batch_size)
+        click.echo(f'Wrote {written} product neighbor rows')
+
+    # Recompute supplier sales rollups from delivery history; for backfills and repairs
+    @app.cli.command('rebuild-sales-rollup')
+    @click.option('--start-date', default=None, help='First day to rebuild (YYYY-MM-DD); all history if omitted.')
+    @click.option('--end-date', default=None, help='Last day to rebuild (YYYY-MM-DD); all history if omitted.')
+    def rebuild_sales_rollup(start_date, end_date):
+        from app.services.sales_rollup_service import SalesRollupService
+        written = SalesRollupService().rebuild(start_date=start_date, end_date=end_date)
+        click.echo(f'Wrote {written} supplier sales rollup rows')
+
+    # Recompute showing occupancy and theatre revenue summaries; for backfills and repairs
+    @app.cli.command('rebuild-theatre-stats')
+    def rebuild_theatre_stats():
+        from app.services.theatre_stats_service import TheatreStatsService
+        written = TheatreStatsService().rebuild()
+        click.echo(f"Wrote {written['showings']} showing occupancy rows and {written['revenue_days']} theatre revenue rows")
@@ -65,6 +65,7 @@ class Staff(db.Model):
     is_available = db.Column(db.Boolean, nullable = False, server_default = expression.false())
     date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
     last_updated = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp(), server_onupdate = func.current_timestamp())
+    __table_args__ = (db.Index('idx_staff_theatre_available', 'theatre_id', 'is_available', 'last_updated'),)
 
     def __repr__(self):
         return f'<Staff user_id = {self.user_id} theatre_id = {self.theatre_id} role = {self.role} is_available = {self.is_available}>'
@@ -115,11 +116,24 @@ class CustomerShowings(db.Model):
     seat_id = db.Column(db.BigInteger, db.ForeignKey('seats.id'), nullable = False)
     date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
     last_updated = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp(), server_onupdate = func.current_timestamp())
-    __table_args__ = (db.UniqueConstraint('movie_showing_id', 'seat_id', name = 'unique_movie_seat'),)
+    __table_args__ = (db.UniqueConstraint('movie_showing_id', 'seat_id', name = 'unique_movie_seat'), db.Index('idx_customer_showings_customer', 'customer_id'))
 
     def __repr__(self):
         return f'<Customer Showings id = {self.id} customer_id = {self.customer_id} movie_showing_id = {self.movie_showing_id} seat_id = {self.seat_id}>'
 
+class SeatHolds(db.Model):
+    __tablename__ = 'seat_holds'
+    id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
+    customer_id = db.Column(db.BigInteger, db.ForeignKey('customers.user_id', ondelete='CASCADE'), nullable = False)
+    movie_showing_id = db.Column(db.BigInteger, db.ForeignKey('movie_showings.id', ondelete='CASCADE'), nullable = False)
+    seat_id = db.Column(db.BigInteger, db.ForeignKey('seats.id', ondelete='CASCADE'), nullable = False)
+    expires_at = db.Column(db.DateTime, nullable = False)
+    date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
+    __table_args__ = (db.UniqueConstraint('movie_showing_id', 'seat_id', name = 'unique_seat_hold'), db.Index('idx_seat_holds_expires_at', 'expires_at'))
+
+    def __repr__(self):
+        return f'<Seat Holds id = {self.id} customer_id = {self.customer_id} movie_showing_id = {self.movie_showing_id} seat_id = {self.seat_id} expires_at = {self.expires_at}>'
+
 
 class PaymentMethods(db.Model):
     __tablename__ = 'payment_methods'
@@ -148,9 +162,14 @@ class Drivers(db.Model):
     duty_status = db.Column(db.Enum('unavailable', 'available', 'on_delivery'), server_default = 'unavailable', nullable = False)
     rating = db.Column(DECIMAL(3,2), server_default = u'5.00', nullable = False)
     total_deliveries = db.Column(db.Integer, server_default = '0', nullable = False)
+    rating_sum = db.Column(DECIMAL(12,2), server_default = u'0.00', nullable = False)
+    rating_count = db.Column(INTEGER(unsigned = True), server_default = '0', nullable = False)
+    is_rated = db.Column(db.Boolean, db.Computed('rating_count > 0', persisted = True), nullable = False)
+    recent_ratings = db.Column(db.String(64), server_default = '', nullable = False)
+    total_earnings = db.Column(DECIMAL(14,2), server_default = u'0.00', nullable = False)
     date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
     last_updated = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp(), server_onupdate = func.current_timestamp())
-    __table_args__ = (db.CheckConstraint('rating >= 0.00 AND rating <= 5.00', name = 'check_driver_rating'),)
+    __table_args__ = (db.CheckConstraint('rating >= 0.00 AND rating <= 5.00', name = 'check_driver_rating'), db.Index('idx_drivers_status_rating', 'duty_status', 'rating'), db.Index('idx_drivers_rating', 'is_rated', 'rating', 'user_id'))
 
     def __repr__(self):
         return f'<Drivers user_id = {self.user_id} license_plate = {self.license_plate!r} vehicle_type = {self.vehicle_type} duty_status = {self.duty_status} rating = {self.rating} total_deliveries = {self.total_deliveries}>'
@@ -182,7 +201,7 @@ class Products(db.Model):
     is_available = db.Column(db.Boolean, server_default = expression.true(), nullable = False)
     date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
     last_updated = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp(), server_onupdate = func.current_timestamp())
-    __table_args__ = (db.CheckConstraint('unit_price >= 0.00', name = 'check_product_price'), db.CheckConstraint('inventory_quantity >= 0', name = 'check_product_inventory'), db.UniqueConstraint('supplier_id', 'name', name = 'unique_supplier_product'), db.CheckConstraint('discount >= 0.00', name = 'check_discount_value'))
+    __table_args__ = (db.CheckConstraint('unit_price >= 0.00', name = 'check_product_price'), db.CheckConstraint('inventory_quantity >= 0', name = 'check_product_inventory'), db.UniqueConstraint('supplier_id', 'name', name = 'unique_supplier_product'), db.CheckConstraint('discount >= 0.00', name = 'check_discount_value'), db.Index('idx_products_available_supplier_name', 'is_available', 'supplier_id', 'name'))
 
     def __repr__(self):
         return f'<Products id = {self.id} name = {self.name!r} category = {self.category} supplier_id = {self.supplier_id} unit_price = {self.unit_price} size = {self.size} inventory_quantity = {self.inventory_quantity} is_available = {self.is_available}>'
@@ -201,7 +220,7 @@ class Deliveries(db.Model):
     is_rated = db.Column(db.Boolean, server_default = expression.false(), nullable = False)
     date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
     last_updated = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp(), server_onupdate = func.current_timestamp())
-    __table_args__ = (db.CheckConstraint('total_price >= 0.00', name = 'check_total_price'),)
+    __table_args__ = (db.CheckConstraint('total_price >= 0.00', name = 'check_total_price'), db.Index('idx_deliveries_driver_status', 'driver_id', 'delivery_status'), db.Index('idx_deliveries_status', 'delivery_status', 'id'))
 
     def __repr__(self):
         return f'<Deliveries id = {self.id} driver_id = {self.driver_id} customer_showing_id = {self.customer_showing_id} payment_method_id = {self.payment_method_id} staff_id = {self.staff_id} payment_status = {self.payment_status} total_price = {self.total_price} delivery_time = {self.delivery_time} delivery_status = {self.delivery_status}>'
@@ -211,6 +230,8 @@ class DeliveryItems(db.Model):
     id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
     cart_item_id = db.Column(db.BigInteger, db.ForeignKey('cart_items.id'), nullable = False)
     delivery_id = db.Column(db.BigInteger, db.ForeignKey('deliveries.id', ondelete='CASCADE'), nullable = False)
+    quantity = db.Column(INTEGER(unsigned = True))
+    line_total = db.Column(DECIMAL(12,2))
     __table_args__ = (db.UniqueConstraint('delivery_id', 'cart_item_id', name = 'unique_delivery_item'),)
 
     def __repr__(self):
@@ -225,4 +246,67 @@ class CartItems(db.Model):
     __table_args__ = (db.UniqueConstraint('customer_id', 'product_id', name = 'unique_customer_product'), db.CheckConstraint('quantity > 0', name = 'check_cart_quantity'))
 
     def __repr__(self):
-        return f'<Cart Items id = {self.id} customer_id = {self.customer_id} product id = {self.product_id} quantity = {self.quantity}>'
\ No newline at end of file
+        return f'<Cart Items id = {self.id} customer_id = {self.customer_id} product id = {self.product_id} quantity = {self.quantity}>'
+
+class PaymentTransactions(db.Model):
+    __tablename__ = 'payment_transactions'
+    id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
+    payment_method_id = db.Column(db.BigInteger, db.ForeignKey('payment_methods.id', ondelete='CASCADE'), nullable = False)
+    delivery_id = db.Column(db.BigInteger, db.ForeignKey('deliveries.id', ondelete='SET NULL'))
+    kind = db.Column(db.Enum('charge', 'refund', 'top_up'), nullable = False)
+    amount = db.Column(DECIMAL(12,2), nullable = False)
+    date_added = db.Column(db.DateTime(timezone = True), nullable = False, server_default = func.current_timestamp())
+    __table_args__ = (db.CheckConstraint('amount > 0.00', name = 'check_transaction_amount'), db.Index('idx_payment_transactions_method', 'payment_method_id', 'id'))
+
+    def __repr__(self):
+        return f'<Payment Transactions id = {self.id} payment_method_id = {self.payment_method_id} delivery_id = {self.delivery_id} kind = {self.kind} amount = {self.amount}>'
+
+class ProductNeighbors(db.Model):
+    __tablename__ = 'product_neighbors'
+    id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
+    product_id = db.Column(db.BigInteger, db.ForeignKey('products.id', ondelete='CASCADE'), nullable = False)
+    neighbor_id = db.Column(db.BigInteger, db.ForeignKey('products.id', ondelete='CASCADE'), nullable = False)
+    co_count = db.Column(INTEGER(unsigned = True), nullable = False)
+    score = db.Column(db.Float, nullable = False)
+    __table_args__ = (db.UniqueConstraint('product_id', 'neighbor_id', name = 'unique_product_neighbor'),)
+
+    def __repr__(self):
+        return f'<Product Neighbors product_id = {self.product_id} neighbor_id = {self.neighbor_id} co_count = {self.co_count} score = {self.score}>'
+
+class SupplierSalesDaily(db.Model):
+    __tablename__ = 'supplier_sales_daily'
+    id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
+    supplier_id = db.Column(db.BigInteger, db.ForeignKey('suppliers.user_id', ondelete='CASCADE'), nullable = False)
+    product_id = db.Column(db.BigInteger, db.ForeignKey('products.id', ondelete='CASCADE'), nullable = False)
+    sales_date = db.Column(db.Date, nullable = False)
+    units = db.Column(db.Integer, server_default = '0', nullable = False)
+    revenue = db.Column(DECIMAL(14,2), server_default = u'0.00', nullable = False)
+    __table_args__ = (db.UniqueConstraint('supplier_id', 'sales_date', 'product_id', name = 'unique_supplier_sales_day'),)
+
+    def __repr__(self):
+        return f'<Supplier Sales Daily supplier_id = {self.supplier_id} product_id = {self.product_id} sales_date = {self.sales_date} units = {self.units} revenue = {self.revenue}>'
+
+class ShowingOccupancy(db.Model):
+    __tablename__ = 'showing_occupancy'
+    movie_showing_id = db.Column(db.BigInteger, db.ForeignKey('movie_showings.id', ondelete='CASCADE'), primary_key = True)
+    theatre_id = db.Column(db.BigInteger, db.ForeignKey('theatres.id', ondelete='CASCADE'), nullable = False)
+    auditorium_id = db.Column(db.BigInteger, db.ForeignKey('auditoriums.id', ondelete='CASCADE'), nullable = False)
+    start_time = db.Column(db.DateTime, nullable = False)
+    capacity = db.Column(INTEGER(unsigned = True), server_default = '0', nullable = False)
+    booked_seats = db.Column(INTEGER(unsigned = True), server_default = '0', nullable = False)
+    __table_args__ = (db.Index('idx_showing_occupancy_theatre_start', 'theatre_id', 'start_time'),)
+
+    def __repr__(self):
+        return f'<Showing Occupancy movie_showing_id = {self.movie_showing_id} theatre_id = {self.theatre_id} booked_seats = {self.booked_seats} capacity = {self.capacity}>'
+
+class TheatreRevenueDaily(db.Model):
+    __tablename__ = 'theatre_revenue_daily'
+    id = db.Column(db.BigInteger, primary_key = True, autoincrement = True)
+    theatre_id = db.Column(db.BigInteger, db.ForeignKey('theatres.id', ondelete='CASCADE'), nullable = False)
+    sales_date = db.Column(db.Date, nullable = False)
+    deliveries = db.Column(db.Integer, server_default = '0', nullable = False)
+    revenue = db.Column(DECIMAL(14,2), server_default = u'0.00', nullable = False)
+    __table_args__ = (db.UniqueConstraint('theatre_id', 'sales_date', name = 'unique_theatre_revenue_day'),)
+
+    def __repr__(self):
+        return f'<Theatre Revenue Daily theatre_id = {self.theatre_id} sales_date = {self.sales_date} deliveries = {self.deliveries} revenue = {self.revenue}>'
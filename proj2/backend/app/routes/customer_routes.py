@@ -1,5 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from app.services.customer_service import CustomerService
+from app.services.seat_map_service import SeatMapService
+from app.services.seat_hold_service import SeatHoldService
+from app.services.pagination import parse_limit, next_cursor, InvalidPageError
+from app.services.cache import menu_cache
+from app.services.password_hashing import HashingBusyError
+import hashlib
+import json
 
 
 # Blueprint for customer-related endpoints
@@ -8,6 +15,8 @@ customer_bp = Blueprint('customer', __name__, url_prefix='/api')
 
 # CustomerService instance
 customer_service = CustomerService()
+seat_map_service = SeatMapService()
+seat_hold_service = SeatHoldService()
 
 
 @customer_bp.route('/customers', methods=['POST'])
@@ -30,6 +39,7 @@ def create_customer():
             message: {type: string}
             customer: {$ref: '#/definitions/CustomerProfile'}
       400: {description: Invalid input}
+      503: {description: Password hashing is saturated; retry shortly}
     """
     try:
         data = request.get_json()
@@ -51,6 +61,8 @@ def create_customer():
         }), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -321,6 +333,47 @@ def add_funds(payment_method_id):
         return jsonify({'error': str(e)}), 500
 
 
+@customer_bp.route('/payment-methods/<int:payment_method_id>/transactions', methods=['GET'])
+def get_payment_transactions(payment_method_id):
+    """
+    Get Payment Method Transactions
+    ---
+    tags: [Payment Methods]
+    description: Lists the charges, refunds, and top-ups recorded for a payment method, newest first.
+    parameters:
+      - in: path
+        name: payment_method_id
+        type: integer
+        required: true
+        description: The ID of the payment method.
+    responses:
+      200:
+        description: Transactions retrieved
+        schema:
+          type: object
+          properties:
+            transactions:
+              type: array
+              items: {$ref: '#/definitions/PaymentTransaction'}
+      404: {description: Payment method not found}
+    """
+    try:
+        transactions = customer_service.get_payment_transactions(payment_method_id)
+        return jsonify({
+            'transactions': [{
+                'id': t.id,
+                'delivery_id': t.delivery_id,
+                'kind': t.kind,
+                'amount': float(t.amount),
+                'date_added': t.date_added.isoformat() if t.date_added else None
+            } for t in transactions]
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @customer_bp.route('/customers/<int:customer_id>/cart', methods=['POST'])
 def add_to_cart(customer_id):
     """
@@ -370,7 +423,7 @@ def get_cart(customer_id):
     Get Shopping Cart
     ---
     tags: [Shopping Cart]
-    description: Retrieves all items currently in the customer's shopping cart; returns an empty list if the cart is empty.
+    description: Retrieves all items currently in the customer's shopping cart; returns an empty list if the cart is empty. Also returns "customers also added" suggestions read from the precomputed product neighbor table.
     parameters:
       - in: path
         name: customer_id
@@ -386,15 +439,31 @@ def get_cart(customer_id):
             items:
               type: array
               items: {$ref: '#/definitions/CartItemDetails'}
+            suggestions:
+              type: array
+              items:
+                type: object
+                properties:
+                  product_id: {type: integer}
+                  name: {type: string}
+                  unit_price: {type: number, format: float}
+                  score: {type: number, format: float}
     """
     try:
         items = customer_service.get_cart_items(customer_id=customer_id) or []
+        suggestions = customer_service.get_cart_suggestions(items)
         return jsonify({
             'items': [{
                 'id': item.id,
                 'product_id': item.product_id,
                 'quantity': item.quantity
-            } for item in items]
+            } for item in items],
+            'suggestions': [{
+                'product_id': product.id,
+                'name': product.name,
+                'unit_price': float(product.unit_price),
+                'score': round(score, 4)
+            } for product, score in suggestions]
         }), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
@@ -519,6 +588,212 @@ def create_customer_showing(user_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@customer_bp.route('/showings/<int:showing_id>/seats', methods=['GET'])
+def get_seat_map(showing_id):
+    """
+    Get Seat Availability Map
+    ---
+    tags: [Movie Booking]
+    description: >
+      Returns which seats in the showing's auditorium are booked or held. Each
+      aisle lists runs of [start_number, start_seat_id, count] covering its seats
+      in number order, plus a base64 bitmap (most significant bit first) whose
+      i-th bit is set when the i-th seat is unavailable.
+    parameters:
+      - in: path
+        name: showing_id
+        type: integer
+        required: true
+        description: The ID of the movie showing.
+    responses:
+      200:
+        description: Seat map for the showing
+        schema:
+          type: object
+          properties:
+            showing_id: {type: integer}
+            auditorium_id: {type: integer}
+            total: {type: integer}
+            available: {type: integer}
+            aisles:
+              type: object
+              additionalProperties:
+                type: object
+                properties:
+                  runs: {type: array, items: {type: array, items: {type: integer}}}
+                  taken: {type: string}
+      404: {description: Showing not found}
+    """
+    try:
+        return jsonify(seat_map_service.get_seat_map(showing_id)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@customer_bp.route('/showings/<int:showing_id>/recommended-products', methods=['GET'])
+def get_recommended_products(showing_id):
+    """
+    Get Recommended Products For Showing
+    ---
+    tags: [Product Catalog]
+    description: Returns snacks whose keywords best match the showing's movie, ranked by cosine similarity. Pairings are precomputed per movie.
+    parameters:
+      - in: path
+        name: showing_id
+        type: integer
+        required: true
+        description: The ID of the movie showing.
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Number of products (default 5, max 20).
+    responses:
+      200:
+        description: Recommended products
+        schema:
+          type: object
+          properties:
+            movie_id: {type: integer}
+            products:
+              type: array
+              items:
+                type: object
+                properties:
+                  id: {type: integer}
+                  supplier_id: {type: integer}
+                  name: {type: string}
+                  unit_price: {type: number, format: float}
+                  category: {type: string}
+                  score: {type: number, format: float}
+      400: {description: Invalid limit}
+      404: {description: Showing not found}
+    """
+    try:
+        movie_id, pairings = customer_service.get_recommended_products(showing_id, limit=request.args.get('limit', 5))
+        return jsonify({
+            'movie_id': movie_id,
+            'products': [dict(product._asdict(), score=round(score, 4)) for product, score in pairings]
+        }), 200
+    except ValueError as e:
+        status = 404 if 'not found' in str(e) else 400
+        return jsonify({'error': str(e)}), status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@customer_bp.route('/customers/<int:user_id>/seat-holds', methods=['POST'])
+def acquire_seat_hold(user_id):
+    """
+    Hold Seat
+    ---
+    tags: [Movie Booking]
+    description: Holds a seat for the customer for a short time while they confirm the booking.
+    parameters:
+      - in: path
+        name: user_id
+        type: integer
+        required: true
+        description: The ID of the customer user.
+      - in: body
+        name: hold_details
+        schema: {$ref: '#/definitions/CustomerShowingCreate'}
+    responses:
+      201:
+        description: Seat held
+        schema:
+          type: object
+          properties:
+            hold_id: {type: integer}
+            expires_at: {type: string, format: date-time}
+      400: {description: Invalid input, or seat already booked or held}
+    """
+    try:
+        data = request.get_json()
+        hold = seat_hold_service.acquire_hold(
+            user_id=user_id,
+            movie_showing_id=data.get('movie_showing_id'),
+            seat_id=data.get('seat_id')
+        )
+        return jsonify({
+            'hold_id': hold.id,
+            'expires_at': hold.expires_at.isoformat()
+        }), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@customer_bp.route('/customers/<int:user_id>/seat-holds/<int:hold_id>/confirm', methods=['POST'])
+def confirm_seat_hold(user_id, hold_id):
+    """
+    Confirm Seat Hold
+    ---
+    tags: [Movie Booking]
+    description: Books the held seat and releases the hold.
+    parameters:
+      - in: path
+        name: user_id
+        type: integer
+        required: true
+      - in: path
+        name: hold_id
+        type: integer
+        required: true
+    responses:
+      201:
+        description: Showing booked successfully
+        schema:
+          type: object
+          properties:
+            message: {type: string}
+            customer_showing_id: {type: integer}
+      400: {description: Hold not found or expired, or seat already booked}
+    """
+    try:
+        customer_showing = seat_hold_service.confirm_hold(hold_id=hold_id, user_id=user_id)
+        return jsonify({
+            'message': 'Showing booked successfully',
+            'customer_showing_id': customer_showing.id
+        }), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@customer_bp.route('/customers/<int:user_id>/seat-holds/<int:hold_id>', methods=['DELETE'])
+def release_seat_hold(user_id, hold_id):
+    """
+    Release Seat Hold
+    ---
+    tags: [Movie Booking]
+    description: Releases a seat hold before it expires.
+    parameters:
+      - in: path
+        name: user_id
+        type: integer
+        required: true
+      - in: path
+        name: hold_id
+        type: integer
+        required: true
+    responses:
+      200: {description: Seat hold released}
+      404: {description: Hold not found}
+    """
+    try:
+        seat_hold_service.release_hold(hold_id=hold_id, user_id=user_id)
+        return jsonify({'message': 'Seat hold released'}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @customer_bp.route('/deliveries', methods=['POST'])
 def create_delivery():
     """
@@ -649,7 +924,18 @@ def list_products():
     List Available Menu Products
     ---
     tags: [Product Catalog]
-    description: Retrieves a list of all currently available concession products (the menu).
+    description: Retrieves one page of currently available concession products (the menu), ordered by supplier and name. Pages are cached per process and carry a strong ETag; send If-None-Match to receive 304 when unchanged.
+    parameters:
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next_cursor.
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200).
     responses:
       200:
         description: Products retrieved successfully
@@ -659,9 +945,74 @@ def list_products():
             products:
               type: array
               items: {$ref: '#/definitions/ProductMenu'}
+            next_cursor:
+              type: string
+              description: Cursor for the next page; null on the last page.
+      304: {description: Menu unchanged since the ETag in If-None-Match}
+      400: {description: Invalid cursor or limit}
     """
     try:
-        products = customer_service.show_all_products()
+        limit = parse_limit(request.args.get('limit'))
+        after = request.args.get('after')
+        cached = menu_cache.get((after, limit))
+        if cached is None:
+            products = customer_service.show_all_products(after=after, limit=limit)
+            body = json.dumps({
+                'products': [{
+                    'id': p.id,
+                    'supplier_id': p.supplier_id,
+                    'name': p.name,
+                    'unit_price': float(p.unit_price),
+                    'inventory_quantity': p.inventory_quantity,
+                    'category': p.category,
+                    'is_available': p.is_available
+                } for p in products],
+                'next_cursor': next_cursor(products, limit, customer_service.menu_sort_key)
+            }).encode('utf-8')
+            cached = (body, hashlib.sha256(body).hexdigest())
+            menu_cache.set((after, limit), cached)
+
+        body, etag = cached
+        response = Response(body, status=200, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@customer_bp.route('/products/search', methods=['GET'])
+def search_products():
+    """
+    Search Menu Products
+    ---
+    tags: [Product Catalog]
+    description: Searches available products by name, keywords, and category. Each word matches whole terms or their prefixes, and results are ranked best match first.
+    parameters:
+      - in: query
+        name: q
+        type: string
+        required: true
+        description: Search words, e.g. "cold swe".
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Maximum results (default 50, max 200).
+    responses:
+      200:
+        description: Matching products
+        schema:
+          type: object
+          properties:
+            products:
+              type: array
+              items: {$ref: '#/definitions/ProductMenu'}
+      400: {description: Missing query or invalid limit}
+    """
+    try:
+        products = customer_service.search_products(request.args.get('q'), limit=request.args.get('limit'))
         return jsonify({
             'products': [{
                 'id': p.id,
@@ -673,6 +1024,8 @@ def list_products():
                 'is_available': p.is_available
             } for p in products]
         }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -683,13 +1036,23 @@ def get_deliveries_for_customer(user_id):
     Get Customer Delivery History
     ---
     tags: [Delivery Operations (Customer)]
-    description: Retrieves a list of all delivery orders associated with the customer.
+    description: Retrieves one page of delivery orders associated with the customer, newest first.
     parameters:
       - in: path
         name: user_id
         type: integer
         required: true
         description: The ID of the customer user.
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next_cursor.
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200).
     responses:
       200:
         description: Deliveries retrieved successfully
@@ -699,10 +1062,15 @@ def get_deliveries_for_customer(user_id):
             deliveries:
               type: array
               items: {$ref: '#/definitions/DeliveryDetails'}
+            next_cursor:
+              type: string
+              description: Cursor for the next page; null on the last page.
+      400: {description: Invalid cursor or limit}
       404: {description: Customer not found}
     """
     try:
-        deliveries = customer_service.get_all_deliveries(user_id=user_id)
+        limit = parse_limit(request.args.get('limit'))
+        deliveries = customer_service.get_all_deliveries(user_id=user_id, after=request.args.get('after'), limit=limit)
         return jsonify({
             'deliveries': [{
                 'id': d.id,
@@ -713,8 +1081,11 @@ def get_deliveries_for_customer(user_id):
                 'total_price': float(d.total_price),
                 'payment_status': d.payment_status,
                 'delivery_status': d.delivery_status
-            } for d in deliveries]
+            } for d in deliveries],
+            'next_cursor': next_cursor(deliveries, limit, lambda d: [d.id])
         }), 200
+    except InvalidPageError as e:
+        return jsonify({'error': str(e)}), 400
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
     except Exception as e:
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.models import *
 from app.services.driver_service import DriverService
+from app.services.pagination import parse_limit, next_cursor, InvalidPageError
+from app.services.password_hashing import HashingBusyError
 
 
 # Blueprint for driver-related endpoints
@@ -50,6 +52,8 @@ def create_driver():
             user_id: {type: integer}
       400:
         description: Missing required fields or invalid input
+      503:
+        description: Password hashing is saturated; retry shortly
     """
     try:
         data = request.json
@@ -76,6 +80,8 @@ def create_driver():
         return jsonify({"message": "Driver created successfully", "user_id": driver.user_id}), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': f'An unexpected error occurred: {e}'}), 500
 
@@ -424,27 +430,20 @@ def get_active_delivery(driver_id):
     """
     try:
         service = DriverService()
-        delivery = service.get_active_delivery(driver_id)
-        delivery_items = DeliveryItems.query.filter_by(delivery_id=delivery.id).all()
-        cart_items = [CartItems.query.filter_by(id=item.cart_item_id).first() for item in delivery_items]
-        items = [{"name": Products.query.filter_by(id=item.product_id).first().name, "quantity": item.quantity} for item in cart_items]
-        customer_showing = CustomerShowings.query.filter_by(id=delivery.customer_showing_id).first()
-        showing = MovieShowings.query.filter_by(id=customer_showing.movie_showing_id).first()
-        auditorium = Auditoriums.query.filter_by(id=showing.auditorium_id).first()
-        theatre = Theatres.query.filter_by(id=auditorium.theatre_id).first()
+        details = service.get_active_delivery_details(driver_id)
         return jsonify({"active_delivery": {
-        "id": delivery.id,
-        "driver_id": delivery.driver_id,
-        "customer_showing_id": delivery.customer_showing_id,
-        "payment_method_id": delivery.payment_method_id,
-        "staff_id": delivery.staff_id,
-        "payment_status": delivery.payment_status,
-        "total_price": float(delivery.total_price),
-        "delivery_time": delivery.delivery_time.isoformat() if delivery.delivery_time else None,
-        "delivery_status": delivery.delivery_status,
-        "address": theatre.address,
-        "items": items
-    }}), 200
+            "id": details["id"],
+            "driver_id": details["driver_id"],
+            "customer_showing_id": details["customer_showing_id"],
+            "payment_method_id": details["payment_method_id"],
+            "staff_id": details["staff_id"],
+            "payment_status": details["payment_status"],
+            "total_price": details["total_price"],
+            "delivery_time": details["delivery_time"],
+            "delivery_status": details["delivery_status"],
+            "address": details["theatre_address"],
+            "items": details["items"]
+        }}), 200
     except ValueError as e:
         if "No active delivery found for driver" in str(e):
             return jsonify({"message": "No active delivery"}), 200
@@ -459,13 +458,23 @@ def show_completed_deliveries(driver_id):
     Get Delivery History
     ---
     tags: [Driver Views]
-    description: Retrieves a history of fulfilled delivery orders for a specific driver. Returns an informational message when none are found.
+    description: Retrieves one page of fulfilled delivery orders for a specific driver, newest first. Returns an informational message when none are found.
     parameters:
       - in: path
         name: driver_id
         type: integer
         required: true
         description: The ID of the driver's user account.
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next_cursor.
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200).
     responses:
       200:
         description: Delivery history retrieved or none found
@@ -475,21 +484,126 @@ def show_completed_deliveries(driver_id):
             history:
               type: array
               items: {$ref: '#/definitions/DeliveryHistoryItem'}
+            next_cursor:
+              type: string
+              description: Cursor for the next page; null on the last page.
             message:
               type: string
               description: Present when no previous deliveries exist.
+      400: {description: Invalid cursor or limit}
       404: {description: Driver not found}
     """
     try:
         service = DriverService()
-        deliveries = service.show_completed_deliveries(driver_id)
+        limit = parse_limit(request.args.get('limit'))
+        deliveries = service.show_completed_deliveries(driver_id, after=request.args.get('after'), limit=limit)
         
         return jsonify({
-            "history": [delivery_to_dict(d) for d in deliveries]
+            "history": [delivery_to_dict(d) for d in deliveries],
+            "next_cursor": next_cursor(deliveries, limit, lambda d: [d.id])
         }), 200
+    except InvalidPageError as e:
+        return jsonify({'error': str(e)}), 400
     except ValueError as e:
         if "No previous deliveries found for driver" in str(e):
             return jsonify({"message": "No previous deliveries found"}), 200
         return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': f'An unexpected error occurred: {e}'}), 500
+
+
+@driver_bp.route('/driver/<int:driver_id>/stats', methods=['GET'])
+def get_driver_stats(driver_id):
+    """
+    Get Driver Stats
+    ---
+    tags: [Driver Views]
+    description: Returns the driver's delivery count, earnings (order value of completed deliveries), and ratings, served from aggregates stored on the driver row.
+    parameters:
+      - in: path
+        name: driver_id
+        type: integer
+        required: true
+        description: The ID of the driver's user account.
+    responses:
+      200:
+        description: Driver stats retrieved
+        schema:
+          type: object
+          properties:
+            user_id: {type: integer}
+            total_deliveries: {type: integer}
+            total_earnings: {type: number, format: float}
+            rating: {type: number, format: float}
+            rating_count: {type: integer}
+            recent_ratings:
+              type: array
+              items: {type: number, format: float}
+            recent_average:
+              type: number
+              format: float
+              description: Average of the recent ratings; null until the driver is rated.
+      404: {description: Driver not found}
+    """
+    try:
+        service = DriverService()
+        return jsonify(service.get_driver_stats(driver_id)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {e}'}), 500
+
+
+@driver_bp.route('/drivers/leaderboard', methods=['GET'])
+def get_driver_leaderboard():
+    """
+    Driver Leaderboard
+    ---
+    tags: [Driver Views]
+    description: Lists the top-rated drivers, best first, read in rating index order.
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Number of drivers (default 10, max 200).
+      - in: query
+        name: min_ratings
+        type: integer
+        required: false
+        description: Minimum ratings received to qualify (default 1).
+    responses:
+      200:
+        description: Leaderboard retrieved
+        schema:
+          type: object
+          properties:
+            leaderboard:
+              type: array
+              items:
+                type: object
+                properties:
+                  rank: {type: integer}
+                  user_id: {type: integer}
+                  name: {type: string}
+                  rating: {type: number, format: float}
+                  rating_count: {type: integer}
+                  total_deliveries: {type: integer}
+      400: {description: Invalid limit or min_ratings}
+    """
+    try:
+        service = DriverService()
+        limit = parse_limit(request.args.get('limit')) if request.args.get('limit') else None
+        drivers = service.get_leaderboard(limit=limit, min_ratings=request.args.get('min_ratings', 1))
+        return jsonify({"leaderboard": [{
+            "rank": rank,
+            "user_id": driver.user_id,
+            "name": name,
+            "rating": float(driver.rating),
+            "rating_count": driver.rating_count,
+            "total_deliveries": driver.total_deliveries
+        } for rank, (driver, name) in enumerate(drivers, start=1)]}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {e}'}), 500
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app.models import *
 from app.services.staff_service import StaffService
+from app.services.pagination import parse_limit, next_cursor, InvalidPageError
+from app.services.password_hashing import HashingBusyError
+from app.services.reference_cache import reference_cache
 from datetime import datetime
 
 
@@ -38,6 +41,8 @@ def add_staff():
         description: Missing or invalid fields
       404:
         description: Unauthorized (manager not admin) or theatre not found
+      503:
+        description: Password hashing is saturated; retry shortly
     """
     try:
         user_id = get_user_id()
@@ -60,6 +65,8 @@ def add_staff():
         return jsonify({"message": "Staff member created successfully", "user_id": staff.user_id, "staff_role": staff.role}), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -155,7 +162,7 @@ def get_all_theatres():
               items: {$ref: '#/definitions/TheatreDetails'}
     """
     try:
-        return jsonify({'theatres': [{"id": t.id, "name": t.name, "address": t.address, "phone": t.phone, "is_open": t.is_open} for t in Theatres.query.all()]}), 200
+        return jsonify({'theatres': [{"id": t.id, "name": t.name, "address": t.address, "phone": t.phone, "is_open": t.is_open} for t in reference_cache.theatres()]}), 200
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
@@ -338,6 +345,58 @@ def remove_movie(movie_id):
         return jsonify({'error': str(e)}), 500
 
 
+@staff_bp.route('/auditoriums/<int:auditorium_id>/seats', methods=['POST'])
+def generate_seat_grid(auditorium_id):
+    """
+    Generate Auditorium Seat Grid
+    ---
+    tags: [Theatre Operations]
+    description: >
+      Creates every seat for an aisles x seats_per_aisle layout and sets the auditorium's
+      capacity to its seat count. Existing seats are kept, so the call is idempotent.
+      Requires staff user_id in the body for authorization (admin only).
+    parameters:
+      - in: path
+        name: auditorium_id
+        type: integer
+        required: true
+        description: The ID of the auditorium.
+      - in: body
+        name: layout
+        schema:
+          type: object
+          properties:
+            user_id: {type: integer, description: 'The staff manager user ID.'}
+            aisles: {type: integer, description: 'Number of aisles, lettered from A (1-26).'}
+            seats_per_aisle: {type: integer, description: 'Seats per aisle, numbered from 1 (1-100).'}
+    responses:
+      200:
+        description: Seat grid generated
+        schema:
+          type: object
+          properties:
+            auditorium_id: {type: integer}
+            created: {type: integer}
+            capacity: {type: integer}
+      400:
+        description: Missing aisles or seats_per_aisle
+      404:
+        description: Auditorium not found, invalid layout, or unauthorized
+    """
+    try:
+        user_id = get_user_id()
+        service = StaffService(user_id)
+        data = request.json
+        if 'aisles' not in data or 'seats_per_aisle' not in data:
+            return jsonify({"error": "Missing aisles or seats_per_aisle"}), 400
+        result = service.generate_seat_grid(auditorium_id, data['aisles'], data['seats_per_aisle'])
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @staff_bp.route('/showings', methods=['POST'])
 def add_showing():
     """
@@ -360,7 +419,7 @@ def add_showing():
       400:
         description: Missing fields or invalid start_time
       404:
-        description: Movie/Auditorium not found or unauthorized
+        description: Movie/Auditorium not found, showtime overlaps another showing, or unauthorized
     """
     try:
         user_id = get_user_id()
@@ -381,6 +440,70 @@ def add_showing():
         return jsonify({'error': str(e)}), 500
 
 
+@staff_bp.route('/showings/bulk', methods=['POST'])
+def bulk_add_showings():
+    """
+    Bulk Schedule Movie Showings
+    ---
+    tags: [Showings Scheduling]
+    description: >
+      Places every slot on every date in the range and creates all non-conflicting showings
+      in one transaction. Slots that overlap an existing showing (or each other) are reported
+      in failed without stopping the rest. Requires staff user_id in the body for authorization (admin only).
+    parameters:
+      - in: body
+        name: schedule
+        schema:
+          type: object
+          required: [start_date, end_date, slots]
+          properties:
+            user_id: {type: integer, description: 'The staff manager user ID.'}
+            start_date: {type: string, format: date}
+            end_date: {type: string, format: date}
+            slots:
+              type: array
+              items:
+                type: object
+                properties:
+                  movie_id: {type: integer}
+                  auditorium_id: {type: integer}
+                  time: {type: string, description: 'Start time as HH:MM.'}
+    responses:
+      201:
+        description: Schedule processed
+        schema:
+          type: object
+          properties:
+            created: {type: integer}
+            failed:
+              type: array
+              items:
+                type: object
+                properties:
+                  movie_id: {type: integer}
+                  auditorium_id: {type: integer}
+                  start_time: {type: string}
+                  error: {type: string}
+      400:
+        description: Missing fields, invalid date range, or malformed slots
+      404:
+        description: Unauthorized
+    """
+    try:
+        user_id = get_user_id()
+        service = StaffService(user_id)
+        data = request.json
+        required_fields = ['start_date', 'end_date', 'slots']
+        if not all(field in data for field in required_fields) or not isinstance(data['slots'], list):
+            return jsonify({"error": "Missing required fields"}), 400
+        result = service.bulk_add_showings(data['start_date'], data['end_date'], data['slots'])
+        return jsonify(result), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404 if str(e).startswith('Unauthorized') else 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @staff_bp.route('/showings/<int:showing_id>', methods=['PUT'])
 def edit_showing(showing_id):
     """
@@ -408,7 +531,7 @@ def edit_showing(showing_id):
       400:
         description: Missing fields or invalid start_time
       404:
-        description: Showing not found or unauthorized
+        description: Showing not found, showtime overlaps another showing, or unauthorized
     """
     try:
         user_id = get_user_id()
@@ -646,13 +769,28 @@ def list_deliveries_by_theatre(theatre_id):
     List Deliveries by Theatre
     ---
     tags: [Delivery Management]
-    description: Retrieves deliveries associated with a theatre ID. Intended for staff views.
+    description: Retrieves one page of deliveries associated with a theatre ID, newest first, optionally only those in one status. Intended for staff views.
     parameters:
       - in: path
         name: theatre_id
         type: integer
         required: true
         description: The ID of the theatre to list deliveries for.
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next_cursor.
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200).
+      - in: query
+        name: status
+        type: string
+        required: false
+        description: Only deliveries in this status (e.g. pending).
     responses:
       200:
         description: List of deliveries retrieved successfully
@@ -662,12 +800,20 @@ def list_deliveries_by_theatre(theatre_id):
             deliveries:
               type: array
               items: {$ref: '#/definitions/DeliveryDetails'}
+            next_cursor:
+              type: string
+              description: Cursor for the next page; null on the last page.
+      400:
+        description: Invalid cursor, limit, or status
       404:
         description: Theatre not found or unauthorized
     """
     try:
         service = StaffService(Staff.query.first().user_id)
-        deliveries = service.show_all_deliveries(theatre_id)
+        limit = parse_limit(request.args.get('limit'))
+        deliveries = service.show_all_deliveries(
+            theatre_id, after=request.args.get('after'), limit=limit, status=request.args.get('status')
+        )
         return jsonify({
             "deliveries": [{
                 "id": d.id,
@@ -678,10 +824,101 @@ def list_deliveries_by_theatre(theatre_id):
                 "total_price": float(d.total_price),
                 "payment_status": d.payment_status,
                 "delivery_status": d.delivery_status
-            } for d in deliveries]
+            } for d in deliveries],
+            "next_cursor": next_cursor(deliveries, limit, lambda d: [d.id])
         }), 200
+    except InvalidPageError as e:
+        return jsonify({'error': str(e)}), 400
     except ValueError as e:
-        return jsonify({'error': str(e)}), 404
+        return jsonify({'error': str(e)}), 400 if str(e).startswith('Invalid delivery status') else 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@staff_bp.route('/theatres/<int:theatre_id>/dashboard', methods=['GET'])
+def get_theatre_dashboard(theatre_id):
+    """
+    Theatre Dashboard
+    ---
+    tags: [Theatre Operations]
+    description: Returns per-showing occupancy (booked seats vs auditorium capacity) and daily concession revenue for a theatre over a date range, read from summary tables. Requires a staff admin user_id query parameter.
+    parameters:
+      - in: path
+        name: theatre_id
+        type: integer
+        required: true
+        description: The ID of the theatre.
+      - in: query
+        name: user_id
+        type: integer
+        required: true
+        description: The staff admin's user ID.
+      - in: query
+        name: start_date
+        type: string
+        format: date
+        required: false
+        description: First day (YYYY-MM-DD); defaults to 6 days before end_date.
+      - in: query
+        name: end_date
+        type: string
+        format: date
+        required: false
+        description: Last day, inclusive (YYYY-MM-DD); defaults to today.
+    responses:
+      200:
+        description: Dashboard retrieved successfully
+        schema:
+          type: object
+          properties:
+            theatre_id: {type: integer}
+            start_date: {type: string, format: date}
+            end_date: {type: string, format: date}
+            showings:
+              type: array
+              items:
+                type: object
+                properties:
+                  showing_id: {type: integer}
+                  auditorium_id: {type: integer}
+                  start_time: {type: string, format: date-time}
+                  booked_seats: {type: integer}
+                  capacity: {type: integer}
+                  occupancy: {type: number, format: float}
+            occupancy:
+              type: object
+              properties:
+                booked_seats: {type: integer}
+                capacity: {type: integer}
+                rate: {type: number, format: float}
+            revenue:
+              type: object
+              properties:
+                deliveries: {type: integer}
+                total: {type: number, format: float}
+                days:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      date: {type: string, format: date}
+                      deliveries: {type: integer}
+                      revenue: {type: number, format: float}
+      400:
+        description: Missing user_id, malformed date, or invalid date range
+      404:
+        description: Theatre not found or unauthorized
+    """
+    try:
+        user_id = request.args.get('user_id', type=int)
+        if user_id is None:
+            return jsonify({"error": "Missing user_id"}), 400
+        service = StaffService(user_id)
+        dashboard = service.get_dashboard(theatre_id, request.args.get('start_date'), request.args.get('end_date'))
+        return jsonify(dashboard), 200
+    except ValueError as e:
+        not_found = 'not found' in str(e) or str(e).startswith('Unauthorized')
+        return jsonify({'error': str(e)}), 404 if not_found else 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -167,6 +167,73 @@ def get_products(supplier_id):
 
 
 
+@supplier_bp.route('/suppliers/<int:supplier_id>/sales', methods=['GET'])
+def get_sales_report(supplier_id):
+    """
+    Supplier Sales Report
+    ---
+    tags: [Supplier Management]
+    description: Returns units sold and revenue per day and per product over a date range, read from the daily sales rollup. Cancelled deliveries are excluded.
+    parameters:
+      - in: path
+        name: supplier_id
+        type: integer
+        required: true
+        description: The supplier's user ID.
+      - in: query
+        name: start_date
+        type: string
+        format: date
+        required: false
+        description: First day (YYYY-MM-DD); defaults to 29 days before end_date.
+      - in: query
+        name: end_date
+        type: string
+        format: date
+        required: false
+        description: Last day, inclusive (YYYY-MM-DD); defaults to today.
+    responses:
+      200:
+        description: Sales report retrieved successfully
+        schema:
+          type: object
+          properties:
+            supplier_id: {type: integer}
+            start_date: {type: string, format: date}
+            end_date: {type: string, format: date}
+            units: {type: integer}
+            revenue: {type: number, format: float}
+            days:
+              type: array
+              items:
+                type: object
+                properties:
+                  date: {type: string, format: date}
+                  units: {type: integer}
+                  revenue: {type: number, format: float}
+            products:
+              type: array
+              items:
+                type: object
+                properties:
+                  product_id: {type: integer}
+                  units: {type: integer}
+                  revenue: {type: number, format: float}
+      400:
+        description: Invalid date range
+      404:
+        description: Supplier not found
+    """
+    try:
+        service = SupplierService(supplier_id)
+        report = service.get_sales_report(request.args.get('start_date'), request.args.get('end_date'))
+        return jsonify(report), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404 if 'not found' in str(e) else 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @supplier_bp.route('/products', methods=['POST'])
 def add_product():
     """
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from app.services.user_service import UserService
+from app.services.password_hashing import HashingBusyError
+from app.services.login_throttle import LoginThrottledError
 from datetime import timedelta
 
 
@@ -32,6 +34,8 @@ def register():
         description: Missing fields, invalid role, or duplicate email/phone
       500:
         description: Server error during registration
+      503:
+        description: Password hashing is saturated; retry shortly
     """
     try:
         data = request.get_json()
@@ -53,6 +57,8 @@ def register():
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': 'User registration failed: ' + str(e)}), 500
 
@@ -78,8 +84,12 @@ def login():
         description: Missing email or password
       401:
         description: Invalid email or password
+      429:
+        description: Too many failed attempts for this email or client; see Retry-After
       500:
         description: Server error during login
+      503:
+        description: Password hashing is saturated; retry shortly
     """
     try:
         data = request.get_json()
@@ -89,7 +99,7 @@ def login():
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
         
-        user = user_service.validate_credentials(email, password)
+        user = user_service.validate_credentials(email, password, client=request.remote_addr)
         
         if not user:
             return jsonify({'error': 'Invalid email or password'}), 401
@@ -106,6 +116,10 @@ def login():
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
+    except LoginThrottledError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         return jsonify({'error': 'Login failed'}), 500
 
@@ -325,6 +339,8 @@ def change_password():
         description: Unauthorized (login required)
       500:
         description: Server error during password change
+      503:
+        description: Password hashing is saturated; retry shortly
     """
     try:
         data = request.get_json()
@@ -344,5 +360,7 @@ def change_password():
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingBusyError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': 'Password change failed'}), 500
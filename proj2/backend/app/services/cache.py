@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A small thread-safe, per-process LRU cache with optional expiry.
+
+    Entries are evicted least-recently-used first once max_size is reached,
+    and treated as missing once older than ttl seconds (when ttl is set).
+    Writers that change the underlying data call invalidate() or clear().
+    """
+
+    def __init__(self, max_size=128, ttl=None):
+        """Create an empty cache.
+
+        Args:
+            max_size: Maximum number of entries kept.
+            ttl: Seconds an entry stays valid, or None for no expiry.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current size.
+
+        Returns:
+            dict: {'hits', 'misses', 'size', 'max_size'}.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+
+# Serialized /api/products/menu pages keyed by (after, limit); cleared on any catalog or stock change
+menu_cache = LRUCache(max_size=64, ttl=300)
+
+# Session identities for Flask-Login's user_loader keyed by user id; dropped on profile, password, or account changes
+user_cache = LRUCache(max_size=1024, ttl=60)
+
+# Encoded seat availability maps keyed by showing id; dropped when a booking for that showing changes
+seat_map_cache = LRUCache(max_size=512, ttl=30)
+
+
+def clear_all():
+    """Empty every module-level cache (used when the database is reset)."""
+    from app.services.reference_cache import reference_cache
+    from app.services.login_throttle import login_throttle
+    from app.services.product_search import product_search_index
+    from app.services.recommendation_service import pairing_recommender
+    menu_cache.clear()
+    user_cache.clear()
+    seat_map_cache.clear()
+    reference_cache.invalidate()
+    login_throttle.clear()
+    product_search_index.invalidate()
+    pairing_recommender.invalidate()
@@ -0,0 +1,170 @@
+from app.models import *
+from app.app import db
+import numpy as np
+
+
+def merge_counts(keys, counts):
+    """Sum counts that share a key.
+
+    Args:
+        keys: Array of integer keys, possibly repeated.
+        counts: Array of counts aligned with keys.
+
+    Returns:
+        tuple: (unique_keys, summed_counts), sorted by key.
+    """
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return unique_keys, np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int64)
+
+
+def basket_pairs(baskets, products):
+    """Expand basket membership into every ordered pair of distinct products.
+
+    Args:
+        baskets: Array of basket numbers, sorted and contiguous from 0.
+        products: Array of product columns aligned with baskets.
+
+    Returns:
+        tuple: (left, right) column arrays, one entry per ordered pair sharing a basket.
+    """
+    sizes = np.bincount(baskets)
+    starts = np.cumsum(sizes) - sizes
+    member_size = sizes[baskets]
+    left = np.repeat(np.arange(len(products)), member_size)
+    offsets = np.arange(member_size.sum()) - np.repeat(np.cumsum(member_size) - member_size, member_size)
+    right = np.repeat(starts[baskets], member_size) + offsets
+    keep = products[left] != products[right]
+    return products[left][keep], products[right][keep]
+
+
+class CoPurchaseService:
+    """Service for "customers also added" suggestions mined from delivery history.
+
+    build_neighbors() is a periodic job: it streams (delivery, product) rows,
+    accumulates a sparse co-occurrence count per product pair with NumPy, scores
+    pairs by cosine similarity of their delivery sets, and replaces the
+    product_neighbors table with each product's top-k. Requests only read that
+    table.
+    """
+
+    def build_neighbors(self, top_k=10, batch_size=5000):
+        """Rebuild product_neighbors from every non-cancelled delivery.
+
+        Args:
+            top_k: Neighbors kept per product.
+            batch_size: Rows fetched per round trip while streaming history.
+
+        Returns:
+            int: Number of neighbor rows written.
+        """
+        product_ids = np.array([row.id for row in db.session.query(Products.id).order_by(Products.id)], dtype=np.int64)
+        n = len(product_ids)
+        support = np.zeros(n, dtype=np.int64)
+        pair_keys = np.zeros(0, dtype=np.int64)
+        pair_counts = np.zeros(0, dtype=np.int64)
+        # Per-chunk (keys, counts) not yet folded into pair_keys/pair_counts
+        pending_keys, pending_counts = [], []
+        pending_size = 0
+
+        rows = (
+            db.session.query(DeliveryItems.delivery_id, CartItems.product_id)
+            .join(CartItems, DeliveryItems.cart_item_id == CartItems.id)
+            .join(Deliveries, DeliveryItems.delivery_id == Deliveries.id)
+            .filter(Deliveries.delivery_status != 'cancelled')
+            .order_by(DeliveryItems.delivery_id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        def compact():
+            nonlocal pair_keys, pair_counts, pending_keys, pending_counts, pending_size
+            if pending_keys:
+                pair_keys, pair_counts = merge_counts(
+                    np.concatenate([pair_keys] + pending_keys), np.concatenate([pair_counts] + pending_counts)
+                )
+                pending_keys, pending_counts, pending_size = [], [], 0
+
+        def accumulate(chunk):
+            nonlocal support, pending_size
+            deliveries = np.array([row[0] for row in chunk], dtype=np.int64)
+            ids = np.array([row[1] for row in chunk], dtype=np.int64)
+            products = np.minimum(np.searchsorted(product_ids, ids), max(n - 1, 0))
+            known = product_ids[products] == ids if n else np.zeros(len(ids), dtype=bool)
+            deliveries, products = deliveries[known], products[known]
+            if not len(products):
+                return
+            support += np.bincount(products, minlength=n)
+            _, baskets = np.unique(deliveries, return_inverse=True)
+            left, right = basket_pairs(baskets, products)
+            keys, counts = merge_counts(left * n + right, np.ones(len(left), dtype=np.int64))
+            pending_keys.append(keys)
+            pending_counts.append(counts)
+            pending_size += len(keys)
+            # Fold pending chunks in only once they outgrow the merged totals, so
+            # each pair is re-sorted a logarithmic number of times, not once per chunk
+            if pending_size > max(len(pair_keys), 1_000_000):
+                compact()
+
+        # Deliveries never straddle chunks: a chunk is only cut where the delivery id changes
+        chunk = []
+        for row in rows:
+            if len(chunk) >= batch_size and row[0] != chunk[-1][0]:
+                accumulate(chunk)
+                chunk = []
+            chunk.append(row)
+        if chunk:
+            accumulate(chunk)
+        compact()
+
+        left, right = pair_keys // max(n, 1), pair_keys % max(n, 1)
+        scores = pair_counts / np.sqrt(support[left] * support[right]) if len(pair_keys) else np.zeros(0)
+        order = np.lexsort((right, -scores, left))
+        left, right, scores, counts = left[order], right[order], scores[order], pair_counts[order]
+        first = np.searchsorted(left, left)
+        keep = (np.arange(len(left)) - first) < top_k
+
+        neighbor_rows = [
+            {"product_id": int(product_ids[a]), "neighbor_id": int(product_ids[b]), "co_count": int(c), "score": float(s)}
+            for a, b, c, s in zip(left[keep], right[keep], counts[keep], scores[keep])
+        ]
+        try:
+            db.session.execute(db.delete(ProductNeighbors))
+            for offset in range(0, len(neighbor_rows), batch_size):
+                db.session.execute(db.insert(ProductNeighbors).values(neighbor_rows[offset:offset + batch_size]))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(neighbor_rows)
+
+    def suggest_for_products(self, product_ids, limit=5):
+        """Return products most often bought with the given ones, excluding them.
+
+        Neighbor scores are summed across the input products, and only
+        available, in-stock suggestions are returned.
+
+        Args:
+            product_ids: Products already chosen (e.g. the cart).
+            limit: Maximum suggestions.
+
+        Returns:
+            list[tuple]: (Products, score) pairs, best first.
+        """
+        product_ids = list(product_ids)
+        if not product_ids:
+            return []
+        score = db.func.sum(ProductNeighbors.score).label('score')
+        rows = (
+            db.session.query(Products, score)
+            .join(ProductNeighbors, ProductNeighbors.neighbor_id == Products.id)
+            .filter(
+                ProductNeighbors.product_id.in_(product_ids),
+                ProductNeighbors.neighbor_id.notin_(product_ids),
+                Products.is_available.is_(True),
+                Products.inventory_quantity > 0
+            )
+            .group_by(Products.id)
+            .order_by(score.desc(), Products.id)
+            .limit(limit)
+            .all()
+        )
+        return [(product, float(total)) for product, total in rows]
@@ -3,7 +3,20 @@ from app.app import db
 from app.services.user_service import UserService
 from app.services.staff_service import StaffService
 from app.services.driver_service import DriverService
-import decimal
+from app.services.delivery_service import DeliveryService
+from app.services.pricing_service import PricingService
+from app.services.inventory_service import InventoryService
+from app.services.wallet_service import WalletService
+from app.services.seat_hold_service import SeatHoldService
+from app.services.co_purchase_service import CoPurchaseService
+from app.services.sales_rollup_service import SalesRollupService
+from app.services.theatre_stats_service import TheatreStatsService
+from app.services.pagination import decode_cursor, parse_limit
+from app.services.cache import menu_cache, seat_map_cache
+from app.services.reference_cache import reference_cache
+from app.services.product_search import product_search_index
+from app.services.recommendation_service import pairing_recommender, TOP_K
+from sqlalchemy.exc import IntegrityError
 
 class CustomerService:
     """Customer service layer for accounts, payment methods, carts, showings, products, and deliveries.
@@ -17,6 +30,14 @@ class CustomerService:
         self.user_service = UserService()
         self.staff_service = StaffService(0)
         self.driver_service = DriverService()
+        self.delivery_service = DeliveryService()
+        self.pricing_service = PricingService()
+        self.inventory_service = InventoryService()
+        self.wallet_service = WalletService()
+        self.seat_hold_service = SeatHoldService()
+        self.co_purchase_service = CoPurchaseService()
+        self.sales_rollup_service = SalesRollupService()
+        self.theatre_stats_service = TheatreStatsService()
 
     def validate_customer(self, user_id):
         """Ensure the given user_id belongs to a customer.
@@ -185,7 +206,7 @@ class CustomerService:
         return True
 
     def add_funds_to_payment_method(self, payment_method_id, amount):
-        """Increase a payment method's balance.
+        """Increase a payment method's balance with a single UPDATE and record a top-up.
 
         Args:
             payment_method_id: Payment method id.
@@ -204,10 +225,27 @@ class CustomerService:
         if not payment_method:
             raise ValueError("Payment method not found")
 
-        payment_method.balance += decimal.Decimal(amount)
+        self.wallet_service.credit(payment_method_id=payment_method.id, amount=amount, kind='top_up')
         db.session.commit()
         return payment_method
 
+    def get_payment_transactions(self, payment_method_id):
+        """List the ledger of charges, refunds, and top-ups for a payment method.
+
+        Args:
+            payment_method_id: Payment method id.
+
+        Returns:
+            list[PaymentTransactions]: Ledger rows, newest first (possibly empty).
+
+        Raises:
+            ValueError: If the payment method does not exist.
+        """
+        payment_method = PaymentMethods.query.filter_by(id=payment_method_id).first()
+        if not payment_method:
+            raise ValueError("Payment method not found")
+        return self.wallet_service.get_transactions(payment_method_id=payment_method.id)
+
     def get_customer_payment_methods(self, customer_id):
         """List all payment methods for a customer.
 
@@ -223,6 +261,8 @@ class CustomerService:
     def create_customer_showing(self, user_id, movie_showing_id, seat_id):
         """Book a seat for a specific movie showing for a customer.
 
+        The showing's occupancy counter is bumped in the same transaction.
+
         Args:
             user_id: Customer's user id.
             movie_showing_id: Target MovieShowings id.
@@ -232,14 +272,15 @@ class CustomerService:
             CustomerShowings: The created booking record.
 
         Raises:
-            ValueError: If customer, showing, seat is missing, or a duplicate booking exists.
+            ValueError: If customer, showing, seat is missing, a duplicate booking exists,
+                the seat is booked, or another customer holds it.
         """
         customer = self.get_customer(user_id=user_id)
         movie_showing = MovieShowings.query.filter_by(id=movie_showing_id).first()
         if not movie_showing:
             raise ValueError(f"Movie Showing {movie_showing_id} not found")
 
-        seat = Seats.query.filter_by(id=seat_id).first()
+        seat = reference_cache.seat(seat_id)
         if not seat:
             raise ValueError(f"Seat {seat_id} not found")
 
@@ -251,13 +292,26 @@ class CustomerService:
         if existing_showing:
             raise ValueError(f"Identical customer showing found")
 
+        hold = self.seat_hold_service.active_hold(movie_showing.id, seat.id)
+        if hold and hold.customer_id != customer.user_id:
+            raise ValueError(f"Seat {seat_id} is held by another customer")
+
         customer_showing = CustomerShowings(
             customer_id=customer.user_id,
             movie_showing_id=movie_showing.id,
             seat_id=seat.id
         )
-        db.session.add(customer_showing)
-        db.session.commit()
+        try:
+            db.session.add(customer_showing)
+            if hold:
+                db.session.delete(hold)
+            db.session.flush()
+            self.theatre_stats_service.record_booking(movie_showing.id)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError(f"Seat {seat_id} is already booked")
+        seat_map_cache.invalidate(movie_showing.id)
         return customer_showing
 
     def create_cart_item(self, customer_id, product_id, quantity):
@@ -282,10 +336,12 @@ class CustomerService:
         if not product:
             raise ValueError(f"Product {product_id} not found")
 
-        if product.inventory_quantity - quantity <= 0:
+        # Stock is only reserved at checkout; this is an early check on the combined cart quantity
+        existing_item = CartItems.query.filter_by(customer_id=customer_id, product_id=product_id).first()
+        in_cart = existing_item.quantity if existing_item else 0
+        if product.inventory_quantity < in_cart + quantity:
             raise ValueError(f"Product inventory is insufficient")
 
-        existing_item = CartItems.query.filter_by(customer_id=customer_id, product_id=product_id).first()
         if existing_item:
             existing_item.quantity += quantity
             db.session.commit()
@@ -354,12 +410,30 @@ class CustomerService:
             return None
         return cart_items
 
-    def charge_payment_method(self, payment_method_id, total_price):
+    def get_cart_suggestions(self, cart_items, limit=5):
+        """Suggest products other customers bought with the ones in a cart.
+
+        Args:
+            cart_items: The customer's CartItems (may be empty or None).
+            limit: Maximum suggestions.
+
+        Returns:
+            list[tuple]: (Products, score) pairs from the precomputed neighbor table, best first.
+        """
+        return self.co_purchase_service.suggest_for_products([item.product_id for item in cart_items or []], limit=limit)
+
+    def charge_payment_method(self, payment_method_id, total_price, commit=True, delivery_id=None):
         """Charge a payment method for the given amount if sufficient funds exist.
 
+        The balance check and the deduction happen in one guarded UPDATE, so two
+        concurrent charges cannot both spend the same funds.
+
         Args:
             payment_method_id: Payment method id to charge.
             total_price: Decimal total amount to charge.
+            commit: Commit immediately; pass False to leave the charge in the
+                caller's transaction.
+            delivery_id: Delivery the charge pays for, recorded in the ledger.
 
         Returns:
             bool: True if charged; False if insufficient funds.
@@ -373,11 +447,11 @@ class CustomerService:
 
         self.validate_customer(payment_method.customer_id)
 
-        if payment_method.balance < total_price:
+        if not self.wallet_service.debit(payment_method_id=payment_method.id, amount=total_price, delivery_id=delivery_id):
             return False
 
-        payment_method.balance -= total_price
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return True
 
     def create_delivery(self, customer_showing_id, payment_method_id):
@@ -385,7 +459,10 @@ class CustomerService:
 
         This links the delivery to the customer's showing, verifies the payment method
         belongs to the same customer, creates delivery items from the cart, charges the
-        payment method, decrements inventory, and attempts to assign a driver and staff.
+        payment method, decrements inventory, adds the sale to the supplier sales and
+        theatre revenue rollups, and attempts to assign a driver and staff. All writes happen in one transaction
+        committed once at the end, with the delivery items (and their priced quantities)
+        added by a single bulk insert.
 
         Args:
             customer_showing_id: CustomerShowings id for the booking.
@@ -409,11 +486,11 @@ class CustomerService:
         if payment_method.customer_id != customer_showing.customer_id:
             raise ValueError("Payment method does not belong to this customer")
 
-        seat = Seats.query.filter_by(id=customer_showing.seat_id).first()
+        seat = reference_cache.seat(customer_showing.seat_id)
         if not seat:
             raise ValueError(f"Seat {customer_showing.seat_id} not found")
 
-        auditorium = Auditoriums.query.filter_by(id=seat.auditorium_id).first()
+        auditorium = reference_cache.auditorium(seat.auditorium_id)
         if not auditorium:
             raise ValueError(f"Auditorium {seat.auditorium_id} not found")
 
@@ -421,43 +498,59 @@ class CustomerService:
         if not cart_items:
             raise ValueError(f"Cart for {customer_showing.customer_id} is empty")
 
-        total_price = self.calculate_total_price(cart_items=cart_items)
+        quote = self.pricing_service.quote_cart(cart_items=cart_items)
+        total_price = quote["total"]
+
+        # Everything below runs in one transaction that ends in a single commit;
+        # any failure rolls back the delivery, items, charge, and assignments.
+        try:
+            delivery = Deliveries(
+                driver_id=None,
+                customer_showing_id=customer_showing.id,
+                payment_method_id=payment_method.id,
+                staff_id=None,
+                total_price=total_price
+            )
+            db.session.add(delivery)
+            db.session.flush()
 
-        delivery = Deliveries(
-            driver_id=None,
-            customer_showing_id=customer_showing.id,
-            payment_method_id=payment_method.id,
-            staff_id=None,
-            total_price=total_price
-        )
-        db.session.add(delivery)
-        db.session.flush()
+            db.session.execute(
+                db.insert(DeliveryItems),
+                [{"cart_item_id": line["cart_item_id"], "delivery_id": delivery.id, "quantity": line["quantity"], "line_total": line["line_total"]}
+                 for line in quote["lines"]]
+            )
 
-        for item in cart_items:
-            self.create_delivery_item(cart_item_id=item.id, delivery_id=delivery.id)
+            was_charged = self.charge_payment_method(payment_method_id=payment_method.id, total_price=total_price, commit=False, delivery_id=delivery.id)
+            if not was_charged:
+                raise ValueError("Insufficient funds")
 
-        was_charged = self.charge_payment_method(payment_method_id=payment_method.id, total_price=total_price)
-        if not was_charged:
-            db.session.rollback()
-            raise ValueError("Insufficient funds")
+            delivery.payment_status = 'completed'
+            self.sales_rollup_service.record_sale(quote["lines"])
+            self.theatre_stats_service.record_revenue(auditorium.theatre_id, total_price)
 
-        delivery.payment_status = 'completed'
+            # One guarded UPDATE for every line; fails if any product would oversell
+            self.inventory_service.decrement_stock(
+                (line["product_id"], line["quantity"]) for line in quote["lines"]
+            )
 
-        for item in cart_items:
-            product = Products.query.filter_by(id=item.product_id).first()
-            product.inventory_quantity -= item.quantity
+            # Attempt to assign driver and staff member (no-op if none available)
+            self.driver_service.try_assign_driver(delivery=delivery, commit=False)
+            self.staff_service.try_assign_staff(theatre_id=auditorium.theatre_id, delivery=delivery, commit=False)
 
-        # Attempt to assign driver and staff member (no-op if none available)
-        self.driver_service.try_assign_driver(delivery=delivery)
-        self.staff_service.try_assign_staff(theatre_id=auditorium.theatre_id, delivery=delivery)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
 
-        db.session.commit()
+        # Cached menu pages carry inventory_quantity, which every checkout changes
+        menu_cache.clear()
         return delivery
 
     def calculate_total_price(self, cart_items):
         """Compute the total price for a list of cart items.
 
-        Total is computed as sum of (unit_price - discount) * quantity for each item.
+        Total is computed as sum of (unit_price - discount) * quantity for each item,
+        with all products loaded in a single query (see PricingService).
 
         Args:
             cart_items: Iterable of CartItems to price.
@@ -468,16 +561,8 @@ class CustomerService:
         Raises:
             ValueError: If a cart item is invalid or references a missing product.
         """
-        total_price = decimal.Decimal(0.00)
-        for item in cart_items:
-            if item:
-                product = Products.query.filter_by(id=item.product_id).first()
-                if not product:
-                    raise ValueError(f"Product {item.product_id} not found")
-                total_price += (product.unit_price - product.discount) * item.quantity
-            else:
-                raise ValueError("Invalid cart item")
-        return total_price
+        quote = self.pricing_service.quote_cart(cart_items=cart_items)
+        return quote["total"]
 
     def create_delivery_item(self, cart_item_id, delivery_id):
         """Create a DeliveryItems entry from a cart item for a pending delivery.
@@ -514,7 +599,7 @@ class CustomerService:
         return delivery_item
 
     def cancel_delivery(self, delivery_id):
-        """Cancel a delivery, set driver availability, and refund the balance.
+        """Cancel a delivery, set driver availability, refund the balance, and reverse its sales rollups.
 
         Args:
             delivery_id: Delivery id to cancel.
@@ -536,8 +621,10 @@ class CustomerService:
         if not payment_method:
             raise ValueError(f"Payment method not found for {delivery.id}")
 
-        payment_method.balance += delivery.total_price
-        self.driver_service.update_driver_status(user_id=delivery.driver_id, new_status='available')
+        self.wallet_service.credit(payment_method_id=payment_method.id, amount=delivery.total_price, kind='refund', delivery_id=delivery.id)
+        self.driver_service.update_driver_status(user_id=delivery.driver_id, new_status='available', commit=False)
+        self.sales_rollup_service.reverse_sale(delivery)
+        self.theatre_stats_service.reverse_delivery(delivery)
         delivery.delivery_status = 'cancelled'
         db.session.commit()
         return delivery
@@ -558,40 +645,129 @@ class CustomerService:
         driver, delivery = self.driver_service.rate_driver(delivery_id=delivery_id, new_rating=rating)
         return delivery
 
-    def show_all_products(self):
-        """List all available products across open suppliers, sorted by supplier and name.
+    def show_all_products(self, after=None, limit=None):
+        """List available products across suppliers, sorted by supplier and name.
+
+        Results are paged with a keyset seek on (company_name, name, id) rather
+        than OFFSET, so later pages cost the same as the first.
+
+        Args:
+            after: Opaque cursor from the previous page, or None for the first page.
+            limit: Page size (defaults to DEFAULT_LIMIT, capped at MAX_LIMIT).
 
         Returns:
-            list[Products]: All available products ordered by supplier name and product name.
+            list[Products]: One page of available products ordered by supplier name and product name.
+
+        Raises:
+            ValueError: If the cursor or limit is invalid.
         """
-        products = Products.query.join(Suppliers, Products.supplier_id == Suppliers.user_id).filter(
+        limit = parse_limit(limit)
+        key = decode_cursor(after, 3)
+        query = Products.query.join(Suppliers, Products.supplier_id == Suppliers.user_id).filter(
             Products.is_available.is_(True)
-        ).order_by(Suppliers.company_name.asc(), Products.name.asc()).all()
+        )
+        if key:
+            query = query.filter(db.tuple_(Suppliers.company_name, Products.name, Products.id) > db.tuple_(*key))
+        products = query.order_by(Suppliers.company_name.asc(), Products.name.asc(), Products.id.asc()).limit(limit).all()
         return products
 
-    def get_all_deliveries(self, user_id):
-        """List all deliveries for a customer (newest first).
+    def search_products(self, query, limit=None):
+        """Search available products by name, keywords, and category.
+
+        Words match whole terms or their prefixes; results are ranked by how
+        many words match and in which field (name over keywords over category).
+
+        Args:
+            query: Free-text search string.
+            limit: Maximum results (defaults to DEFAULT_LIMIT, capped at MAX_LIMIT).
+
+        Returns:
+            list[Products]: Matching products, best match first.
+
+        Raises:
+            ValueError: If the query is empty or the limit is invalid.
+        """
+        if not query or not query.strip():
+            raise ValueError("Search query cannot be empty")
+        limit = parse_limit(limit)
+        ranked = product_search_index.search(query, limit=limit)
+        if not ranked:
+            return []
+        # The index is per process, so drop products another worker hid or removed since it loaded
+        products = {p.id: p for p in Products.query.filter(
+            Products.id.in_([pid for pid, _ in ranked]), Products.is_available.is_(True)
+        ).all()}
+        return [products[pid] for pid, _ in ranked if pid in products]
+
+    def get_recommended_products(self, showing_id, limit=5):
+        """Return snacks that pair with a showing's movie, served from precomputed pairings.
+
+        Args:
+            showing_id: MovieShowings id.
+            limit: Number of products to return (1 to TOP_K).
+
+        Returns:
+            tuple: (movie_id, list of (ProductSummary, score) pairs, best first).
+
+        Raises:
+            ValueError: If the showing does not exist or the limit is invalid.
+        """
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid limit")
+        if limit < 1 or limit > TOP_K:
+            raise ValueError(f"Limit must be between 1 and {TOP_K}")
+        showing = db.session.get(MovieShowings, showing_id)
+        if not showing:
+            raise ValueError(f"Movie Showing {showing_id} not found")
+        return showing.movie_id, pairing_recommender.recommend(showing.movie_id, limit=limit)
+
+    def menu_sort_key(self, product):
+        """Return the (company_name, name, id) key used to page the menu.
+
+        Args:
+            product: A Products row from show_all_products.
+
+        Returns:
+            list: Sort key values for encode_cursor.
+        """
+        supplier = db.session.get(Suppliers, product.supplier_id)
+        return [supplier.company_name, product.name, product.id]
+
+    def get_all_deliveries(self, user_id, after=None, limit=None):
+        """List deliveries for a customer (newest first), one page at a time.
 
         Args:
             user_id: Customer's user id.
+            after: Opaque cursor from the previous page, or None for the first page.
+            limit: Page size (defaults to DEFAULT_LIMIT, capped at MAX_LIMIT).
 
         Returns:
             list[Deliveries]: Deliveries linked to the customer's showings.
+
+        Raises:
+            ValueError: If the customer, cursor, or limit is invalid.
         """
         self.validate_customer(user_id=user_id)
-        deliveries = Deliveries.query.join(
+        limit = parse_limit(limit)
+        key = decode_cursor(after, 1)
+        query = Deliveries.query.join(
             CustomerShowings, Deliveries.customer_showing_id == CustomerShowings.id
         ).filter(
             CustomerShowings.customer_id == user_id
-        ).order_by(
-            Deliveries.id.desc()
-        ).all()
+        )
+        if key:
+            query = query.filter(Deliveries.id < key[0])
+        deliveries = query.order_by(Deliveries.id.desc()).limit(limit).all()
         return deliveries
 
     def get_all_showings(self, user_id):
         """Return showings booked by a customer with basic presentation details.
 
         Each result includes movie title, seat, ISO start time, auditorium label, and theatre name.
+        Bookings and showings are read with one joined query; the rest is resolved
+        from the reference cache.
 
         Args:
             user_id: Customer's user id.
@@ -600,23 +776,24 @@ class CustomerService:
             list[dict]: Presentation dictionaries for each showing.
         """
         self.validate_customer(user_id=user_id)
-        showings = CustomerShowings.query.filter(CustomerShowings.customer_id == user_id).all()
+        rows = (
+            db.session.query(CustomerShowings, MovieShowings)
+            .join(MovieShowings, CustomerShowings.movie_showing_id == MovieShowings.id)
+            .filter(CustomerShowings.customer_id == user_id)
+            .all()
+        )
         result = []
-        for showing in showings:
-            movie_showing = MovieShowings.query.filter_by(id=showing.movie_showing_id).first()
-            movie = Movies.query.filter_by(id=movie_showing.movie_id).first()
-            seat = Seats.query.filter_by(id=showing.seat_id).first()
-            auditorium = (
-                Auditoriums.query.filter_by(id=movie_showing.auditorium_id).first()
-            )
-            theatre = Theatres.query.filter_by(id=auditorium.theatre_id).first()
+        for showing, movie_showing in rows:
+            # Movie, seat, auditorium, and theatre come from the reference cache
+            movie = reference_cache.movie(movie_showing.movie_id)
+            seat = reference_cache.seat(showing.seat_id)
+            auditorium = reference_cache.auditorium(movie_showing.auditorium_id)
+            theatre = reference_cache.theatre(auditorium.theatre_id)
             start_time = None
-            if movie_showing and getattr(movie_showing.start_time, "isoformat", None):
+            if getattr(movie_showing.start_time, "isoformat", None):
                 start_time = movie_showing.start_time.isoformat()
-            elif movie_showing:
-                start_time = str(movie_showing.start_time)
             else:
-                start_time = None
+                start_time = str(movie_showing.start_time)
 
             result.append({
                 "id": showing.id,
@@ -640,27 +817,17 @@ class CustomerService:
         Raises:
             ValueError: If the delivery id is not found.
         """
-        delivery = Deliveries.query.filter_by(id=delivery_id).first()
-        if not delivery:
-            raise ValueError(f"Delivery {delivery_id} not found")
-        delivery_items = DeliveryItems.query.filter_by(delivery_id=delivery.id).all()
-        cart_items = [CartItems.query.filter_by(id=item.cart_item_id).first() for item in delivery_items]
-        items = [{"name": Products.query.filter_by(id=item.product_id).first().name, "quantity": item.quantity} for item in cart_items]
-        customer_showing = CustomerShowings.query.filter_by(id=delivery.customer_showing_id).first()
-        showing = MovieShowings.query.filter_by(id=customer_showing.movie_showing_id).first()
-        movie = Movies.query.filter_by(id=showing.movie_id).first()
-        auditorium = Auditoriums.query.filter_by(id=showing.auditorium_id).first()
-        theatre = Theatres.query.filter_by(id=auditorium.theatre_id).first()
+        details = self.delivery_service.get_delivery_detail(delivery_id=delivery_id)
         return {
-            "id": delivery.id,
-            "driver_id": delivery.driver_id,
-            "total_price": float(delivery.total_price),
-            "delivery_time": delivery.delivery_time.isoformat() if delivery.delivery_time else None,
-            "delivery_status": delivery.delivery_status,
-            "items": items,
-            "theatre_name": theatre.name,
-            "theatre_address": theatre.address,
-            "movie_title": movie.title,
+            "id": details["id"],
+            "driver_id": details["driver_id"],
+            "total_price": details["total_price"],
+            "delivery_time": details["delivery_time"],
+            "delivery_status": details["delivery_status"],
+            "items": details["items"],
+            "theatre_name": details["theatre_name"],
+            "theatre_address": details["theatre_address"],
+            "movie_title": details["movie_title"],
         }
 
     def get_customer_showing_id(self, user_id):
@@ -0,0 +1,67 @@
+from app.models import *
+from app.app import db
+
+
+class DeliveryService:
+    """Shared read paths for delivery views.
+
+    Tracking and driver screens poll delivery details frequently, so the full
+    delivery graph (showing, movie, auditorium, theatre, and items) is loaded
+    with a fixed number of joined queries instead of one lookup per row.
+    """
+
+    def get_delivery_detail(self, delivery_id):
+        """Load a delivery with its venue, movie, and line items in two queries.
+
+        The first query joins the delivery through its customer showing to the
+        movie and theatre; the second joins delivery items to cart items and
+        products. The number of queries does not grow with the item count.
+
+        Args:
+            delivery_id: Delivery id to expand.
+
+        Returns:
+            dict: Delivery fields plus items, theatre name/address, and movie title.
+
+        Raises:
+            ValueError: If the delivery id is not found.
+        """
+        row = (
+            db.session.query(Deliveries, Theatres.name, Theatres.address, Movies.title)
+            .join(CustomerShowings, Deliveries.customer_showing_id == CustomerShowings.id)
+            .join(MovieShowings, CustomerShowings.movie_showing_id == MovieShowings.id)
+            .join(Movies, MovieShowings.movie_id == Movies.id)
+            .join(Auditoriums, MovieShowings.auditorium_id == Auditoriums.id)
+            .join(Theatres, Auditoriums.theatre_id == Theatres.id)
+            .filter(Deliveries.id == delivery_id)
+            .first()
+        )
+        if not row:
+            raise ValueError(f"Delivery {delivery_id} not found")
+        delivery, theatre_name, theatre_address, movie_title = row
+
+        items = (
+            db.session.query(Products.name, CartItems.quantity)
+            .select_from(DeliveryItems)
+            .join(CartItems, DeliveryItems.cart_item_id == CartItems.id)
+            .join(Products, CartItems.product_id == Products.id)
+            .filter(DeliveryItems.delivery_id == delivery.id)
+            .order_by(DeliveryItems.id.asc())
+            .all()
+        )
+
+        return {
+            "id": delivery.id,
+            "driver_id": delivery.driver_id,
+            "customer_showing_id": delivery.customer_showing_id,
+            "payment_method_id": delivery.payment_method_id,
+            "staff_id": delivery.staff_id,
+            "payment_status": delivery.payment_status,
+            "total_price": float(delivery.total_price),
+            "delivery_time": delivery.delivery_time.isoformat() if delivery.delivery_time else None,
+            "delivery_status": delivery.delivery_status,
+            "items": [{"name": name, "quantity": quantity} for name, quantity in items],
+            "theatre_name": theatre_name,
+            "theatre_address": theatre_address,
+            "movie_title": movie_title,
+        }
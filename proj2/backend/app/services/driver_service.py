@@ -1,8 +1,19 @@
 from app.models import *
 from app.app import db
 from app.services.user_service import UserService
+from app.services.delivery_service import DeliveryService
+from app.services.pagination import decode_cursor, parse_limit
 import decimal
 
+# Ratings kept in a driver's recent window
+RECENT_RATINGS_WINDOW = 10
+
+# Leaderboard size when none is requested
+LEADERBOARD_SIZE = 10
+
+# Rating a driver starts with before anyone has rated them (the column default)
+DEFAULT_RATING = decimal.Decimal('5.00')
+
 class DriverService:
     """Service layer for driver accounts and delivery operations.
 
@@ -12,7 +23,8 @@ class DriverService:
     
     def __init__(self):
         """Initialize dependencies used by driver operations."""
-        self.user_service = UserService()   
+        self.user_service = UserService()
+        self.delivery_service = DeliveryService()
 
     def validate_driver(self, user_id):
         """Ensure the given user_id belongs to a driver.
@@ -244,12 +256,13 @@ class DriverService:
             return driver
         raise ValueError("License plate already in use")
     
-    def update_driver_status(self, user_id, new_status):
+    def update_driver_status(self, user_id, new_status, commit=True):
         """Set the duty status for a given driver.
 
         Args:
             user_id: Driver's user id.
             new_status: New duty status string.
+            commit: Commit immediately; pass False to stay in the caller's transaction.
 
         Returns:
             Drivers: The updated driver record.
@@ -259,7 +272,8 @@ class DriverService:
         """
         driver = self.validate_driver(user_id=user_id)
         driver.duty_status = self.validate_duty_status(duty_status=new_status)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return driver
     
     def get_available_drivers(self):
@@ -279,14 +293,40 @@ class DriverService:
         best_driver = Drivers.query.filter_by(duty_status='available').order_by(Drivers.rating.desc()).first()
         return best_driver
     
-    def try_assign_driver(self, delivery):
+    def claim_best_available_driver(self):
+        """Lock and claim the highest-rated available driver.
+
+        The candidate row is read with ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+        concurrent checkouts skip drivers another transaction is already
+        claiming instead of waiting on them, and each claims a different
+        driver. The claimed driver is moved to 'on_delivery' in the same
+        transaction; the lock is held until the caller commits.
+
+        Returns:
+            Drivers | None: The claimed driver or None if none are available.
+        """
+        driver = (
+            Drivers.query
+            .filter(Drivers.duty_status == 'available')
+            .order_by(Drivers.rating.desc(), Drivers.user_id.desc())
+            .with_for_update(skip_locked=True)
+            .populate_existing()
+            .first()
+        )
+        if driver:
+            driver.duty_status = 'on_delivery'
+        return driver
+
+    def try_assign_driver(self, delivery, commit=True):
         """Assign the best available driver to a delivery.
 
         Sets delivery.driver_id, updates delivery_status to 'accepted',
-        and moves the driver's duty status to 'on_delivery'.
+        and moves the driver's duty status to 'on_delivery'. The driver is
+        claimed under a row lock so parallel assignments never share a driver.
 
         Args:
             delivery: A Deliveries model instance to be assigned.
+            commit: Commit immediately; pass False to stay in the caller's transaction.
 
         Returns:
             bool: True if assignment succeeded; False if no drivers available.
@@ -296,12 +336,13 @@ class DriverService:
         """
         if not delivery:
             raise ValueError("Delievry not found")
-        driver = self.get_best_available_driver()
+        driver = self.claim_best_available_driver()
         if not driver:
             return False
         delivery.driver_id = driver.user_id
         delivery.delivery_status = 'accepted'
-        self.update_driver_status(user_id=delivery.driver_id, new_status='on_delivery')
+        if commit:
+            db.session.commit()
         return True
     
     def delete_driver(self, user_id):
@@ -323,7 +364,7 @@ class DriverService:
     def complete_delivery(self, delivery_id):
         """Mark an accepted delivery as delivered and update driver stats.
 
-        Increments driver's total_deliveries, sets delivery_status to 'delivered',
+        Increments driver's total_deliveries, adds the order value to total_earnings, sets delivery_status to 'delivered',
         and moves driver back to 'available'. Requires driver to be 'on_delivery'.
 
         Args:
@@ -351,16 +392,21 @@ class DriverService:
             raise ValueError("Driver is not currently on a delivery")
         
         driver.total_deliveries += 1
+        driver.total_earnings += delivery.total_price
         delivery.delivery_status = 'delivered'
         driver.duty_status = 'available'
         db.session.commit()
         return delivery
     
     def rate_driver(self, delivery_id, new_rating):
-        """Rate the driver for a fulfilled delivery and update the average.
+        """Rate the driver for a fulfilled delivery and update the rating aggregates.
 
-        If the driver has no prior deliveries, the rating is set directly;
-        otherwise the new average is computed from the existing rating and count.
+        The driver keeps a running rating_sum and rating_count plus the last
+        RECENT_RATINGS_WINDOW ratings, so each rating is an O(1) update and the
+        average is weighted by ratings received rather than deliveries made.
+        The delivery and driver rows are locked so concurrent ratings cannot
+        double-count or lose an update. A non-default rating with no rating_count
+        behind it (set before the aggregates existed) counts as one prior rating.
 
         Args:
             delivery_id: The delivery id to rate.
@@ -373,7 +419,7 @@ class DriverService:
             ValueError: If delivery is missing, not fulfilled, already rated,
                 driver missing, or rating invalid.
         """
-        delivery = Deliveries.query.filter_by(id=delivery_id).first()
+        delivery = Deliveries.query.filter_by(id=delivery_id).with_for_update().populate_existing().first()
         if not delivery:
             raise ValueError(f"Delivery {delivery_id} not found")
         
@@ -383,43 +429,115 @@ class DriverService:
         if delivery.is_rated:
             raise ValueError(f"Delivery {delivery_id} has already been rated")
         
-        driver = self.validate_driver(user_id=delivery.driver_id)
+        driver = Drivers.query.filter_by(user_id=delivery.driver_id).with_for_update().populate_existing().first()
         if not driver:
             raise ValueError("Driver not found for this delivery")
         
-        new_rating = self.validate_rating(new_rating)
-
-        if driver.total_deliveries == 0:
-            driver.rating = new_rating
-        else:
-            total_rating = driver.rating * driver.total_deliveries + new_rating
-            driver.rating = total_rating / (driver.total_deliveries + 1)
+        new_rating = self.validate_rating(new_rating).quantize(decimal.Decimal('0.01'))
+
+        if driver.rating_count == 0 and driver.rating != DEFAULT_RATING:
+            driver.rating_sum = driver.rating
+            driver.rating_count = 1
+        driver.rating_sum += new_rating
+        driver.rating_count += 1
+        driver.rating = (driver.rating_sum / driver.rating_count).quantize(decimal.Decimal('0.01'))
+        recent = [value for value in driver.recent_ratings.split(',') if value]
+        driver.recent_ratings = ','.join((recent + [str(new_rating)])[-RECENT_RATINGS_WINDOW:])
         
         delivery.is_rated = True
         db.session.commit()
         return driver, delivery
-        
-    def show_completed_deliveries(self, driver_id):
-        """List all fulfilled deliveries for the given driver.
+
+    def get_driver_stats(self, driver_id):
+        """Return a driver's delivery, earnings, and rating figures from the stored aggregates.
 
         Args:
             driver_id: Driver's user id.
 
         Returns:
-            list[Deliveries]: Fulfilled deliveries.
+            dict: {'user_id', 'total_deliveries', 'total_earnings', 'rating',
+                'rating_count', 'recent_ratings', 'recent_average'}; recent_average
+                is None until the driver has been rated.
 
         Raises:
-            ValueError: If the driver has no previous fulfilled deliveries.
+            ValueError: If the driver does not exist.
         """
         driver = self.validate_driver(driver_id)
-        deliveries = Deliveries.query.filter(
+        recent = [float(value) for value in driver.recent_ratings.split(',') if value]
+        return {
+            "user_id": driver.user_id,
+            "total_deliveries": driver.total_deliveries,
+            "total_earnings": float(driver.total_earnings),
+            "rating": float(driver.rating),
+            "rating_count": driver.rating_count,
+            "recent_ratings": recent,
+            "recent_average": round(sum(recent) / len(recent), 2) if recent else None
+        }
+
+    def get_leaderboard(self, limit=None, min_ratings=1):
+        """Return the top-rated drivers, best first.
+
+        Rated drivers are read in (is_rated, rating, user_id) index order from
+        the top and the scan stops after limit matches, so drivers are never
+        sorted in full and unrated drivers, who keep the default 5.00, are never
+        stepped over. With min_ratings=0 unrated drivers are ranked too, which
+        needs a sort of every driver.
+
+        Args:
+            limit: Number of drivers (defaults to LEADERBOARD_SIZE).
+            min_ratings: Minimum ratings received to qualify, so unrated drivers
+                at the default 5.00 do not crowd the board.
+
+        Returns:
+            list[tuple]: (Drivers, name) pairs ordered by rating, ties by newest driver.
+
+        Raises:
+            ValueError: If min_ratings is not a non-negative integer.
+        """
+        limit = limit or LEADERBOARD_SIZE
+        try:
+            min_ratings = int(min_ratings)
+        except (TypeError, ValueError):
+            raise ValueError("min_ratings must be an integer")
+        if min_ratings < 0:
+            raise ValueError("min_ratings cannot be negative")
+
+        query = db.session.query(Drivers, Users.name).join(Users, Users.id == Drivers.user_id)
+        if min_ratings > 0:
+            query = query.filter(Drivers.is_rated == db.true(), Drivers.rating_count >= min_ratings)
+        return query.order_by(Drivers.rating.desc(), Drivers.user_id.desc()).limit(limit).all()
+
+    def show_completed_deliveries(self, driver_id, after=None, limit=None):
+        """List fulfilled deliveries for the given driver (newest first), one page at a time.
+
+        Pages seek on delivery id over the (driver_id, delivery_status) index.
+
+        Args:
+            driver_id: Driver's user id.
+            after: Opaque cursor from the previous page, or None for the first page.
+            limit: Page size (defaults to DEFAULT_LIMIT, capped at MAX_LIMIT).
+
+        Returns:
+            list[Deliveries]: Fulfilled deliveries; later pages may be empty.
+
+        Raises:
+            ValueError: If the driver has no previous fulfilled deliveries, or
+                the cursor or limit is invalid.
+        """
+        driver = self.validate_driver(driver_id)
+        limit = parse_limit(limit)
+        key = decode_cursor(after, 1)
+        query = Deliveries.query.filter(
             Deliveries.driver_id == driver.user_id,
             Deliveries.delivery_status == 'fulfilled'
-        ).all()
-        if not deliveries:
+        )
+        if key:
+            query = query.filter(Deliveries.id < key[0])
+        deliveries = query.order_by(Deliveries.id.desc()).limit(limit).all()
+        if not deliveries and key is None:
             raise ValueError(f"No previous deliveries found for driver {driver.user_id}")
         return deliveries
-    
+
     def get_active_delivery(self, driver_id):
         """Return the driver's active delivery if one exists.
 
@@ -444,3 +562,18 @@ class DriverService:
         if not delivery:
             raise ValueError(f"No active delivery found for driver {driver.user_id}") 
         return delivery
+
+    def get_active_delivery_details(self, driver_id):
+        """Return the driver's active delivery expanded with items and theatre address.
+
+        Args:
+            driver_id: Driver's user id.
+
+        Returns:
+            dict: Delivery fields plus items and venue details (see DeliveryService).
+
+        Raises:
+            ValueError: If the driver is missing or has no active delivery.
+        """
+        delivery = self.get_active_delivery(driver_id)
+        return self.delivery_service.get_delivery_detail(delivery_id=delivery.id)
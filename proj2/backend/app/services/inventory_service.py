@@ -0,0 +1,57 @@
+from app.models import *
+from app.app import db
+
+
+class InventoryService:
+    """Guarded inventory updates for checkout.
+
+    Stock is never read into Python and written back. Every decrement is a
+    conditional UPDATE that only matches rows with enough inventory left, so
+    concurrent checkouts cannot lose updates or oversell a product.
+    """
+
+    def decrement_stock(self, quantities):
+        """Decrement inventory for several products in one guarded UPDATE.
+
+        All products are updated by a single statement of the form
+        ``SET inventory_quantity = inventory_quantity - CASE id ... END
+        WHERE id IN (...) AND inventory_quantity >= CASE id ... END``. If any
+        product lacks stock the statement matches fewer rows than requested and
+        an error is raised; the caller is expected to roll back its transaction,
+        which also undoes the rows that did match. Nothing is committed here.
+
+        Args:
+            quantities: Iterable of (product_id, quantity) pairs. Repeated
+                product ids are summed.
+
+        Returns:
+            int: Number of product rows updated.
+
+        Raises:
+            ValueError: If a quantity is invalid or any product has insufficient inventory.
+        """
+        totals = {}
+        for product_id, quantity in quantities:
+            if quantity <= 0:
+                raise ValueError("Quantity must be greater than zero")
+            totals[product_id] = totals.get(product_id, 0) + quantity
+        if not totals:
+            return 0
+
+        requested = db.case(totals, value=Products.id)
+        result = db.session.execute(
+            db.update(Products)
+            .where(Products.id.in_(totals), Products.inventory_quantity >= requested)
+            .values(inventory_quantity=Products.inventory_quantity - requested)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(totals):
+            raise ValueError("Product inventory is insufficient")
+
+        # Loaded Products objects now hold stale counts; reload them on next access
+        mapper = db.inspect(Products)
+        for product_id in totals:
+            product = db.session.identity_map.get(mapper.identity_key_from_primary_key((product_id,)))
+            if product is not None:
+                db.session.expire(product, ['inventory_quantity'])
+        return result.rowcount
@@ -0,0 +1,198 @@
+from collections import OrderedDict, deque
+import math
+import os
+import sqlite3
+import threading
+import time
+
+
+class LoginThrottledError(Exception):
+    """Raised when a login attempt exceeds its failure budget; routes map it to 429."""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many failed login attempts, please retry later")
+        self.retry_after = retry_after
+
+
+class MemoryWindowStore:
+    """Per-process failure timestamps, one bounded deque per key.
+
+    Each key keeps at most max_events timestamps (the largest limit in use), so
+    memory per key is constant, and at most max_keys keys are tracked, evicting
+    the least recently touched first.
+    """
+
+    def __init__(self, max_events, max_keys=10000):
+        self.max_events = max_events
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def failures(self, key, since):
+        """Return (count, oldest) for failures on key newer than since."""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                return 0, None
+            while window and window[0] <= since:
+                window.popleft()
+            if not window:
+                del self._windows[key]
+                return 0, None
+            return len(window), window[0]
+
+    def add(self, key, at):
+        """Record one failure on key at time at."""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = deque(maxlen=self.max_events)
+            window.append(at)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+
+    def reset(self, key):
+        """Forget every failure on key."""
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def clear(self):
+        """Forget every key."""
+        with self._lock:
+            self._windows.clear()
+
+
+class SQLiteWindowStore:
+    """Failure timestamps in a local SQLite file shared by every worker on the host.
+
+    Each thread uses its own connection; WAL mode lets workers read while one
+    writes. Expired rows for a key are pruned when it is written, and the whole
+    table is swept every prune_every writes.
+    """
+
+    def __init__(self, path, window, prune_every=256):
+        self.path = path
+        self.window = window
+        self.prune_every = prune_every
+        self._writes = 0
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS login_failures (key TEXT NOT NULL, at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_login_failures_key_at ON login_failures (key, at)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def failures(self, key, since):
+        """Return (count, oldest) for failures on key newer than since."""
+        count, oldest = self._conn().execute(
+            "SELECT COUNT(*), MIN(at) FROM login_failures WHERE key = ? AND at > ?", (key, since)
+        ).fetchone()
+        return count, oldest
+
+    def add(self, key, at):
+        """Record one failure on key at time at."""
+        conn = self._conn()
+        conn.execute("INSERT INTO login_failures (key, at) VALUES (?, ?)", (key, at))
+        conn.execute("DELETE FROM login_failures WHERE key = ? AND at <= ?", (key, at - self.window))
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            conn.execute("DELETE FROM login_failures WHERE at <= ?", (at - self.window,))
+
+    def reset(self, key):
+        """Forget every failure on key."""
+        self._conn().execute("DELETE FROM login_failures WHERE key = ?", (key,))
+
+    def clear(self):
+        """Forget every key."""
+        self._conn().execute("DELETE FROM login_failures")
+
+
+class LoginThrottle:
+    """Sliding-window limit on failed logins per email and per client address.
+
+    check() runs before any user lookup or password hashing, so a client that
+    has used up its budget costs one window lookup instead of an Argon2 verify.
+    A successful login clears the email's window; the client's window is kept so
+    one valid account cannot be used to reset a stuffing run.
+    """
+
+    def __init__(self, email_limit=5, client_limit=20, window=300, store=None):
+        """Create a throttle.
+
+        Args:
+            email_limit: Failures allowed per email within the window.
+            client_limit: Failures allowed per client address within the window.
+            window: Window length in seconds.
+            store: Window store; defaults to a per-process MemoryWindowStore.
+        """
+        self.email_limit = email_limit
+        self.client_limit = client_limit
+        self.window = window
+        self.store = store or MemoryWindowStore(max_events=max(email_limit, client_limit))
+
+    @classmethod
+    def from_env(cls):
+        """Build a throttle from LOGIN_THROTTLE_* environment variables.
+
+        LOGIN_THROTTLE_DB names a SQLite file to share windows across workers;
+        without it the windows are kept in process memory.
+
+        Returns:
+            LoginThrottle: A throttle using the configured or default parameters.
+        """
+        email_limit = int(os.getenv('LOGIN_THROTTLE_EMAIL_LIMIT', '5'))
+        client_limit = int(os.getenv('LOGIN_THROTTLE_CLIENT_LIMIT', '20'))
+        window = int(os.getenv('LOGIN_THROTTLE_WINDOW', '300'))
+        path = os.getenv('LOGIN_THROTTLE_DB')
+        store = SQLiteWindowStore(path, window) if path else None
+        return cls(email_limit=email_limit, client_limit=client_limit, window=window, store=store)
+
+    def _keys(self, email, client):
+        keys = [('email:' + email.strip().lower(), self.email_limit)]
+        if client:
+            keys.append(('client:' + client, self.client_limit))
+        return keys
+
+    def check(self, email, client=None):
+        """Reject the attempt if the email or client has no failures left.
+
+        Args:
+            email: Email being logged into.
+            client: Client address, or None to check the email only.
+
+        Raises:
+            LoginThrottledError: If either window is full.
+        """
+        now = time.time()
+        retry_after = 0
+        for key, limit in self._keys(email, client):
+            count, oldest = self.store.failures(key, now - self.window)
+            if count >= limit:
+                retry_after = max(retry_after, oldest + self.window - now)
+        if retry_after > 0:
+            raise LoginThrottledError(max(1, math.ceil(retry_after)))
+
+    def record_failure(self, email, client=None):
+        """Count a failed attempt against the email and client."""
+        now = time.time()
+        for key, _ in self._keys(email, client):
+            self.store.add(key, now)
+
+    def record_success(self, email):
+        """Clear the email's window after a successful login."""
+        self.store.reset(self._keys(email, None)[0][0])
+
+    def clear(self):
+        """Forget every window."""
+        self.store.clear()
+
+
+# Shared per-process throttle used by every UserService
+login_throttle = LoginThrottle.from_env()
@@ -0,0 +1,134 @@
+import base64
+import json
+from datetime import date, timedelta
+from app.app import db
+
+# Page size used when the client does not pass ?limit=
+DEFAULT_LIMIT = 50
+
+# Largest page a client may request
+MAX_LIMIT = 200
+
+
+class InvalidPageError(ValueError):
+    """Raised for a malformed cursor or limit; routes map it to 400."""
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: List of JSON-serializable key values, e.g. [id] or [company_name, name, id].
+
+    Returns:
+        str: URL-safe cursor token.
+
+    Raises:
+        TypeError: If values is not a list or tuple.
+    """
+    if not isinstance(values, (list, tuple)):
+        raise TypeError("Cursor values must be a list or tuple")
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        token: Cursor token from a previous page, or None for the first page.
+        size: Expected number of key values.
+
+    Returns:
+        list | None: The decoded key values, or None if no token was given.
+
+    Raises:
+        InvalidPageError: If the token is malformed or has the wrong number of values.
+    """
+    if token is None or token == '':
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidPageError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidPageError("Invalid cursor")
+    return values
+
+
+def parse_limit(value):
+    """Validate a requested page size.
+
+    Args:
+        value: Requested limit (int, numeric string, or None).
+
+    Returns:
+        int: DEFAULT_LIMIT when value is None, else the validated limit.
+
+    Raises:
+        InvalidPageError: If the limit is not an integer between 1 and MAX_LIMIT.
+    """
+    if value is None or value == '':
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPageError("Invalid limit")
+    if limit < 1 or limit > MAX_LIMIT:
+        raise InvalidPageError(f"Limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def next_cursor(rows, limit, key):
+    """Return the cursor for the page after rows, or None on the last page.
+
+    Args:
+        rows: Rows returned for the current page.
+        limit: Page size that was requested.
+        key: Function mapping a row to its list of sort key values.
+
+    Returns:
+        str | None: Cursor token when the page is full, else None.
+    """
+    if len(rows) < limit:
+        return None
+    return encode_cursor(key(rows[-1]))
+
+
+def parse_date_range(start_date, end_date, max_days, default_days=None):
+    """Validate an inclusive date range for a report or schedule.
+
+    When default_days is given, a missing end_date defaults to the database's
+    CURRENT_DATE (the clock the daily rollups are keyed by) and a missing
+    start_date to default_days before it; otherwise both dates are required.
+
+    Args:
+        start_date: First day (date, YYYY-MM-DD, or None).
+        end_date: Last day, inclusive (date, YYYY-MM-DD, or None).
+        max_days: Longest range allowed, in days.
+        default_days: Range length used when start_date is missing, or None if both dates are required.
+
+    Returns:
+        tuple[date, date]: The validated (start_date, end_date).
+
+    Raises:
+        ValueError: If a date is malformed or missing, or the range does not cover 1 to max_days days.
+    """
+    try:
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+    except ValueError:
+        raise ValueError("Dates must be in YYYY-MM-DD format")
+    if default_days is not None:
+        if end_date is None:
+            end_date = db.session.query(db.func.current_date()).scalar()
+        if start_date is None:
+            start_date = end_date - timedelta(days=default_days - 1)
+    if not isinstance(start_date, date) or not isinstance(end_date, date):
+        raise ValueError("Dates must be in YYYY-MM-DD format")
+    if not 1 <= (end_date - start_date).days + 1 <= max_days:
+        raise ValueError(f"Date range must cover 1 to {max_days} days")
+    return start_date, end_date
@@ -0,0 +1,103 @@
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the hashing pool's queue is full; routes map it to 503."""
+
+
+class PasswordHashingPool:
+    """Shared, bounded executor for Argon2 hashing and verification.
+
+    Argon2 releases the GIL while it runs, so a small worker pool gives real
+    parallelism while capping peak memory at workers * memory_cost. At most
+    workers + max_pending jobs are admitted; anything beyond that is rejected
+    immediately with HashingBusyError instead of queueing without bound.
+    """
+
+    def __init__(self, time_cost=3, memory_cost=65536, parallelism=4, workers=2, max_pending=16):
+        """Create the pool and its shared PasswordHasher.
+
+        Args:
+            time_cost: Argon2 iterations.
+            memory_cost: Argon2 memory in KiB.
+            parallelism: Argon2 lanes per hash.
+            workers: Number of hashing threads.
+            max_pending: Jobs allowed to wait behind the running ones.
+        """
+        self.hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='argon2')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    @classmethod
+    def from_env(cls):
+        """Build a pool from ARGON2_* and PASSWORD_HASH_* environment variables.
+
+        Returns:
+            PasswordHashingPool: A pool using the configured or default parameters.
+        """
+        return cls(
+            time_cost=int(os.getenv('ARGON2_TIME_COST', '3')),
+            memory_cost=int(os.getenv('ARGON2_MEMORY_COST', '65536')),
+            parallelism=int(os.getenv('ARGON2_PARALLELISM', '4')),
+            workers=int(os.getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1)))),
+            max_pending=int(os.getenv('PASSWORD_HASH_MAX_PENDING', '16')),
+        )
+
+    def _run(self, fn, *args):
+        """Run fn on the pool and wait for its result.
+
+        Raises:
+            HashingBusyError: If the pool already holds its maximum number of jobs.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError("Password hashing is busy, please retry")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        """Hash a plaintext password on the pool.
+
+        Args:
+            password: Plaintext password.
+
+        Returns:
+            str: Encoded Argon2 hash.
+        """
+        return self._run(self.hasher.hash, password)
+
+    def verify(self, password_hash, password):
+        """Verify a password against a stored hash on the pool.
+
+        Args:
+            password_hash: Stored Argon2 hash.
+            password: Plaintext password.
+
+        Returns:
+            bool: True if the password matches; otherwise False.
+        """
+        def check():
+            try:
+                return self.hasher.verify(password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        return self._run(check)
+
+    def needs_rehash(self, password_hash):
+        """Return True if a stored hash was made with different cost parameters."""
+        try:
+            return self.hasher.check_needs_rehash(password_hash)
+        except (InvalidHashError, ValueError):
+            return False
+
+
+# Shared per-process pool used by every UserService
+password_pool = PasswordHashingPool.from_env()
@@ -0,0 +1,56 @@
+from app.models import *
+import decimal
+
+
+class PricingService:
+    """Cart pricing with a single batched product lookup.
+
+    All products referenced by a cart are loaded with one IN query, and the
+    resulting per-line breakdown is returned so checkout can reuse it for the
+    inventory step without querying products again.
+    """
+
+    def quote_cart(self, cart_items):
+        """Price a list of cart items.
+
+        Each line is priced as (unit_price - discount) * quantity.
+
+        Args:
+            cart_items: Iterable of CartItems to price.
+
+        Returns:
+            dict: {'total': Decimal, 'lines': list[dict]} where each line holds
+                cart_item_id, product_id, supplier_id, name, quantity, unit_price,
+                discount, and line_total.
+
+        Raises:
+            ValueError: If a cart item is invalid or references a missing product.
+        """
+        cart_items = list(cart_items)
+        if not all(cart_items):
+            raise ValueError("Invalid cart item")
+
+        product_ids = {item.product_id for item in cart_items}
+        products = {}
+        if product_ids:
+            products = {p.id: p for p in Products.query.filter(Products.id.in_(product_ids)).all()}
+
+        total_price = decimal.Decimal(0.00)
+        lines = []
+        for item in cart_items:
+            product = products.get(item.product_id)
+            if not product:
+                raise ValueError(f"Product {item.product_id} not found")
+            line_total = (product.unit_price - product.discount) * item.quantity
+            total_price += line_total
+            lines.append({
+                "cart_item_id": item.id,
+                "product_id": product.id,
+                "supplier_id": product.supplier_id,
+                "name": product.name,
+                "quantity": item.quantity,
+                "unit_price": product.unit_price,
+                "discount": product.discount,
+                "line_total": line_total,
+            })
+        return {"total": total_price, "lines": lines}
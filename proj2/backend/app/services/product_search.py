@@ -0,0 +1,157 @@
+from app.models import *
+from app.app import db
+import bisect
+import re
+import threading
+import time
+
+# Relative weight of a term by the field it came from
+FIELD_WEIGHTS = {'name': 3.0, 'keywords': 2.0, 'category': 1.0}
+
+# Fraction of a term's weight earned when the query only matches its prefix
+PREFIX_WEIGHT = 0.5
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric terms."""
+    return _TOKEN.findall((text or '').lower())
+
+
+class ProductSearchIndex:
+    """Per-process inverted index over available products' name, keywords, and category.
+
+    Postings map each term to {product_id: weight}; a sorted term list lets a
+    query word match every term it prefixes with two bisects. The index is
+    built with one query on first use, kept current by SupplierService writes
+    in this process, and rebuilt after ttl seconds to pick up other workers'.
+    """
+
+    def __init__(self, ttl=300):
+        """Create an empty index.
+
+        Args:
+            ttl: Seconds before the index is rebuilt from the database.
+        """
+        self.ttl = ttl
+        self._postings = {}
+        self._terms = []
+        self._docs = {}
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self):
+        """Build the index from the database if it is empty or expired."""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            rows = (
+                db.session.query(Products.id, Products.name, Products.keywords, Products.category)
+                .filter(Products.is_available.is_(True))
+                .all()
+            )
+            self._postings, self._terms, self._docs = {}, [], {}
+            for row in rows:
+                self._add(row.id, row.name, row.keywords, row.category)
+            self._terms = sorted(self._postings)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, product_id, name, keywords, category):
+        """Index one product's fields; the caller keeps _terms sorted."""
+        weights = {}
+        for field, text in (('name', name), ('keywords', keywords), ('category', category)):
+            for term in tokenize(text):
+                weights[term] = max(weights.get(term, 0.0), FIELD_WEIGHTS[field])
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[product_id] = weight
+        self._docs[product_id] = tuple(weights)
+
+    def _discard(self, product_id):
+        """Remove one product's postings, dropping terms that become empty."""
+        for term in self._docs.pop(product_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+                i = bisect.bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+
+    def upsert(self, product):
+        """Reindex a product after it is added or edited; unavailable products are dropped.
+
+        Args:
+            product: A Products row.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._discard(product.id)
+            if product.is_available:
+                self._add(product.id, product.name, product.keywords, product.category)
+                for term in self._docs[product.id]:
+                    i = bisect.bisect_left(self._terms, term)
+                    if i == len(self._terms) or self._terms[i] != term:
+                        self._terms.insert(i, term)
+
+    def remove(self, product_id):
+        """Drop a deleted product from the index."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._discard(product_id)
+
+    def invalidate(self):
+        """Discard the index so the next search rebuilds it."""
+        with self._lock:
+            self._postings, self._terms, self._docs = {}, [], {}
+            self._loaded_at = None
+
+    def _matches(self, word):
+        """Return {product_id: weight} for one query word, exact terms beating prefixes."""
+        matches = dict(self._postings.get(word, {}))
+        i = bisect.bisect_left(self._terms, word)
+        while i < len(self._terms) and self._terms[i].startswith(word):
+            term = self._terms[i]
+            if term != word:
+                for product_id, weight in self._postings[term].items():
+                    matches[product_id] = max(matches.get(product_id, 0.0), weight * PREFIX_WEIGHT)
+            i += 1
+        return matches
+
+    def search(self, query, limit=20):
+        """Rank products matching every word of the query.
+
+        Each word matches terms equal to it or starting with it. A product's
+        score is the sum over words of its best matching term's weight.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+
+        Returns:
+            list[tuple]: (product_id, score) pairs, best first, ties by id.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            scores = None
+            for word in sorted(set(words), key=len, reverse=True):
+                matches = self._matches(word)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {pid: score + matches[pid] for pid, score in scores.items() if pid in matches}
+                if not scores:
+                    return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+# Shared per-process index
+product_search_index = ProductSearchIndex()
@@ -0,0 +1,242 @@
+from app.models import *
+from app.app import db
+from app.services.reference_cache import reference_cache
+from collections import namedtuple
+import numpy as np
+import threading
+import time
+
+# Pairings kept per movie; requests can ask for fewer
+TOP_K = 20
+
+# Product fields returned with a recommendation, copied when the product is indexed
+ProductSummary = namedtuple('ProductSummary', ['id', 'supplier_id', 'name', 'unit_price', 'category'])
+
+
+def keyword_terms(text):
+    """Parse a comma-separated keywords string into a set of lowercase tags."""
+    return {term.strip().lower() for term in (text or '').split(',') if term.strip()}
+
+
+class PairingRecommender:
+    """Per-process movie -> product pairings from shared keyword vectors.
+
+    Movies and available products become binary keyword vectors, scaled to unit
+    length, over the product keyword vocabulary. Cosine similarity for every
+    movie is computed in batch as (movies x terms) @ (terms x products) in row
+    chunks, and the best TOP_K products per movie are stored, so a lookup is a
+    dict access. Catalog writes in this process refresh only the affected rows
+    or column; the whole table is rebuilt after ttl seconds to pick up other
+    workers' writes.
+    """
+
+    def __init__(self, top_k=TOP_K, ttl=600, chunk_size=1024):
+        """Create an empty recommender.
+
+        Args:
+            top_k: Products kept per movie.
+            ttl: Seconds before a full rebuild.
+            chunk_size: Movie rows multiplied per batch during a rebuild.
+        """
+        self.top_k = top_k
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._vocab = {}
+        self._product_ids = []
+        self._product_rows = {}
+        self._products = {}
+        self._P = np.zeros((0, 0), dtype=np.float32)
+        self._movie_ids = []
+        self._movie_rows = {}
+        self._movie_terms = {}
+        self._M = np.zeros((0, 0), dtype=np.float32)
+        self._top = {}
+        self._loaded_at = None
+
+    def _movie_vector(self, terms):
+        """Unit vector for a movie's tags; tags no product uses only add to its norm."""
+        vector = np.zeros(len(self._vocab), dtype=np.float32)
+        cols = [self._vocab[term] for term in terms if term in self._vocab]
+        if cols:
+            vector[cols] = 1.0 / np.sqrt(len(terms))
+        return vector
+
+    def _select(self, scores):
+        """Return the top_k (product_id, score) pairs with a positive score, best first."""
+        k = min(self.top_k, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        pairs = [(self._product_ids[i], float(scores[i])) for i in best if scores[i] > 0]
+        return sorted(pairs, key=lambda pair: (-pair[1], pair[0]))
+
+    def _build(self):
+        """Load both catalogs and precompute every movie's pairings."""
+        self._reset()
+        products = (
+            db.session.query(Products.id, Products.supplier_id, Products.name, Products.unit_price, Products.keywords, Products.category)
+            .filter(Products.is_available.is_(True))
+            .all()
+        )
+        product_terms = []
+        for product in products:
+            terms = keyword_terms(product.keywords)
+            for term in terms:
+                self._vocab.setdefault(term, len(self._vocab))
+            self._product_rows[product.id] = len(self._product_ids)
+            self._product_ids.append(product.id)
+            self._products[product.id] = ProductSummary(product.id, product.supplier_id, product.name, float(product.unit_price), product.category)
+            product_terms.append(terms)
+
+        self._P = np.zeros((len(self._product_ids), len(self._vocab)), dtype=np.float32)
+        for row, terms in enumerate(product_terms):
+            if terms:
+                self._P[row, [self._vocab[term] for term in terms]] = 1.0 / np.sqrt(len(terms))
+
+        movies = reference_cache.snapshot().movies
+        self._M = np.zeros((len(movies), len(self._vocab)), dtype=np.float32)
+        for movie in movies.values():
+            terms = keyword_terms(movie.keywords)
+            self._movie_rows[movie.id] = len(self._movie_ids)
+            self._movie_ids.append(movie.id)
+            self._movie_terms[movie.id] = terms
+            self._M[self._movie_rows[movie.id]] = self._movie_vector(terms)
+
+        for start in range(0, len(self._movie_ids), self.chunk_size):
+            scores = self._M[start:start + self.chunk_size] @ self._P.T
+            for offset, row_scores in enumerate(scores):
+                self._top[self._movie_ids[start + offset]] = self._select(row_scores)
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+                    self._build()
+
+    def recommend(self, movie_id, limit=5):
+        """Return a movie's best product pairings.
+
+        Args:
+            movie_id: Movie id.
+            limit: Maximum pairings (at most top_k).
+
+        Returns:
+            list[tuple]: (ProductSummary, score) pairs, best first.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            top = self._top.get(movie_id)
+        if top is None:
+            self.refresh_movie(movie_id)
+            with self._lock:
+                top = self._top.get(movie_id, [])
+        return [(self._products[product_id], score) for product_id, score in top[:limit] if product_id in self._products]
+
+    def refresh_movie(self, movie_id):
+        """Recompute one movie's pairings after it is added or edited.
+
+        Args:
+            movie_id: Movie id; a movie that no longer exists is dropped.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            movie = reference_cache.movie(movie_id)
+            if movie is None:
+                self.remove_movie(movie_id)
+                return
+            terms = keyword_terms(movie.keywords)
+            vector = self._movie_vector(terms)
+            row = self._movie_rows.get(movie_id)
+            if row is None:
+                row = self._movie_rows[movie_id] = len(self._movie_ids)
+                self._movie_ids.append(movie_id)
+                self._M = np.vstack([self._M, vector[np.newaxis, :]])
+            else:
+                self._M[row] = vector
+            self._movie_terms[movie_id] = terms
+            self._top[movie_id] = self._select(self._P @ vector)
+
+    def remove_movie(self, movie_id):
+        """Drop a deleted movie's pairings."""
+        with self._lock:
+            row = self._movie_rows.get(movie_id)
+            if row is not None:
+                self._M[row] = 0.0
+            self._movie_terms.pop(movie_id, None)
+            self._top.pop(movie_id, None)
+
+    def refresh_product(self, product):
+        """Re-score one product against every movie after it is added, edited, or hidden.
+
+        Movies that had the product in their pairings are recomputed in full;
+        the rest only merge its new score into their stored list.
+
+        Args:
+            product: A Products row; unavailable products are removed from every list.
+        """
+        if product.is_available:
+            summary = ProductSummary(product.id, product.supplier_id, product.name, float(product.unit_price), product.category)
+            self._rescore_product(product.id, keyword_terms(product.keywords), summary)
+        else:
+            self._rescore_product(product.id, set(), None)
+
+    def remove_product(self, product_id):
+        """Drop a deleted product from every movie's pairings."""
+        self._rescore_product(product_id, set(), None)
+
+    def _rescore_product(self, product_id, terms, summary):
+        """Replace one product's vector and merge its scores into the stored pairings."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            new_terms = [term for term in terms if term not in self._vocab]
+            if new_terms:
+                for term in new_terms:
+                    self._vocab[term] = len(self._vocab)
+                self._P = np.pad(self._P, ((0, 0), (0, len(new_terms))))
+                self._M = np.pad(self._M, ((0, 0), (0, len(new_terms))))
+                for movie_id, movie_terms in self._movie_terms.items():
+                    for term in new_terms:
+                        if term in movie_terms:
+                            self._M[self._movie_rows[movie_id], self._vocab[term]] = 1.0 / np.sqrt(len(movie_terms))
+
+            vector = np.zeros(len(self._vocab), dtype=np.float32)
+            if terms:
+                vector[[self._vocab[term] for term in terms]] = 1.0 / np.sqrt(len(terms))
+            row = self._product_rows.get(product_id)
+            if row is None:
+                if summary is None:
+                    return
+                row = self._product_rows[product_id] = len(self._product_ids)
+                self._product_ids.append(product_id)
+                self._P = np.vstack([self._P, vector[np.newaxis, :]])
+            else:
+                self._P[row] = vector
+            if summary is not None:
+                self._products[product_id] = summary
+            else:
+                self._products.pop(product_id, None)
+
+            scores = self._M @ vector
+            for movie_id, top in self._top.items():
+                movie_row = self._movie_rows[movie_id]
+                if any(paired_id == product_id for paired_id, _ in top):
+                    self._top[movie_id] = self._select(self._P @ self._M[movie_row])
+                elif scores[movie_row] > 0 and (len(top) < self.top_k or scores[movie_row] > top[-1][1]):
+                    merged = top + [(product_id, float(scores[movie_row]))]
+                    self._top[movie_id] = sorted(merged, key=lambda pair: (-pair[1], pair[0]))[:self.top_k]
+
+    def invalidate(self):
+        """Discard everything so the next lookup rebuilds."""
+        with self._lock:
+            self._reset()
+
+
+# Shared per-process instance
+pairing_recommender = PairingRecommender()
@@ -0,0 +1,166 @@
+from app.models import *
+from app.app import db
+from collections import namedtuple
+import threading
+import time
+
+# Lightweight, immutable copies of reference rows; safe to share across requests and sessions
+TheatreRef = namedtuple('TheatreRef', ['id', 'name', 'address', 'phone', 'is_open'])
+AuditoriumRef = namedtuple('AuditoriumRef', ['id', 'theatre_id', 'number', 'capacity'])
+SeatRef = namedtuple('SeatRef', ['id', 'auditorium_id', 'aisle', 'number'])
+MovieRef = namedtuple('MovieRef', ['id', 'title', 'genre', 'length_mins', 'release_year', 'keywords', 'rating'])
+
+# One consistent load of the topology (theatre -> auditoriums -> seats) and the movie catalog;
+# fallbacks maps (model, id) pairs found after the load to their ref, and misses maps (model, id)
+# pairs found not to exist to the monotonic time of that lookup
+ReferenceSnapshot = namedtuple('ReferenceSnapshot', [
+    'version', 'loaded_at', 'theatres', 'auditoriums', 'seats', 'movies',
+    'auditoriums_by_theatre', 'seats_by_auditorium', 'fallbacks', 'misses'
+])
+
+# Most fallback hits and misses remembered per snapshot, so probing random ids cannot grow memory without bound
+MAX_FALLBACKS = 4096
+
+
+class ReferenceCache:
+    """Per-process, versioned cache of theatres, auditoriums, seats, and movies.
+
+    The whole topology is loaded with four queries the first time it is needed
+    and then served from memory. Writers call invalidate() after committing,
+    which bumps the version and forces a reload on next use. Ids that are not
+    in the snapshot (rows added by another worker) fall back to one primary
+    key lookup. A found row is remembered on the snapshot; a missing id is
+    remembered only for miss_ttl seconds, so a repeated probe for a bad id
+    is cheap but a row created soon after is not hidden for the whole
+    snapshot. The ttl bounds how long another worker's edits can stay
+    invisible.
+    """
+
+    def __init__(self, ttl=600, miss_ttl=5):
+        """Create an empty cache.
+
+        Args:
+            ttl: Seconds a snapshot is served before it is reloaded.
+            miss_ttl: Seconds an id found not to exist is reported missing without a query.
+        """
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read every reference table and build a new snapshot."""
+        theatres = {t.id: TheatreRef(t.id, t.name, t.address, t.phone, t.is_open) for t in Theatres.query.all()}
+        auditoriums = {a.id: AuditoriumRef(a.id, a.theatre_id, a.number, a.capacity) for a in Auditoriums.query.all()}
+        seats = {s.id: SeatRef(s.id, s.auditorium_id, s.aisle, s.number) for s in Seats.query.all()}
+        movies = {m.id: MovieRef(m.id, m.title, m.genre, m.length_mins, m.release_year, m.keywords, m.rating) for m in Movies.query.all()}
+
+        auditoriums_by_theatre = {}
+        for auditorium in sorted(auditoriums.values(), key=lambda a: a.number):
+            auditoriums_by_theatre.setdefault(auditorium.theatre_id, []).append(auditorium)
+        seats_by_auditorium = {}
+        for seat in sorted(seats.values(), key=lambda s: (s.aisle, s.number)):
+            seats_by_auditorium.setdefault(seat.auditorium_id, []).append(seat)
+
+        return ReferenceSnapshot(self.version, time.monotonic(), theatres, auditoriums, seats, movies,
+                                 auditoriums_by_theatre, seats_by_auditorium, {}, {})
+
+    def snapshot(self):
+        """Return the current snapshot, loading it if missing or expired.
+
+        Returns:
+            ReferenceSnapshot: The cached reference data.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self.version or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                snapshot = self._load()
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        """Discard the snapshot after a write to any reference table."""
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    def _lookup(self, snapshot, refs, model, key, to_ref):
+        """Return a ref from the snapshot, falling back to one primary key lookup for unknown ids.
+
+        A found row is kept in snapshot.fallbacks until the next reload and a
+        miss in snapshot.misses for miss_ttl seconds; the loaded dicts are
+        never modified.
+
+        Args:
+            snapshot: Snapshot the lookup is served from.
+            refs: The snapshot's id -> ref dict for model.
+            model: Model class to query on a miss.
+            key: Primary key to find.
+            to_ref: Function converting a model row to its ref.
+
+        Returns:
+            namedtuple | None: The ref, or None if no such row exists.
+        """
+        ref = refs.get(key)
+        if ref is not None:
+            return ref
+        ref = snapshot.fallbacks.get((model, key))
+        if ref is not None:
+            return ref
+        missed_at = snapshot.misses.get((model, key))
+        if missed_at is not None and time.monotonic() - missed_at < self.miss_ttl:
+            return None
+        row = db.session.get(model, key)
+        if row is None:
+            if len(snapshot.misses) < MAX_FALLBACKS or (model, key) in snapshot.misses:
+                snapshot.misses[(model, key)] = time.monotonic()
+            return None
+        ref = to_ref(row)
+        snapshot.misses.pop((model, key), None)
+        if len(snapshot.fallbacks) < MAX_FALLBACKS:
+            snapshot.fallbacks[(model, key)] = ref
+        return ref
+
+    def theatre(self, theatre_id):
+        """Return a TheatreRef by id, or None if it does not exist."""
+        snapshot = self.snapshot()
+        return self._lookup(snapshot, snapshot.theatres, Theatres, theatre_id,
+                            lambda t: TheatreRef(t.id, t.name, t.address, t.phone, t.is_open))
+
+    def auditorium(self, auditorium_id):
+        """Return an AuditoriumRef by id, or None if it does not exist."""
+        snapshot = self.snapshot()
+        return self._lookup(snapshot, snapshot.auditoriums, Auditoriums, auditorium_id,
+                            lambda a: AuditoriumRef(a.id, a.theatre_id, a.number, a.capacity))
+
+    def seat(self, seat_id):
+        """Return a SeatRef by id, or None if it does not exist."""
+        snapshot = self.snapshot()
+        return self._lookup(snapshot, snapshot.seats, Seats, seat_id,
+                            lambda s: SeatRef(s.id, s.auditorium_id, s.aisle, s.number))
+
+    def movie(self, movie_id):
+        """Return a MovieRef by id, or None if it does not exist."""
+        snapshot = self.snapshot()
+        return self._lookup(snapshot, snapshot.movies, Movies, movie_id,
+                            lambda m: MovieRef(m.id, m.title, m.genre, m.length_mins, m.release_year, m.keywords, m.rating))
+
+    def theatres(self):
+        """Return every theatre ordered by id."""
+        return sorted(self.snapshot().theatres.values(), key=lambda t: t.id)
+
+    def auditoriums_for(self, theatre_id):
+        """Return a theatre's auditoriums ordered by number."""
+        return list(self.snapshot().auditoriums_by_theatre.get(theatre_id, []))
+
+    def seats_for(self, auditorium_id):
+        """Return an auditorium's seats ordered by aisle and number."""
+        return list(self.snapshot().seats_by_auditorium.get(auditorium_id, []))
+
+
+# Shared per-process instance
+reference_cache = ReferenceCache()
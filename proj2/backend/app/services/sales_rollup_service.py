@@ -0,0 +1,142 @@
+from app.models import *
+from app.app import db
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from datetime import date
+import decimal
+
+
+class SalesRollupService:
+    """Incremental per-day supplier sales totals.
+
+    supplier_sales_daily holds one row per (supplier, day, product). Checkout
+    adds its lines and a cancellation subtracts them with an
+    INSERT ... ON DUPLICATE KEY UPDATE, so reports never scan delivery history.
+    Quantities and line totals are snapshotted onto delivery_items at checkout,
+    so a cancellation reverses exactly what was recorded even if the cart or
+    prices changed since. Nothing is committed here so changes join the
+    caller's transaction.
+    """
+
+    def _upsert(self, rows):
+        """Add units and revenue into the rollup, creating rows as needed.
+
+        Args:
+            rows: Dicts with supplier_id, product_id, sales_date, units, revenue.
+        """
+        if not rows:
+            return
+        statement = mysql_insert(SupplierSalesDaily).values(rows)
+        db.session.execute(statement.on_duplicate_key_update(
+            units=SupplierSalesDaily.units + statement.inserted.units,
+            revenue=SupplierSalesDaily.revenue + statement.inserted.revenue
+        ))
+
+    def record_sale(self, lines):
+        """Add a checkout's priced lines to today's rollup.
+
+        The day comes from the database's CURRENT_DATE, the same clock that
+        stamps deliveries.date_added, so a later cancellation lands on the same row.
+
+        Args:
+            lines: Price lines from PricingService.quote_cart.
+        """
+        totals = {}
+        for line in lines:
+            entry = totals.setdefault((line["supplier_id"], line["product_id"]), [0, decimal.Decimal('0.00')])
+            entry[0] += line["quantity"]
+            entry[1] += line["line_total"]
+        self._upsert([
+            {"supplier_id": supplier_id, "product_id": product_id, "sales_date": db.func.current_date(),
+             "units": units, "revenue": revenue}
+            for (supplier_id, product_id), (units, revenue) in totals.items()
+        ])
+
+    def reverse_sale(self, delivery):
+        """Subtract a cancelled delivery's snapshotted lines from the day it was sold.
+
+        Args:
+            delivery: The Deliveries row being cancelled; only charged deliveries
+                were recorded, so others are ignored.
+        """
+        if delivery.payment_status != 'completed':
+            return
+        quantity, line_total = self._line_columns()
+        rows = (
+            self._line_source(db.session.query(Products.supplier_id, Products.id, db.func.sum(quantity), db.func.sum(line_total)))
+            .filter(DeliveryItems.delivery_id == delivery.id)
+            .group_by(Products.supplier_id, Products.id)
+            .all()
+        )
+        sales_date = delivery.date_added.date()
+        self._upsert([
+            {"supplier_id": supplier_id, "product_id": product_id, "sales_date": sales_date,
+             "units": -int(units), "revenue": -revenue}
+            for supplier_id, product_id, units, revenue in rows
+        ])
+
+    def _line_columns(self):
+        """Units and revenue of a delivered line; rows from before the snapshot columns fall back to cart and catalog values."""
+        quantity = db.func.coalesce(DeliveryItems.quantity, CartItems.quantity)
+        line_total = db.func.coalesce(DeliveryItems.line_total, (Products.unit_price - Products.discount) * CartItems.quantity)
+        return quantity, line_total
+
+    def _line_source(self, query):
+        """Join delivery items to their cart items and products."""
+        return (
+            query.select_from(DeliveryItems)
+            .join(CartItems, DeliveryItems.cart_item_id == CartItems.id)
+            .join(Products, CartItems.product_id == Products.id)
+        )
+
+    def rebuild(self, start_date=None, end_date=None):
+        """Recompute the rollup from delivery history, for backfills and repairs.
+
+        Rows in the range are deleted and re-inserted from every charged,
+        non-cancelled delivery with one INSERT ... SELECT, then committed.
+
+        Args:
+            start_date: First day to rebuild (date or YYYY-MM-DD); None for all history.
+            end_date: Last day to rebuild, inclusive; None for all history.
+
+        Returns:
+            int: Number of rollup rows written.
+
+        Raises:
+            ValueError: If a date is malformed or the range is reversed.
+        """
+        try:
+            start_date = start_date if start_date is None or isinstance(start_date, date) else date.fromisoformat(start_date)
+            end_date = end_date if end_date is None or isinstance(end_date, date) else date.fromisoformat(end_date)
+        except ValueError:
+            raise ValueError("Dates must be in YYYY-MM-DD format")
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("Start date must not be after end date")
+
+        quantity, line_total = self._line_columns()
+        sales_date = db.func.date(Deliveries.date_added)
+        history = (
+            self._line_source(db.select(Products.supplier_id, Products.id, sales_date, db.func.sum(quantity), db.func.sum(line_total)))
+            .join(Deliveries, DeliveryItems.delivery_id == Deliveries.id)
+            .where(Deliveries.payment_status == 'completed', Deliveries.delivery_status != 'cancelled')
+            .group_by(Products.supplier_id, Products.id, sales_date)
+        )
+        stale = db.delete(SupplierSalesDaily)
+        if start_date:
+            history = history.where(sales_date >= start_date)
+            stale = stale.where(SupplierSalesDaily.sales_date >= start_date)
+        if end_date:
+            history = history.where(sales_date <= end_date)
+            stale = stale.where(SupplierSalesDaily.sales_date <= end_date)
+
+        try:
+            db.session.execute(stale)
+            result = db.session.execute(
+                db.insert(SupplierSalesDaily).from_select(
+                    ['supplier_id', 'product_id', 'sales_date', 'units', 'revenue'], history
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return result.rowcount
@@ -0,0 +1,180 @@
+from app.models import *
+from app.app import db
+from app.services.cache import seat_map_cache
+from app.services.reference_cache import reference_cache
+from app.services.theatre_stats_service import TheatreStatsService
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+import os
+
+
+class SeatHoldService:
+    """Service for short-lived seat holds taken while a customer confirms a booking.
+
+    A hold is one seat_holds row; the unique (movie_showing_id, seat_id) key means
+    only one customer can hold a seat at a time, so acquisition is a single insert
+    that either wins or fails. Expired holds are replaced on the next acquire and
+    removed in bulk by sweep_expired().
+    """
+
+    def __init__(self, ttl=None):
+        """Initialize the service.
+
+        Args:
+            ttl: Hold lifetime in seconds; defaults to SEAT_HOLD_TTL or 300.
+        """
+        self.ttl = ttl if ttl is not None else int(os.getenv('SEAT_HOLD_TTL', '300'))
+        self.theatre_stats_service = TheatreStatsService()
+
+    def _validate_seat(self, user_id, movie_showing_id, seat_id):
+        """Check that the customer, showing, and seat exist and the seat is in the showing's auditorium."""
+        if not Customers.query.filter_by(user_id=user_id).first():
+            raise ValueError(f"Customer {user_id} not found")
+        showing = MovieShowings.query.filter_by(id=movie_showing_id).first()
+        if not showing:
+            raise ValueError(f"Movie Showing {movie_showing_id} not found")
+        seat = reference_cache.seat(seat_id)
+        if not seat or seat.auditorium_id != showing.auditorium_id:
+            raise ValueError(f"Seat {seat_id} not found")
+
+    def acquire_hold(self, user_id, movie_showing_id, seat_id):
+        """Hold a seat for a customer, or extend the customer's existing hold.
+
+        Args:
+            user_id: Customer's user id.
+            movie_showing_id: MovieShowings id.
+            seat_id: Seat id in the showing's auditorium.
+
+        Returns:
+            SeatHolds: The active hold.
+
+        Raises:
+            ValueError: If the customer, showing, or seat is missing, or the seat is
+                already booked or held by another customer.
+        """
+        self._validate_seat(user_id, movie_showing_id, seat_id)
+        if CustomerShowings.query.filter_by(movie_showing_id=movie_showing_id, seat_id=seat_id).first():
+            raise ValueError(f"Seat {seat_id} is already booked")
+
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=self.ttl)
+        hold = SeatHolds.query.filter_by(movie_showing_id=movie_showing_id, seat_id=seat_id).first()
+        if hold and hold.customer_id == user_id:
+            hold.expires_at = expires_at
+            db.session.commit()
+            return hold
+        if hold and hold.expires_at > now:
+            raise ValueError(f"Seat {seat_id} is held by another customer")
+
+        try:
+            if hold:
+                SeatHolds.query.filter(SeatHolds.id == hold.id, SeatHolds.expires_at <= now).delete(synchronize_session=False)
+            hold = SeatHolds(customer_id=user_id, movie_showing_id=movie_showing_id, seat_id=seat_id, expires_at=expires_at)
+            db.session.add(hold)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError(f"Seat {seat_id} is held by another customer")
+        seat_map_cache.invalidate(movie_showing_id)
+        return hold
+
+    def get_hold(self, hold_id, user_id):
+        """Return a customer's hold by id.
+
+        Raises:
+            ValueError: If the hold does not exist or belongs to another customer.
+        """
+        hold = db.session.get(SeatHolds, hold_id)
+        if not hold or hold.customer_id != user_id:
+            raise ValueError(f"Seat hold {hold_id} not found")
+        return hold
+
+    def release_hold(self, hold_id, user_id):
+        """Release a customer's hold before it expires.
+
+        Args:
+            hold_id: SeatHolds id.
+            user_id: Customer's user id.
+
+        Raises:
+            ValueError: If the hold does not exist or belongs to another customer.
+        """
+        hold = self.get_hold(hold_id, user_id)
+        movie_showing_id = hold.movie_showing_id
+        db.session.delete(hold)
+        db.session.commit()
+        seat_map_cache.invalidate(movie_showing_id)
+
+    def confirm_hold(self, hold_id, user_id):
+        """Turn an unexpired hold into a booking and release it in one transaction.
+
+        The showing's occupancy counter is bumped in the same transaction.
+
+        Args:
+            hold_id: SeatHolds id.
+            user_id: Customer's user id.
+
+        Returns:
+            CustomerShowings: The created booking record.
+
+        Raises:
+            ValueError: If the hold does not exist, belongs to another customer, or has expired.
+        """
+        hold = self.get_hold(hold_id, user_id)
+        if hold.expires_at <= datetime.now():
+            raise ValueError(f"Seat hold {hold_id} has expired")
+
+        customer_showing = CustomerShowings(
+            customer_id=hold.customer_id,
+            movie_showing_id=hold.movie_showing_id,
+            seat_id=hold.seat_id
+        )
+        try:
+            db.session.add(customer_showing)
+            db.session.delete(hold)
+            db.session.flush()
+            self.theatre_stats_service.record_booking(customer_showing.movie_showing_id)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError(f"Seat {hold.seat_id} is already booked")
+        seat_map_cache.invalidate(customer_showing.movie_showing_id)
+        return customer_showing
+
+    def active_hold(self, movie_showing_id, seat_id):
+        """Return the unexpired hold on a seat, or None."""
+        return SeatHolds.query.filter(
+            SeatHolds.movie_showing_id == movie_showing_id,
+            SeatHolds.seat_id == seat_id,
+            SeatHolds.expires_at > datetime.now()
+        ).first()
+
+    def sweep_expired(self, batch_size=500):
+        """Delete expired holds in batches of at most batch_size rows.
+
+        Args:
+            batch_size: Rows deleted per statement and commit.
+
+        Returns:
+            int: Number of holds removed.
+        """
+        now = datetime.now()
+        removed = 0
+        while True:
+            rows = (
+                db.session.query(SeatHolds.id, SeatHolds.movie_showing_id)
+                .filter(SeatHolds.expires_at <= now)
+                .order_by(SeatHolds.expires_at)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            SeatHolds.query.filter(SeatHolds.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+            db.session.commit()
+            for movie_showing_id in {row.movie_showing_id for row in rows}:
+                seat_map_cache.invalidate(movie_showing_id)
+            removed += len(rows)
+            if len(rows) < batch_size:
+                break
+        return removed
@@ -0,0 +1,110 @@
+from app.models import *
+from app.app import db
+from app.services.cache import seat_map_cache
+from datetime import datetime
+import base64
+
+
+def encode_aisle(seats):
+    """Encode one aisle's seats as id runs plus an occupancy bitmap.
+
+    Args:
+        seats: (seat_id, number, taken) tuples ordered by number.
+
+    Returns:
+        dict: {'runs': [[start_number, start_seat_id, count], ...], 'taken': base64 bitmap}.
+        A run covers seats whose number and id both increase by one; bit i of the
+        bitmap (most significant bit first) is set when the i-th seat is taken.
+    """
+    runs = []
+    bits = bytearray((len(seats) + 7) // 8)
+    for i, (seat_id, number, taken) in enumerate(seats):
+        if runs and number == runs[-1][0] + runs[-1][2] and seat_id == runs[-1][1] + runs[-1][2]:
+            runs[-1][2] += 1
+        else:
+            runs.append([number, seat_id, 1])
+        if taken:
+            bits[i >> 3] |= 0x80 >> (i & 7)
+    return {"runs": runs, "taken": base64.b64encode(bytes(bits)).decode('ascii')}
+
+
+def decode_aisle(entry):
+    """Expand an encoded aisle back into (seat_id, number, taken) tuples."""
+    bits = base64.b64decode(entry["taken"])
+    seats = []
+    for start_number, start_seat_id, count in entry["runs"]:
+        for offset in range(count):
+            i = len(seats)
+            seats.append((start_seat_id + offset, start_number + offset, bool(bits[i >> 3] & (0x80 >> (i & 7)))))
+    return seats
+
+
+class SeatMapService:
+    """Service for per-showing seat availability maps.
+
+    A map is built with one query (the showing's seats LEFT JOIN its bookings
+    and unexpired holds), encoded per aisle, and cached per showing until a
+    booking or hold changes it. Held seats are reported as taken.
+    """
+
+    def get_seat_map(self, showing_id):
+        """Return the encoded seat map for a movie showing.
+
+        Args:
+            showing_id: MovieShowings id.
+
+        Returns:
+            dict: {'showing_id', 'auditorium_id', 'total', 'available', 'aisles'},
+            where aisles maps each aisle letter to encode_aisle() output.
+
+        Raises:
+            ValueError: If the showing does not exist.
+        """
+        seat_map = seat_map_cache.get(showing_id)
+        if seat_map is not None:
+            return seat_map
+
+        rows = (
+            db.session.query(MovieShowings.auditorium_id, Seats.id, Seats.aisle, Seats.number,
+                             db.or_(CustomerShowings.id.isnot(None), SeatHolds.id.isnot(None)))
+            .select_from(MovieShowings)
+            .outerjoin(Seats, Seats.auditorium_id == MovieShowings.auditorium_id)
+            .outerjoin(CustomerShowings, db.and_(
+                CustomerShowings.seat_id == Seats.id,
+                CustomerShowings.movie_showing_id == MovieShowings.id
+            ))
+            .outerjoin(SeatHolds, db.and_(
+                SeatHolds.seat_id == Seats.id,
+                SeatHolds.movie_showing_id == MovieShowings.id,
+                SeatHolds.expires_at > datetime.now()
+            ))
+            .filter(MovieShowings.id == showing_id)
+            .order_by(Seats.aisle, Seats.number)
+            .all()
+        )
+        if not rows:
+            raise ValueError(f"Movie Showing {showing_id} not found")
+
+        aisles = {}
+        taken_count = 0
+        total = 0
+        for _, seat_id, aisle, number, taken in rows:
+            if seat_id is None:
+                continue
+            aisles.setdefault(aisle, []).append((seat_id, number, bool(taken)))
+            taken_count += bool(taken)
+            total += 1
+
+        seat_map = {
+            "showing_id": showing_id,
+            "auditorium_id": rows[0][0],
+            "total": total,
+            "available": total - taken_count,
+            "aisles": {aisle: encode_aisle(seats) for aisle, seats in aisles.items()}
+        }
+        seat_map_cache.set(showing_id, seat_map)
+        return seat_map
+
+    def invalidate(self, showing_id):
+        """Drop a showing's cached map after its bookings change."""
+        seat_map_cache.invalidate(showing_id)
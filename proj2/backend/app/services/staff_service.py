@@ -1,7 +1,41 @@
 from app.models import *
 from app.app import db
 from app.services.user_service import UserService
-from datetime import datetime
+from app.services.pagination import decode_cursor, parse_limit, parse_date_range
+from app.services.reference_cache import reference_cache
+from app.services.cache import seat_map_cache
+from app.services.recommendation_service import pairing_recommender
+from app.services.theatre_stats_service import TheatreStatsService
+from datetime import datetime, time, timedelta
+from sqlalchemy.exc import IntegrityError
+import bisect
+import decimal
+
+# Minutes kept free after each showing for cleaning before the next can start
+CLEANING_BUFFER_MINS = 15
+
+# Longest date range accepted by a single bulk scheduling request
+MAX_SCHEDULE_DAYS = 62
+
+# Largest seat grid one request may generate: aisles are lettered A-Z
+MAX_AISLES = 26
+MAX_SEATS_PER_AISLE = 100
+
+# Days the dashboard covers by default, and the longest range it accepts
+DASHBOARD_DAYS = 7
+MAX_DASHBOARD_DAYS = 93
+
+
+def _to_local_naive(value):
+    """Return a datetime as naive local time, the zone showings are stored in.
+
+    Aware values are converted to the server's local zone before the offset is
+    dropped, so e.g. 18:00+00:00 is compared as the same instant in local time.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
 
 class StaffService:
     
@@ -17,6 +51,7 @@ class StaffService:
         """
         self.user_id = user_id
         self.user_service = UserService()
+        self.theatre_stats_service = TheatreStatsService()
 
     def validate_admin(self):
         """Ensure the current user is a staff admin.
@@ -98,13 +133,12 @@ class StaffService:
         self.user_service.delete_user(staff.user_id)
 
     def get_theatres(self):
-        """Return all theatres.
+        """Return all theatres from the reference cache.
 
         Returns:
-            list[Theatres]: All theatres in the system.
+            list[TheatreRef]: All theatres in the system, ordered by id.
         """
-        theatres = Theatres.query.all()
-        return theatres
+        return reference_cache.theatres()
 
     def set_theatre_status(self, theatre_id, is_open):
         """Set open/closed status for a theatre (admin only).
@@ -127,6 +161,7 @@ class StaffService:
         
         theatre.is_open = is_open
         db.session.commit()
+        reference_cache.invalidate()
         return theatre
 
     def add_movie(self, title, genre, length_mins, release_year, keywords, rating):
@@ -151,6 +186,8 @@ class StaffService:
         movie = Movies(title=title, genre=genre, length_mins=length_mins, release_year=release_year, keywords=keywords, rating=rating)
         db.session.add(movie)
         db.session.commit()
+        reference_cache.invalidate()
+        pairing_recommender.refresh_movie(movie.id)
         return movie
 
     def edit_movie(self, movie_id, title, genre, length_mins, release_year, keywords, rating):
@@ -184,6 +221,8 @@ class StaffService:
         movie.keywords = keywords
         movie.rating = rating
         db.session.commit()
+        reference_cache.invalidate()
+        pairing_recommender.refresh_movie(movie.id)
         return movie
 
     def remove_movie(self, movie_id):
@@ -206,10 +245,281 @@ class StaffService:
         
         db.session.delete(movie)
         db.session.commit()
+        reference_cache.invalidate()
+        pairing_recommender.remove_movie(movie_id)
+
+    def generate_seat_grid(self, auditorium_id, aisles, seats_per_aisle, chunk_size=1000):
+        """Create an auditorium's full seat grid and sync its capacity (admin only).
+
+        The auditorium row is locked, its existing (aisle, number) pairs are
+        read once, and only the missing seats are written with chunked
+        multi-row INSERTs, so the operation can be re-run or used to grow a
+        grid. Capacity is then set to the auditorium's actual seat count in
+        the same transaction.
+
+        Args:
+            auditorium_id: Target auditorium id.
+            aisles: Number of aisles, lettered from 'A' (1-MAX_AISLES).
+            seats_per_aisle: Seats per aisle, numbered from 1 (at most MAX_SEATS_PER_AISLE).
+            chunk_size: Rows per INSERT statement.
+
+        Returns:
+            dict: {'auditorium_id', 'created', 'capacity'}.
+
+        Raises:
+            ValueError: If acting user is not admin, the auditorium is missing, or the layout is invalid.
+        """
+        admin = self.validate_admin()
+
+        if not isinstance(aisles, int) or not 1 <= aisles <= MAX_AISLES:
+            raise ValueError(f"Aisles must be between 1 and {MAX_AISLES}")
+        if not isinstance(seats_per_aisle, int) or not 1 <= seats_per_aisle <= MAX_SEATS_PER_AISLE:
+            raise ValueError(f"Seats per aisle must be between 1 and {MAX_SEATS_PER_AISLE}")
+
+        try:
+            # Locking the auditorium serializes concurrent grid requests for it
+            auditorium = Auditoriums.query.filter_by(id=auditorium_id).with_for_update().first()
+            if not auditorium:
+                raise ValueError(f"Auditorium {auditorium_id} not found")
+            # Upper-cased to match the case-insensitive unique_auditorium_seat
+            existing = {
+                (aisle.upper(), number)
+                for aisle, number in db.session.query(Seats.aisle, Seats.number).filter(Seats.auditorium_id == auditorium.id)
+            }
+            rows = [
+                {"aisle": chr(ord('A') + a), "number": number, "auditorium_id": auditorium.id}
+                for a in range(aisles)
+                for number in range(1, seats_per_aisle + 1)
+                if (chr(ord('A') + a), number) not in existing
+            ]
+            for start in range(0, len(rows), chunk_size):
+                db.session.execute(db.insert(Seats).values(rows[start:start + chunk_size]))
+            auditorium.capacity = len(existing) + len(rows)
+            self.theatre_stats_service.set_capacity(auditorium.id, auditorium.capacity)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError("Seats changed while saving, please retry")
+        except Exception:
+            db.session.rollback()
+            raise
+        reference_cache.invalidate()
+        seat_map_cache.clear()
+        return {"auditorium_id": auditorium.id, "created": len(rows), "capacity": auditorium.capacity}
+
+    def showing_intervals(self, auditorium_id, window_start, window_end, exclude_id=None):
+        """Return an auditorium's showings that can overlap a time window, sorted by start.
+
+        Uses one range query on unique_auditorium_showing (auditorium_id, start_time).
+        A showing can only reach into the window if it starts less than the longest
+        movie plus the cleaning buffer before window_start, which bounds the scan.
+        The longest length and each showing's length are read in that same query,
+        so movie edits made by other workers are always seen.
+
+        Args:
+            auditorium_id: Auditorium id.
+            window_start: Earliest naive datetime of interest.
+            window_end: Latest naive datetime of interest.
+            exclude_id: Showing id to leave out (the one being edited).
+
+        Returns:
+            list[tuple]: (start, occupied_until, showing_id) tuples, where
+            occupied_until is the end of the showing plus the cleaning buffer.
+        """
+        longest = db.select(db.func.coalesce(db.func.max(Movies.length_mins), 0)).scalar_subquery()
+        earliest = db.func.timestampadd(db.text('MINUTE'), -(longest + CLEANING_BUFFER_MINS), window_start)
+        query = (
+            db.session.query(MovieShowings.id, MovieShowings.start_time, Movies.length_mins)
+            .join(Movies, MovieShowings.movie_id == Movies.id)
+            .filter(
+                MovieShowings.auditorium_id == auditorium_id,
+                MovieShowings.start_time > earliest,
+                MovieShowings.start_time < window_end
+            )
+            .order_by(MovieShowings.start_time)
+        )
+        if exclude_id is not None:
+            query = query.filter(MovieShowings.id != exclude_id)
+
+        return [
+            (start, start + timedelta(minutes=length + CLEANING_BUFFER_MINS), showing_id)
+            for showing_id, start, length in query.all()
+        ]
+
+    def lock_auditoriums(self, auditorium_ids):
+        """Lock auditorium rows with SELECT ... FOR UPDATE, in id order to avoid deadlocks.
+
+        Scheduling takes this lock before reading an auditorium's showings, so
+        a concurrent request cannot insert an overlapping showing between the
+        conflict check and the insert. The lock is held until the caller's
+        transaction ends.
+
+        Args:
+            auditorium_ids: Auditorium ids to lock.
+
+        Returns:
+            set: The ids that exist and are now locked.
+        """
+        rows = (
+            db.session.query(Auditoriums.id)
+            .filter(Auditoriums.id.in_(sorted(set(auditorium_ids))))
+            .order_by(Auditoriums.id)
+            .with_for_update()
+            .all()
+        )
+        return {row.id for row in rows}
+
+    def movie_length(self, movie_id):
+        """Return a movie's length in minutes read from the database, or None if it does not exist."""
+        return db.session.query(Movies.length_mins).filter(Movies.id == movie_id).scalar()
+
+    def check_showing_conflict(self, auditorium_id, start_time, length_mins, exclude_id=None):
+        """Ensure a showing does not overlap another in the same auditorium.
+
+        Two showings conflict when either starts before the other's end plus the
+        cleaning buffer.
+
+        Args:
+            auditorium_id: Auditorium id.
+            start_time: Proposed start datetime; aware values are converted to local time.
+            length_mins: Length of the proposed movie in minutes.
+            exclude_id: Showing id to ignore (the one being edited).
+
+        Raises:
+            ValueError: If the proposed showing overlaps an existing one.
+        """
+        start = _to_local_naive(start_time)
+        occupied_until = start + timedelta(minutes=length_mins + CLEANING_BUFFER_MINS)
+        for other_start, other_until, other_id in self.showing_intervals(auditorium_id, start, occupied_until, exclude_id):
+            if other_until > start:
+                raise ValueError(f"Showing overlaps Movie Showing {other_id} starting {other_start:%Y-%m-%d %H:%M}")
+
+    def bulk_add_showings(self, start_date, end_date, slots, chunk_size=500):
+        """Schedule a repeating set of showings over a date range (admin only).
+
+        Every slot is placed on every date from start_date to end_date. The
+        affected auditoriums are locked and their existing showings are loaded
+        once; each candidate is checked in memory against that sorted interval
+        list with bisect, using movie lengths read from the database, and
+        accepted candidates join the list so later ones see them. Rejected
+        slots are reported and the rest are inserted with multi-row INSERTs in
+        the same transaction that holds the locks.
+
+        Args:
+            start_date: First date (date or YYYY-MM-DD).
+            end_date: Last date, inclusive (date or YYYY-MM-DD).
+            slots: Dicts with 'movie_id', 'auditorium_id', and 'time' (HH:MM or time).
+            chunk_size: Rows per INSERT statement.
+
+        Returns:
+            dict: {'created': int, 'failed': [{'movie_id', 'auditorium_id', 'start_time', 'error'}]}.
+
+        Raises:
+            ValueError: If acting user is not admin, the date range is invalid,
+                slots is not a list of dicts, or another writer changed the
+                schedule during the insert.
+        """
+        admin = self.validate_admin()
+
+        if not isinstance(slots, (list, tuple)) or not all(isinstance(slot, dict) for slot in slots):
+            raise ValueError("Slots must be a list of objects")
+
+        start_date, end_date = parse_date_range(start_date, end_date, MAX_SCHEDULE_DAYS)
+        days = (end_date - start_date).days + 1
+
+        failed = []
+        candidates = {}
+        for slot in slots:
+            movie_id, auditorium_id = slot.get('movie_id'), slot.get('auditorium_id')
+            try:
+                movie_id, auditorium_id = int(movie_id), int(auditorium_id)
+            except (TypeError, ValueError):
+                failed.append({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": None,
+                               "error": "Movie and auditorium ids must be integers"})
+                continue
+            movie = reference_cache.movie(movie_id)
+            auditorium = reference_cache.auditorium(auditorium_id)
+            try:
+                slot_time = slot.get('time')
+                slot_time = slot_time if isinstance(slot_time, time) else time.fromisoformat(slot_time)
+            except (TypeError, ValueError):
+                slot_time = None
+            error = (f"Movie {movie_id} not found" if not movie else
+                     f"Auditorium {auditorium_id} not found" if not auditorium else
+                     "Slot time must be in HH:MM format" if slot_time is None else None)
+            if error:
+                failed.append({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": None, "error": error})
+                continue
+            for day in range(days):
+                start = datetime.combine(start_date + timedelta(days=day), slot_time)
+                candidates.setdefault(auditorium_id, []).append((start, movie_id))
+
+        try:
+            locked = self.lock_auditoriums(candidates)
+            lengths = dict(
+                db.session.query(Movies.id, Movies.length_mins)
+                .filter(Movies.id.in_({movie_id for pending in candidates.values() for _, movie_id in pending}))
+                .all()
+            ) if candidates else {}
+            longest = db.session.query(db.func.max(Movies.length_mins)).scalar() or 0
+            reach = timedelta(minutes=longest + CLEANING_BUFFER_MINS)
+            window_start = datetime.combine(start_date, time.min)
+            window_end = datetime.combine(end_date + timedelta(days=1), time.min) + reach
+            rows = []
+            for auditorium_id, pending in candidates.items():
+                if auditorium_id not in locked:
+                    failed.extend({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": start.isoformat(),
+                                   "error": f"Auditorium {auditorium_id} not found"} for start, movie_id in pending)
+                    continue
+                intervals = self.showing_intervals(auditorium_id, window_start, window_end)
+                starts = [interval[0] for interval in intervals]
+                for start, movie_id in sorted(pending, key=lambda candidate: candidate[0]):
+                    if movie_id not in lengths:
+                        failed.append({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": start.isoformat(),
+                                       "error": f"Movie {movie_id} not found"})
+                        continue
+                    occupied_until = start + timedelta(minutes=lengths[movie_id] + CLEANING_BUFFER_MINS)
+                    position = bisect.bisect_left(starts, start)
+                    conflict = None
+                    if position < len(starts) and starts[position] < occupied_until:
+                        conflict = intervals[position]
+                    j = position - 1
+                    while conflict is None and j >= 0 and starts[j] > start - reach:
+                        if intervals[j][1] > start:
+                            conflict = intervals[j]
+                        j -= 1
+                    if conflict:
+                        other = f"Movie Showing {conflict[2]}" if conflict[2] else "another showing in this request"
+                        failed.append({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": start.isoformat(),
+                                       "error": f"Showing overlaps {other} starting {conflict[0]:%Y-%m-%d %H:%M}"})
+                        continue
+                    starts.insert(position, start)
+                    intervals.insert(position, (start, occupied_until, None))
+                    rows.append({"movie_id": movie_id, "auditorium_id": auditorium_id, "start_time": start})
+
+            for offset in range(0, len(rows), chunk_size):
+                db.session.execute(db.insert(MovieShowings).values(rows[offset:offset + chunk_size]))
+            if rows:
+                self.theatre_stats_service.sync_showings(
+                    MovieShowings.auditorium_id.in_(list(candidates)),
+                    MovieShowings.start_time >= window_start,
+                    MovieShowings.start_time < window_end
+                )
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError("Schedule changed while saving, please retry")
+        except Exception:
+            db.session.rollback()
+            raise
+        return {"created": len(rows), "failed": failed}
 
     def add_showing(self, movie_id, auditorium_id, start_time):
         """Create a movie showing (admin only).
 
+        The auditorium row is locked before the conflict check, so concurrent
+        requests for the same auditorium are checked and inserted one at a time.
+
         Args:
             movie_id: Movie id to show.
             auditorium_id: Auditorium id where it screens.
@@ -220,27 +530,36 @@ class StaffService:
 
         Raises:
             ValueError: If acting user is not admin, movie/auditorium missing,
-                or start_time is not a datetime.
+                start_time is not a datetime, or it overlaps another showing.
         """
         admin = self.validate_admin()
 
-        movie = Movies.query.filter_by(id=movie_id).first()
-        if not movie:
-            raise ValueError(f"Movie {movie_id} not found")
-        auditorium = Auditoriums.query.filter_by(id=auditorium_id).first()
-        if not auditorium:
-            raise ValueError(f"Auditorium {auditorium_id} not found")
         if not isinstance(start_time, datetime):
             raise ValueError(f"Movie start time must be in DateTime format")
-        
-        showing = MovieShowings(movie_id=movie_id, auditorium_id=auditorium_id, start_time=start_time)
-        db.session.add(showing)
-        db.session.commit()
+        start_time = _to_local_naive(start_time)
+        try:
+            length_mins = self.movie_length(movie_id)
+            if length_mins is None:
+                raise ValueError(f"Movie {movie_id} not found")
+            if not self.lock_auditoriums([auditorium_id]):
+                raise ValueError(f"Auditorium {auditorium_id} not found")
+            self.check_showing_conflict(auditorium_id, start_time, length_mins)
+
+            showing = MovieShowings(movie_id=movie_id, auditorium_id=auditorium_id, start_time=start_time)
+            db.session.add(showing)
+            db.session.flush()
+            self.theatre_stats_service.sync_showings(MovieShowings.id == showing.id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         return showing
 
     def edit_showing(self, showing_id, movie_id, auditorium_id, start_time):
         """Edit a movie showing (admin only).
 
+        The target auditorium row is locked before the conflict check, as in add_showing.
+
         Args:
             showing_id: Showing primary key.
             movie_id: New movie id.
@@ -252,28 +571,36 @@ class StaffService:
 
         Raises:
             ValueError: If acting user is not admin, any id not found,
-                or start_time is not a datetime.
+                start_time is not a datetime, or it overlaps another showing.
         """
         admin = self.validate_admin()
 
-        movie = Movies.query.filter_by(id=movie_id).first()
-        if not movie:
-            raise ValueError(f"Movie {movie_id} not found")
-        auditorium = Auditoriums.query.filter_by(id=auditorium_id).first()
-        if not auditorium:
-            raise ValueError(f"Auditorium {auditorium_id} not found")
-        
-        showing = MovieShowings.query.filter_by(id=showing_id).first()
-        if not showing:
-            raise ValueError(f"Movie Showing {showing_id} not found")
-        
-        if not isinstance(start_time, datetime):
-            raise ValueError(f"Movie start time must be in DateTime format")
-        
-        showing.movie_id = movie_id
-        showing.auditorium_id = auditorium_id
-        showing.start_time = start_time
-        db.session.commit()
+        try:
+            length_mins = self.movie_length(movie_id)
+            if length_mins is None:
+                raise ValueError(f"Movie {movie_id} not found")
+            if not self.lock_auditoriums([auditorium_id]):
+                raise ValueError(f"Auditorium {auditorium_id} not found")
+
+            showing = MovieShowings.query.filter_by(id=showing_id).first()
+            if not showing:
+                raise ValueError(f"Movie Showing {showing_id} not found")
+
+            if not isinstance(start_time, datetime):
+                raise ValueError(f"Movie start time must be in DateTime format")
+            start_time = _to_local_naive(start_time)
+            self.check_showing_conflict(auditorium_id, start_time, length_mins, exclude_id=showing.id)
+
+            showing.movie_id = movie_id
+            showing.auditorium_id = auditorium_id
+            showing.start_time = start_time
+            db.session.flush()
+            self.theatre_stats_service.sync_showings(MovieShowings.id == showing.id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        seat_map_cache.invalidate(showing.id)
         return showing
 
     def remove_showing(self, showing_id):
@@ -296,12 +623,83 @@ class StaffService:
         
         db.session.delete(showing)
         db.session.commit()
+        seat_map_cache.invalidate(showing_id)
+
+    def get_dashboard(self, theatre_id, start_date=None, end_date=None):
+        """Return a theatre's showing occupancy and concession revenue (admin only).
+
+        Reads only the showing_occupancy and theatre_revenue_daily summaries
+        through their (theatre_id, ...) indexes, so the cost depends on the
+        range requested and not on how many bookings or deliveries exist.
+
+        Args:
+            theatre_id: Theatre identifier.
+            start_date: First day (date or YYYY-MM-DD); defaults to DASHBOARD_DAYS before end_date.
+            end_date: Last day, inclusive (date or YYYY-MM-DD); defaults to the database's current date.
 
-    def set_availability(self, is_available):
+        Returns:
+            dict: {'theatre_id', 'start_date', 'end_date', 'showings', 'occupancy', 'revenue'},
+                where showings lists each showing's booked_seats, capacity, and occupancy
+                rate by start time, occupancy totals them, and revenue holds the
+                per-day deliveries and revenue plus their totals.
+
+        Raises:
+            ValueError: If acting user is not admin, the theatre is missing, or the date range is invalid.
+        """
+        admin = self.validate_admin()
+        if not reference_cache.theatre(theatre_id):
+            raise ValueError(f"Theatre {theatre_id} not found")
+        start_date, end_date = parse_date_range(start_date, end_date, MAX_DASHBOARD_DAYS, DASHBOARD_DAYS)
+
+        showings = (
+            ShowingOccupancy.query
+            .filter(
+                ShowingOccupancy.theatre_id == theatre_id,
+                ShowingOccupancy.start_time >= datetime.combine(start_date, time.min),
+                ShowingOccupancy.start_time < datetime.combine(end_date + timedelta(days=1), time.min)
+            )
+            .order_by(ShowingOccupancy.start_time)
+            .all()
+        )
+        days = (
+            TheatreRevenueDaily.query
+            .filter(TheatreRevenueDaily.theatre_id == theatre_id, TheatreRevenueDaily.sales_date.between(start_date, end_date))
+            .order_by(TheatreRevenueDaily.sales_date)
+            .all()
+        )
+
+        booked = sum(showing.booked_seats for showing in showings)
+        capacity = sum(showing.capacity for showing in showings)
+        return {
+            "theatre_id": theatre_id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "showings": [{
+                "showing_id": showing.movie_showing_id,
+                "auditorium_id": showing.auditorium_id,
+                "start_time": showing.start_time.isoformat(),
+                "booked_seats": showing.booked_seats,
+                "capacity": showing.capacity,
+                "occupancy": round(showing.booked_seats / showing.capacity, 4) if showing.capacity else None
+            } for showing in showings],
+            "occupancy": {
+                "booked_seats": booked,
+                "capacity": capacity,
+                "rate": round(booked / capacity, 4) if capacity else None
+            },
+            "revenue": {
+                "deliveries": sum(day.deliveries for day in days),
+                "total": float(sum((day.revenue for day in days), decimal.Decimal('0.00'))),
+                "days": [{"date": day.sales_date.isoformat(), "deliveries": day.deliveries, "revenue": float(day.revenue)} for day in days]
+            }
+        }
+
+    def set_availability(self, is_available, commit=True):
         """Set the current staff member's availability.
 
         Args:
             is_available: Boolean availability flag.
+            commit: Commit immediately; pass False to stay in the caller's transaction.
 
         Returns:
             Staff: The updated staff record.
@@ -312,7 +710,8 @@ class StaffService:
         staff = self.validate_staff()
         
         staff.is_available = is_available
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return staff
 
     def accept_delivery(self, delivery_id):
@@ -381,17 +780,46 @@ class StaffService:
         Returns:
             Staff | None: The selected staff member or None if none available.
         """
-        staff = Staff.query.filter_by(theatre_id=theatre_id, is_available=True).order_by(Staff.last_updated.asc(), Staff.user_id.asc()).all()
+        return (
+            Staff.query
+            .filter_by(theatre_id=theatre_id, is_available=True)
+            .order_by(Staff.last_updated.asc(), Staff.user_id.asc())
+            .first()
+        )
+
+    def claim_available_staff(self, theatre_id):
+        """Lock and claim the next available staff member at a theatre.
+
+        Reads a single row (LIMIT 1) from the (theatre_id, is_available,
+        last_updated) index with ``FOR UPDATE SKIP LOCKED`` and marks it
+        unavailable in the same transaction, so concurrent assignments pick
+        different staff without waiting on each other.
+
+        Args:
+            theatre_id: Theatre identifier.
+
+        Returns:
+            Staff | None: The claimed staff member or None if none available.
+        """
+        staff = (
+            Staff.query
+            .filter_by(theatre_id=theatre_id, is_available=True)
+            .order_by(Staff.last_updated.asc(), Staff.user_id.asc())
+            .with_for_update(skip_locked=True)
+            .populate_existing()
+            .first()
+        )
         if staff:
-            staff = staff[0]
+            staff.is_available = False
         return staff
     
-    def try_assign_staff(self, theatre_id, delivery):
+    def try_assign_staff(self, theatre_id, delivery, commit=True):
         """Assign an available staff member to a delivery if possible.
 
         Args:
             theatre_id: Theatre to search at.
             delivery: Delivery instance to assign.
+            commit: Commit immediately; pass False to stay in the caller's transaction.
 
         Returns:
             bool: True if an assignment occurred, else False.
@@ -401,14 +829,12 @@ class StaffService:
         """
         if not delivery:
             raise ValueError("Delivery not found")
-        staff = self.get_available_staff(theatre_id=theatre_id)
-        print(staff)
+        staff = self.claim_available_staff(theatre_id=theatre_id)
         if not staff:
             return False
         delivery.staff_id = staff.user_id
-        ss = StaffService(staff.user_id)
-        ss.set_availability(False)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return True
     
     def show_all_staff(self, theatre_id):
@@ -426,30 +852,44 @@ class StaffService:
         self.validate_admin()
         return Staff.query.filter(Staff.theatre_id == theatre_id).order_by(Staff.user_id.asc()).all()
     
-    def show_all_deliveries(self, theatre_id):
-        """List all deliveries related to a theatre (staff only).
+    def show_all_deliveries(self, theatre_id, after=None, limit=None, status=None):
+        """List deliveries related to a theatre (staff only), newest first, one page at a time.
 
-        Orders by delivery status then id descending.
+        Pages seek on delivery id instead of using OFFSET. Passing a status
+        (e.g. 'pending') keeps only that status, an equality on
+        idx_deliveries_status (delivery_status, id), so open work can be paged
+        on its own however much history sits in front of it.
 
         Args:
             theatre_id: Theatre identifier.
+            after: Opaque cursor from the previous page, or None for the first page.
+            limit: Page size (defaults to DEFAULT_LIMIT, capped at MAX_LIMIT).
+            status: Delivery status to filter on, or None for every status.
 
         Returns:
             list[Deliveries]: Matching deliveries.
 
         Raises:
-            ValueError: If the acting user is not staff.
+            ValueError: If the acting user is not staff, the status is unknown,
+                or the cursor or limit is invalid.
         """
         self.validate_staff()
-        deliveries = (
+        if status is not None and status not in Deliveries.delivery_status.type.enums:
+            raise ValueError(f"Invalid delivery status {status}")
+        limit = parse_limit(limit)
+        key = decode_cursor(after, 1)
+        query = (
             Deliveries.query
             .join(CustomerShowings, Deliveries.customer_showing_id == CustomerShowings.id)
             .join(Seats, CustomerShowings.seat_id == Seats.id)
             .join(Auditoriums, Seats.auditorium_id == Auditoriums.id)
             .filter(Auditoriums.theatre_id == theatre_id)
-            .order_by(Deliveries.delivery_status.asc(), Deliveries.id.desc())
-            .all()
         )
+        if status is not None:
+            query = query.filter(Deliveries.delivery_status == status)
+        if key:
+            query = query.filter(Deliveries.id < key[0])
+        deliveries = query.order_by(Deliveries.id.desc()).limit(limit).all()
         return deliveries
 
     def get_staff(self, staff_id):
@@ -1,5 +1,14 @@
 from app.models import *
 from app.app import db
+from app.services.cache import menu_cache
+from app.services.product_search import product_search_index
+from app.services.recommendation_service import pairing_recommender
+from app.services.pagination import parse_date_range
+import decimal
+
+# Longest range a sales report may cover, and the default when none is given
+MAX_REPORT_DAYS = 366
+DEFAULT_REPORT_DAYS = 30
 
 
 class SupplierService:
@@ -64,6 +73,7 @@ class SupplierService:
         supplier.contact_phone = contact_phone
         supplier.is_open = is_open
         db.session.commit()
+        menu_cache.clear()
         return supplier
 
     def set_is_open(self, is_open):
@@ -81,6 +91,7 @@ class SupplierService:
         supplier = self.validate_supplier()
         supplier.is_open = is_open
         db.session.commit()
+        menu_cache.clear()
         return supplier
 
     def get_products(self):
@@ -96,6 +107,60 @@ class SupplierService:
         products = Products.query.filter_by(supplier_id=self.user_id).all()
         return products
 
+    def get_sales_report(self, start_date=None, end_date=None):
+        """Summarize the supplier's sales by day and by product.
+
+        Reads only the supplier_sales_daily rollup (kept current at checkout and
+        cancellation), using its (supplier_id, sales_date, product_id) key.
+
+        Args:
+            start_date: First day (date or YYYY-MM-DD); defaults to DEFAULT_REPORT_DAYS before end_date.
+            end_date: Last day, inclusive (date or YYYY-MM-DD); defaults to the database's current date.
+
+        Returns:
+            dict: {'supplier_id', 'start_date', 'end_date', 'units', 'revenue',
+                'days': [{'date', 'units', 'revenue'}], 'products': [{'product_id', 'units', 'revenue'}]},
+                days ascending and products by revenue descending.
+
+        Raises:
+            ValueError: If the supplier record does not exist or the date range is invalid.
+        """
+        self.validate_supplier()
+        start_date, end_date = parse_date_range(start_date, end_date, MAX_REPORT_DAYS, DEFAULT_REPORT_DAYS)
+
+        rows = (
+            SupplierSalesDaily.query
+            .filter(
+                SupplierSalesDaily.supplier_id == self.user_id,
+                SupplierSalesDaily.sales_date.between(start_date, end_date)
+            )
+            .order_by(SupplierSalesDaily.sales_date, SupplierSalesDaily.product_id)
+            .all()
+        )
+
+        days = {}
+        products = {}
+        for row in rows:
+            for totals in (days.setdefault(row.sales_date, [0, decimal.Decimal('0.00')]),
+                           products.setdefault(row.product_id, [0, decimal.Decimal('0.00')])):
+                totals[0] += row.units
+                totals[1] += row.revenue
+        return {
+            "supplier_id": self.user_id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "units": sum(units for units, _ in days.values()),
+            "revenue": float(sum((revenue for _, revenue in days.values()), decimal.Decimal('0.00'))),
+            "days": [
+                {"date": day.isoformat(), "units": units, "revenue": float(revenue)}
+                for day, (units, revenue) in days.items() if units or revenue
+            ],
+            "products": [
+                {"product_id": product_id, "units": units, "revenue": float(revenue)}
+                for product_id, (units, revenue) in sorted(products.items(), key=lambda item: (-item[1][1], item[0])) if units or revenue
+            ]
+        }
+
     def add_product(self, name, unit_price, inventory_quantity, size, keywords, category, discount, is_available):
         """Create a new product for the current supplier.
 
@@ -129,6 +194,9 @@ class SupplierService:
         )
         db.session.add(product)
         db.session.commit()
+        menu_cache.clear()
+        product_search_index.upsert(product)
+        pairing_recommender.refresh_product(product)
         return product
 
     def edit_product(self, product_id, name, unit_price, inventory_quantity, size, keywords, category, discount, is_available):
@@ -165,6 +233,9 @@ class SupplierService:
         product.discount = discount
         product.is_available = is_available
         db.session.commit()
+        menu_cache.clear()
+        product_search_index.upsert(product)
+        pairing_recommender.refresh_product(product)
         return product
 
     def remove_product(self, product_id):
@@ -186,6 +257,9 @@ class SupplierService:
 
         db.session.delete(product)
         db.session.commit()
+        menu_cache.clear()
+        product_search_index.remove(product_id)
+        pairing_recommender.remove_product(product_id)
 
     def get_all_suppliers(self):
         """Return all open suppliers ordered by company name.
@@ -0,0 +1,152 @@
+from app.models import *
+from app.app import db
+from app.services.reference_cache import reference_cache
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+
+class TheatreStatsService:
+    """Summary tables behind the staff dashboard.
+
+    showing_occupancy holds one row per showing with its theatre, start time,
+    auditorium capacity, and booked seat count; theatre_revenue_daily holds
+    concession deliveries and revenue per theatre and day. Scheduling writes
+    the occupancy row, each booking bumps its counter, and checkout and
+    cancellation add to or subtract from the revenue row, so the dashboard
+    reads a few indexed rows instead of scanning bookings or deliveries.
+    Nothing is committed here except by rebuild(); changes join the caller's
+    transaction.
+    """
+
+    def sync_showings(self, *criteria, chunk_size=500):
+        """Recompute occupancy rows for the showings matching the given filters.
+
+        Used when showings are created or moved, where the count is small or
+        zero; bookings use record_booking instead.
+
+        Args:
+            *criteria: SQLAlchemy filters on MovieShowings/Auditoriums; none means every showing.
+            chunk_size: Rows per upsert statement.
+
+        Returns:
+            int: Number of occupancy rows written.
+        """
+        rows = (
+            db.session.query(
+                MovieShowings.id, Auditoriums.theatre_id, Auditoriums.id, MovieShowings.start_time,
+                Auditoriums.capacity, db.func.count(CustomerShowings.id)
+            )
+            .join(Auditoriums, MovieShowings.auditorium_id == Auditoriums.id)
+            .outerjoin(CustomerShowings, CustomerShowings.movie_showing_id == MovieShowings.id)
+            .filter(*criteria)
+            .group_by(MovieShowings.id, Auditoriums.theatre_id, Auditoriums.id, MovieShowings.start_time, Auditoriums.capacity)
+            .all()
+        )
+        values = [
+            {"movie_showing_id": showing_id, "theatre_id": theatre_id, "auditorium_id": auditorium_id,
+             "start_time": start_time, "capacity": capacity, "booked_seats": booked}
+            for showing_id, theatre_id, auditorium_id, start_time, capacity, booked in rows
+        ]
+        for offset in range(0, len(values), chunk_size):
+            statement = mysql_insert(ShowingOccupancy).values(values[offset:offset + chunk_size])
+            db.session.execute(statement.on_duplicate_key_update(
+                theatre_id=statement.inserted.theatre_id,
+                auditorium_id=statement.inserted.auditorium_id,
+                start_time=statement.inserted.start_time,
+                capacity=statement.inserted.capacity,
+                booked_seats=statement.inserted.booked_seats
+            ))
+        return len(values)
+
+    def record_booking(self, movie_showing_id, seats=1):
+        """Add booked seats to a showing's counter with one UPDATE.
+
+        Showings scheduled before occupancy was tracked have no row yet and
+        are recounted instead.
+
+        Args:
+            movie_showing_id: MovieShowings id.
+            seats: Seats booked (negative when bookings are removed).
+        """
+        result = db.session.execute(
+            db.update(ShowingOccupancy)
+            .where(ShowingOccupancy.movie_showing_id == movie_showing_id)
+            .values(booked_seats=ShowingOccupancy.booked_seats + seats)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.sync_showings(MovieShowings.id == movie_showing_id)
+
+    def set_capacity(self, auditorium_id, capacity):
+        """Copy an auditorium's new capacity onto its showings' occupancy rows."""
+        db.session.execute(
+            db.update(ShowingOccupancy)
+            .where(ShowingOccupancy.auditorium_id == auditorium_id)
+            .values(capacity=capacity)
+            .execution_options(synchronize_session=False)
+        )
+
+    def record_revenue(self, theatre_id, amount, deliveries=1, sales_date=None):
+        """Add concession revenue to a theatre's day with one upsert.
+
+        Args:
+            theatre_id: Theatre the delivery was made to.
+            amount: Revenue to add (negative to reverse).
+            deliveries: Delivery count to add (negative to reverse).
+            sales_date: Day to book it on; defaults to the database's CURRENT_DATE,
+                the same clock that stamps deliveries.date_added.
+        """
+        statement = mysql_insert(TheatreRevenueDaily).values(
+            theatre_id=theatre_id,
+            sales_date=sales_date or db.func.current_date(),
+            deliveries=deliveries,
+            revenue=amount
+        )
+        db.session.execute(statement.on_duplicate_key_update(
+            deliveries=TheatreRevenueDaily.deliveries + statement.inserted.deliveries,
+            revenue=TheatreRevenueDaily.revenue + statement.inserted.revenue
+        ))
+
+    def reverse_delivery(self, delivery):
+        """Subtract a cancelled delivery from its theatre's revenue on the day it was sold.
+
+        Args:
+            delivery: The Deliveries row being cancelled; deliveries that were
+                never charged were never recorded and are ignored.
+        """
+        if delivery.payment_status != 'completed':
+            return
+        customer_showing = db.session.get(CustomerShowings, delivery.customer_showing_id)
+        seat = reference_cache.seat(customer_showing.seat_id) if customer_showing else None
+        auditorium = reference_cache.auditorium(seat.auditorium_id) if seat else None
+        if auditorium is None:
+            return
+        self.record_revenue(auditorium.theatre_id, -delivery.total_price, deliveries=-1, sales_date=delivery.date_added.date())
+
+    def rebuild(self):
+        """Recompute both summary tables from showings, bookings, and deliveries, then commit.
+
+        Returns:
+            dict: {'showings', 'revenue_days'} row counts written.
+        """
+        sales_date = db.func.date(Deliveries.date_added)
+        history = (
+            db.select(Auditoriums.theatre_id, sales_date, db.func.count(Deliveries.id), db.func.sum(Deliveries.total_price))
+            .select_from(Deliveries)
+            .join(CustomerShowings, Deliveries.customer_showing_id == CustomerShowings.id)
+            .join(Seats, CustomerShowings.seat_id == Seats.id)
+            .join(Auditoriums, Seats.auditorium_id == Auditoriums.id)
+            .where(Deliveries.payment_status == 'completed', Deliveries.delivery_status != 'cancelled')
+            .group_by(Auditoriums.theatre_id, sales_date)
+        )
+        try:
+            db.session.execute(db.delete(ShowingOccupancy))
+            showings = self.sync_showings()
+            db.session.execute(db.delete(TheatreRevenueDaily))
+            result = db.session.execute(
+                db.insert(TheatreRevenueDaily).from_select(['theatre_id', 'sales_date', 'deliveries', 'revenue'], history)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return {"showings": showings, "revenue_days": result.rowcount}
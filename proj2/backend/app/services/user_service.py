@@ -1,16 +1,49 @@
-from app.models import Users
+from app.models import Users, CustomerShowings, MovieShowings
 from app.app import db
-from argon2 import PasswordHasher
+from app.services.cache import user_cache, seat_map_cache
+from app.services.theatre_stats_service import TheatreStatsService
+from app.services.password_hashing import password_pool
+from app.services.login_throttle import login_throttle
+from flask_login import UserMixin
+
+
+class CachedUser(UserMixin):
+    """Detached identity record returned by Flask-Login's user_loader.
+
+    Holds only the profile fields read through current_user, so it can be
+    cached across requests without a database session or the password hash.
+    """
+
+    def __init__(self, user):
+        """Copy identity fields from a Users row.
+
+        Args:
+            user: The Users record to copy.
+        """
+        self.id = user.id
+        self.name = user.name
+        self.email = user.email
+        self.phone = user.phone
+        self.birthday = user.birthday
+        self.role = user.role
+        self.account_status = user.account_status
+
+    @property
+    def is_active(self):
+        return self.account_status == 'active'
+
 
 class UserService:
     """Service for managing users: creation, retrieval, authentication, and updates.
     
     This module encapsulates user-related operations and password handling using Argon2.
+    Hashing runs on the shared, bounded password pool rather than the request thread.
     """
 
     def __init__(self):
-        """Initialize dependencies (password hasher)."""
-        self.ph = PasswordHasher()
+        """Initialize dependencies (shared password hashing pool and login throttle)."""
+        self.password_pool = password_pool
+        self.login_throttle = login_throttle
 
     def generate_password_hash(self, password):
         """Generate a secure Argon2 hash for a plaintext password.
@@ -20,8 +53,11 @@ class UserService:
 
         Returns:
             str: Encoded Argon2 hash string.
+
+        Raises:
+            HashingBusyError: If the hashing pool is saturated.
         """
-        password_hash = self.ph.hash(password)
+        password_hash = self.password_pool.hash(password)
         return password_hash
 
     def check_password_hash(self, password_hash, password):
@@ -33,34 +69,48 @@ class UserService:
 
         Returns:
             bool: True if the password matches the hash; otherwise False.
+
+        Raises:
+            HashingBusyError: If the hashing pool is saturated.
         """
-        try:
-            self.ph.verify(password_hash, password)
-            return True
-        except:
-            return False
+        return self.password_pool.verify(password_hash, password)
         
-    def validate_credentials(self, email, password):
+    def validate_credentials(self, email, password, client=None):
         """Validate user credentials and return the user if valid.
 
         Args:
             email: User email address.
             password: Plaintext password.
+            client: Client address used for per-client throttling, if known.
+
+        Attempts from an email or client that has used up its failure budget are
+        rejected before the user lookup or any hashing. A successful login whose
+        stored hash uses outdated cost parameters is transparently rehashed with
+        the current ones.
 
         Returns:
             Users | None: The user object if credentials are correct; otherwise None.
 
         Raises:
             ValueError: If email or password is empty.
+            HashingBusyError: If the hashing pool is saturated.
+            LoginThrottledError: If the email or client has too many recent failures.
         """
         if not email or not password:
             raise ValueError("Fields cannot be empty")
-        
-        user = Users.query.filter_by(email=email).first()
-        if not user: return None
 
-        if not self.check_password_hash(password_hash=user.password_hash, password=password):
+        self.login_throttle.check(email, client)
+
+        user = Users.query.filter_by(email=email).first()
+        if not user or not self.check_password_hash(password_hash=user.password_hash, password=password):
+            self.login_throttle.record_failure(email, client)
             return None
+
+        self.login_throttle.record_success(email)
+
+        if self.password_pool.needs_rehash(user.password_hash):
+            user.password_hash = self.generate_password_hash(password)
+            db.session.commit()
         return user
 
     def create_user(self, name, email, phone, birthday, password, role):
@@ -111,6 +161,9 @@ class UserService:
     def delete_user(self, user_id):
         """Delete a user by id.
 
+        A customer's bookings are removed with the user, so the occupancy of
+        the showings they had booked is recounted in the same transaction.
+
         Args:
             user_id: The user's primary key.
 
@@ -123,11 +176,42 @@ class UserService:
         user = self.get_user(user_id=user_id)
         if not user:
             raise ValueError(f"User {user_id} not found")
-        
-        db.session.delete(user)
-        db.session.commit()
+
+        showing_ids = []
+        if user.role == 'customer':
+            showing_ids = [row.movie_showing_id for row in db.session.query(CustomerShowings.movie_showing_id).filter_by(customer_id=user_id).distinct()]
+        try:
+            db.session.delete(user)
+            if showing_ids:
+                TheatreStatsService().sync_showings(MovieShowings.id.in_(showing_ids))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        user_cache.invalidate(user_id)
+        if showing_ids:
+            seat_map_cache.clear()
         return True
     
+    def load_session_user(self, user_id):
+        """Return the identity for a logged-in session, served from the user cache.
+
+        Args:
+            user_id: The user's primary key.
+
+        Returns:
+            CachedUser | None: The cached identity, or None if the user does not exist.
+        """
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        user = self.get_user(user_id=user_id)
+        if not user:
+            return None
+        cached = CachedUser(user)
+        user_cache.set(user_id, cached)
+        return cached
+
     def get_user(self, user_id):
         """Retrieve a user by id.
 
@@ -176,6 +260,7 @@ class UserService:
         user.birthday = birthday
 
         db.session.commit()
+        user_cache.invalidate(user_id)
         return user
     
     def change_password(self, user_id, current_password, new_password):
@@ -201,4 +286,5 @@ class UserService:
         
         user.password_hash = self.generate_password_hash(new_password)
         db.session.commit()
+        user_cache.invalidate(user_id)
         return user
@@ -0,0 +1,121 @@
+from app.models import *
+from app.app import db
+import decimal
+
+
+class WalletService:
+    """Balance changes on payment methods without read-modify-write.
+
+    Every debit and credit is one conditional UPDATE on the balance column, so
+    concurrent checkouts against the same card cannot both pass the funds
+    check. Each change also appends a row to the payment_transactions ledger;
+    history reads go to the ledger and never touch the balance row. Nothing is
+    committed here so changes join the caller's transaction.
+    """
+
+    def _to_amount(self, amount):
+        """Convert and validate a non-negative decimal amount.
+
+        Args:
+            amount: Number or Decimal to convert.
+
+        Returns:
+            Decimal: The amount rounded to cents.
+
+        Raises:
+            ValueError: If the amount is negative.
+        """
+        amount = decimal.Decimal(str(amount)).quantize(decimal.Decimal('0.01'))
+        if amount < 0:
+            raise ValueError("Amount cannot be negative")
+        return amount
+
+    def _expire_balance(self, payment_method_id):
+        """Expire the cached balance of a loaded payment method, if any."""
+        key = db.inspect(PaymentMethods).identity_key_from_primary_key((payment_method_id,))
+        payment_method = db.session.identity_map.get(key)
+        if payment_method is not None:
+            db.session.expire(payment_method, ['balance'])
+
+    def debit(self, payment_method_id, amount, delivery_id=None):
+        """Charge a payment method if its balance covers the amount.
+
+        Runs ``UPDATE payment_methods SET balance = balance - :amount WHERE
+        id = :id AND balance >= :amount`` and records a 'charge' ledger row
+        when a row was updated. A zero amount (e.g. a fully discounted cart)
+        succeeds without touching the balance or the ledger.
+
+        Args:
+            payment_method_id: Payment method id to charge.
+            amount: Non-negative amount to charge.
+            delivery_id: Delivery the charge pays for, if any.
+
+        Returns:
+            bool: True if charged; False if funds are insufficient or the method is missing.
+
+        Raises:
+            ValueError: If the amount is negative.
+        """
+        amount = self._to_amount(amount)
+        if amount == 0:
+            return True
+        result = db.session.execute(
+            db.update(PaymentMethods)
+            .where(PaymentMethods.id == payment_method_id, PaymentMethods.balance >= amount)
+            .values(balance=PaymentMethods.balance - amount)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+
+        self._expire_balance(payment_method_id)
+        db.session.add(PaymentTransactions(payment_method_id=payment_method_id, delivery_id=delivery_id, kind='charge', amount=amount))
+        return True
+
+    def credit(self, payment_method_id, amount, kind='top_up', delivery_id=None):
+        """Add to a payment method's balance with a single UPDATE.
+
+        A zero amount (e.g. refunding a zero-total delivery) is a no-op with
+        no ledger row.
+
+        Args:
+            payment_method_id: Payment method id to credit.
+            amount: Non-negative amount to add.
+            kind: Ledger kind, either 'top_up' or 'refund'.
+            delivery_id: Delivery being refunded, if any.
+
+        Raises:
+            ValueError: If the amount or kind is invalid, or the method is not found.
+        """
+        if kind not in ('top_up', 'refund'):
+            raise ValueError(f"Invalid credit kind {kind}")
+        amount = self._to_amount(amount)
+        if amount == 0:
+            return
+        result = db.session.execute(
+            db.update(PaymentMethods)
+            .where(PaymentMethods.id == payment_method_id)
+            .values(balance=PaymentMethods.balance + amount)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise ValueError("Payment method not found")
+
+        self._expire_balance(payment_method_id)
+        db.session.add(PaymentTransactions(payment_method_id=payment_method_id, delivery_id=delivery_id, kind=kind, amount=amount))
+
+    def get_transactions(self, payment_method_id):
+        """List ledger entries for a payment method, newest first.
+
+        Args:
+            payment_method_id: Payment method id.
+
+        Returns:
+            list[PaymentTransactions]: Ledger rows (possibly empty).
+        """
+        return (
+            PaymentTransactions.query
+            .filter(PaymentTransactions.payment_method_id == payment_method_id)
+            .order_by(PaymentTransactions.id.desc())
+            .all()
+        )
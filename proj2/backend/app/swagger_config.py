@@ -341,6 +341,16 @@ swagger_template = {
                 'is_default': {'type': 'boolean'}
             }
         },
+        'PaymentTransaction': {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                'delivery_id': {'type': 'integer', 'description': 'Delivery charged or refunded, if any.'},
+                'kind': {'type': 'string', 'enum': ['charge', 'refund', 'top_up']},
+                'amount': {'type': 'number', 'format': 'float'},
+                'date_added': {'type': 'string', 'format': 'date-time'}
+            }
+        },
         'FundAddition': {
             'type': 'object',
             'required': ['amount'],
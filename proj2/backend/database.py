@@ -4,7 +4,8 @@ import os
 # Schema table names
 tables = ['theatres', 'auditoriums', 'seats', 'users', 'staff', 'movies', 'movie_showings',
           'customers', 'customer_showings', 'payment_methods', 'drivers', 'suppliers',
-          'products', 'deliveries', 'cart_items', 'delivery_items']
+          'products', 'deliveries', 'cart_items', 'delivery_items', 'payment_transactions', 'seat_holds',
+          'product_neighbors', 'supplier_sales_daily', 'showing_occupancy', 'theatre_revenue_daily']
 
 
 # Drop a single table with foreign key checks temporarily disabled 
@@ -110,7 +111,8 @@ def create_tables(db):
             last_updated DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
             )"""
 
-    # Staff: staff profile per user; role enum and availability
+    # Staff: staff profile per user; role enum and availability; (theatre_id, is_available, last_updated) serves
+    # StaffService.claim_available_staff and get_available_staff
     staff = """CREATE TABLE IF NOT EXISTS staff (
             user_id BIGINT PRIMARY KEY,
             theatre_id BIGINT NOT NULL,
@@ -119,7 +121,8 @@ def create_tables(db):
             date_added DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
             last_updated DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            FOREIGN KEY (theatre_id) REFERENCES theatres(id)
+            FOREIGN KEY (theatre_id) REFERENCES theatres(id),
+            INDEX idx_staff_theatre_available (theatre_id, is_available, last_updated)
             )"""
 
     # Movies: catalog with rating constraint 0–5
@@ -158,7 +161,8 @@ def create_tables(db):
                 FOREIGN KEY (default_theatre_id) REFERENCES theatres(id)
                 )"""
 
-    # Customer showings: bookings with unique seat per showing
+    # Customer showings: bookings with unique seat per showing; (customer_id) serves CustomerService.get_all_showings,
+    # get_all_deliveries, and get_customer_showing
     customer_showings = """CREATE TABLE IF NOT EXISTS customer_showings (
                         id BIGINT AUTO_INCREMENT PRIMARY KEY,
                         customer_id BIGINT NOT NULL,
@@ -169,9 +173,26 @@ def create_tables(db):
                         FOREIGN KEY (customer_id) REFERENCES customers(user_id) ON DELETE CASCADE,
                         FOREIGN KEY (movie_showing_id) REFERENCES movie_showings(id) ON DELETE CASCADE,
                         FOREIGN KEY (seat_id) REFERENCES seats(id),
-                        CONSTRAINT unique_movie_seat UNIQUE(movie_showing_id, seat_id)
+                        CONSTRAINT unique_movie_seat UNIQUE(movie_showing_id, seat_id),
+                        INDEX idx_customer_showings_customer (customer_id)
                         )"""
 
+    # Seat holds: short-lived claims on a seat while a customer confirms; the unique key makes acquisition atomic,
+    # and (expires_at) serves SeatHoldService.sweep_expired
+    seat_holds = """CREATE TABLE IF NOT EXISTS seat_holds (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                customer_id BIGINT NOT NULL,
+                movie_showing_id BIGINT NOT NULL,
+                seat_id BIGINT NOT NULL,
+                expires_at DATETIME NOT NULL,
+                date_added DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (customer_id) REFERENCES customers(user_id) ON DELETE CASCADE,
+                FOREIGN KEY (movie_showing_id) REFERENCES movie_showings(id) ON DELETE CASCADE,
+                FOREIGN KEY (seat_id) REFERENCES seats(id) ON DELETE CASCADE,
+                CONSTRAINT unique_seat_hold UNIQUE(movie_showing_id, seat_id),
+                INDEX idx_seat_holds_expires_at (expires_at)
+                )"""
+
     # Payment methods: balances, expiration checks, and default flag
     payment_methods = """CREATE TABLE IF NOT EXISTS payment_methods (
                         id BIGINT AUTO_INCREMENT PRIMARY KEY,
@@ -190,7 +211,10 @@ def create_tables(db):
                         CONSTRAINT check_balance CHECK (balance >= 0)
                         )"""
 
-    # Drivers: delivery drivers with vehicle info and rating bounds
+    # Drivers: delivery drivers with vehicle info, rating bounds, and running rating/earnings aggregates;
+    # (duty_status, rating) serves DriverService.claim_best_available_driver and get_best_available_driver,
+    # (is_rated, rating, user_id) serves DriverService.get_leaderboard; is_rated is generated from rating_count
+    # so unrated drivers at the default 5.00 sit apart from the rated ones the board scans
     drivers = """CREATE TABLE IF NOT EXISTS drivers (
                 user_id BIGINT PRIMARY KEY,
                 license_plate VARCHAR(16) NULL,
@@ -199,9 +223,16 @@ def create_tables(db):
                 duty_status ENUM('unavailable', 'available', 'on_delivery') NOT NULL DEFAULT 'unavailable',
                 rating DECIMAL(3,2) NOT NULL DEFAULT 5.00,
                 total_deliveries INT NOT NULL DEFAULT 0,
+                rating_sum DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+                rating_count INT UNSIGNED NOT NULL DEFAULT 0,
+                is_rated BOOLEAN AS (rating_count > 0) STORED NOT NULL,
+                recent_ratings VARCHAR(64) NOT NULL DEFAULT '',
+                total_earnings DECIMAL(14,2) NOT NULL DEFAULT 0.00,
                 date_added DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 last_updated DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+                INDEX idx_drivers_status_rating (duty_status, rating),
+                INDEX idx_drivers_rating (is_rated, rating, user_id),
                 CONSTRAINT check_driver_rating CHECK (rating >= 0.00 AND rating <= 5.00)
                 )"""
 
@@ -217,7 +248,8 @@ def create_tables(db):
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 )"""
 
-    # Products: menu items with pricing, inventory, category, and availability
+    # Products: menu items with pricing, inventory, category, and availability; (is_available, supplier_id, name)
+    # serves CustomerService.show_all_products (the menu)
     products = """CREATE TABLE IF NOT EXISTS products (
                 id BIGINT AUTO_INCREMENT PRIMARY KEY,
                 supplier_id BIGINT NOT NULL,
@@ -235,10 +267,13 @@ def create_tables(db):
                 CONSTRAINT check_product_price CHECK (unit_price >= 0.00),
                 CONSTRAINT check_product_inventory CHECK (inventory_quantity >= 0),
                 CONSTRAINT unique_supplier_product UNIQUE(supplier_id, name),
-                CONSTRAINT check_discount_value CHECK (discount >= 0.00)
+                CONSTRAINT check_discount_value CHECK (discount >= 0.00),
+                INDEX idx_products_available_supplier_name (is_available, supplier_id, name)
                 )"""
 
-    # Deliveries: orders tying showings, payments, driver/staff, status, and totals
+    # Deliveries: orders tying showings, payments, driver/staff, status, and totals; (driver_id, delivery_status)
+    # serves DriverService.get_active_delivery and show_completed_deliveries; (delivery_status, id) serves
+    # StaffService.show_all_deliveries filtered to one status
     deliveries = """CREATE TABLE IF NOT EXISTS deliveries (
             id BIGINT AUTO_INCREMENT PRIMARY KEY,
             driver_id BIGINT,
@@ -257,7 +292,9 @@ def create_tables(db):
             FOREIGN KEY (customer_showing_id) REFERENCES customer_showings(id) ON DELETE CASCADE,
             FOREIGN KEY (payment_method_id) REFERENCES payment_methods(id),
             FOREIGN KEY (staff_id) REFERENCES staff(user_id),
-            CONSTRAINT check_total_price CHECK (total_price >= 0.00)
+            CONSTRAINT check_total_price CHECK (total_price >= 0.00),
+            INDEX idx_deliveries_driver_status (driver_id, delivery_status),
+            INDEX idx_deliveries_status (delivery_status, id)
             )"""
     
     # Cart items: unique (customer, product) with positive quantity
@@ -278,11 +315,82 @@ def create_tables(db):
                 cart_item_id BIGINT NOT NULL,
                 delivery_id BIGINT NOT NULL,
                 discount DECIMAL(10,2) DEFAULT 0.00 NOT NULL,
+                quantity INT UNSIGNED,
+                line_total DECIMAL(12,2),
                 FOREIGN KEY (cart_item_id) REFERENCES cart_items(id),
                 FOREIGN KEY (delivery_id) REFERENCES deliveries(id) ON DELETE CASCADE,
                 CONSTRAINT unique_delivery_item UNIQUE (delivery_id, cart_item_id)
                 )"""
 
+    # Payment transactions: append-only ledger of charges, refunds, and top-ups; (payment_method_id, id) serves
+    # WalletService.get_transactions
+    payment_transactions = """CREATE TABLE IF NOT EXISTS payment_transactions (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                payment_method_id BIGINT NOT NULL,
+                delivery_id BIGINT,
+                kind ENUM('charge', 'refund', 'top_up') NOT NULL,
+                amount DECIMAL(12,2) NOT NULL,
+                date_added DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (payment_method_id) REFERENCES payment_methods(id) ON DELETE CASCADE,
+                FOREIGN KEY (delivery_id) REFERENCES deliveries(id) ON DELETE SET NULL,
+                INDEX idx_payment_transactions_method (payment_method_id, id),
+                CONSTRAINT check_transaction_amount CHECK (amount > 0.00)
+                )"""
+
+    # Product neighbors: precomputed "customers also added" pairs rebuilt by CoPurchaseService.build_neighbors;
+    # the unique (product_id, neighbor_id) key serves CoPurchaseService.suggest_for_products
+    product_neighbors = """CREATE TABLE IF NOT EXISTS product_neighbors (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                product_id BIGINT NOT NULL,
+                neighbor_id BIGINT NOT NULL,
+                co_count INT UNSIGNED NOT NULL,
+                score FLOAT NOT NULL,
+                FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE,
+                FOREIGN KEY (neighbor_id) REFERENCES products(id) ON DELETE CASCADE,
+                CONSTRAINT unique_product_neighbor UNIQUE (product_id, neighbor_id)
+                )"""
+
+    # Supplier sales daily: per-day units and revenue by product, upserted at checkout and cancel by
+    # SalesRollupService; the unique (supplier_id, sales_date, product_id) key serves SupplierService.get_sales_report
+    supplier_sales_daily = """CREATE TABLE IF NOT EXISTS supplier_sales_daily (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                supplier_id BIGINT NOT NULL,
+                product_id BIGINT NOT NULL,
+                sales_date DATE NOT NULL,
+                units INT DEFAULT 0 NOT NULL,
+                revenue DECIMAL(14,2) DEFAULT 0.00 NOT NULL,
+                FOREIGN KEY (supplier_id) REFERENCES suppliers(user_id) ON DELETE CASCADE,
+                FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE,
+                CONSTRAINT unique_supplier_sales_day UNIQUE (supplier_id, sales_date, product_id)
+                )"""
+
+    # Showing occupancy: booked seats vs capacity per showing, kept current by TheatreStatsService on scheduling
+    # and booking; (theatre_id, start_time) serves StaffService.get_dashboard
+    showing_occupancy = """CREATE TABLE IF NOT EXISTS showing_occupancy (
+                movie_showing_id BIGINT PRIMARY KEY,
+                theatre_id BIGINT NOT NULL,
+                auditorium_id BIGINT NOT NULL,
+                start_time DATETIME NOT NULL,
+                capacity INT UNSIGNED NOT NULL DEFAULT 0,
+                booked_seats INT UNSIGNED NOT NULL DEFAULT 0,
+                FOREIGN KEY (movie_showing_id) REFERENCES movie_showings(id) ON DELETE CASCADE,
+                FOREIGN KEY (theatre_id) REFERENCES theatres(id) ON DELETE CASCADE,
+                FOREIGN KEY (auditorium_id) REFERENCES auditoriums(id) ON DELETE CASCADE,
+                INDEX idx_showing_occupancy_theatre_start (theatre_id, start_time)
+                )"""
+
+    # Theatre revenue daily: concession deliveries and revenue per theatre and day, upserted at checkout and
+    # cancel by TheatreStatsService; the unique (theatre_id, sales_date) key serves StaffService.get_dashboard
+    theatre_revenue_daily = """CREATE TABLE IF NOT EXISTS theatre_revenue_daily (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                theatre_id BIGINT NOT NULL,
+                sales_date DATE NOT NULL,
+                deliveries INT NOT NULL DEFAULT 0,
+                revenue DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+                FOREIGN KEY (theatre_id) REFERENCES theatres(id) ON DELETE CASCADE,
+                CONSTRAINT unique_theatre_revenue_day UNIQUE (theatre_id, sales_date)
+                )"""
+
     # Execute DDL statements in dependency order
     cursor_object.execute(theatres)
     cursor_object.execute(auditoriums)
@@ -293,6 +401,7 @@ def create_tables(db):
     cursor_object.execute(movie_showings)
     cursor_object.execute(customers)
     cursor_object.execute(customer_showings)
+    cursor_object.execute(seat_holds)
     cursor_object.execute(payment_methods)
     cursor_object.execute(drivers)
     cursor_object.execute(suppliers)
@@ -300,6 +409,11 @@ def create_tables(db):
     cursor_object.execute(deliveries)
     cursor_object.execute(cart_items)
     cursor_object.execute(delivery_items)
+    cursor_object.execute(payment_transactions)
+    cursor_object.execute(product_neighbors)
+    cursor_object.execute(supplier_sales_daily)
+    cursor_object.execute(showing_occupancy)
+    cursor_object.execute(theatre_revenue_daily)
 
     # Persist schema changes and close the connection
     db.commit()
@@ -102,11 +102,12 @@ def populate_db():
             (6, '1111222233334444', 1, 2026, '456 Suburb Rd', 5, False)])
 
    # Drivers data
-   insert("""INSERT INTO drivers (user_id, license_plate, vehicle_type, vehicle_color, duty_status, rating, total_deliveries) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-         [(9, 'ABCD123', 'car', 'red', 'available', 5.00, 10),
-            (10, None, 'bike', 'blue', 'available', 5.00, 20),
-            (11, None, 'scooter', 'green', 'unavailable', 4.25, 30),
-            (12, 'WXYZ789', 'car', 'silver', 'on_delivery', 4.95, 15)])
+   # rating is rating_sum / rating_count, so the aggregates agree with the seeded averages
+   insert("""INSERT INTO drivers (user_id, license_plate, vehicle_type, vehicle_color, duty_status, rating, rating_sum, rating_count, total_deliveries) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+         [(9, 'ABCD123', 'car', 'red', 'available', 5.00, 40.00, 8, 10),
+            (10, None, 'bike', 'blue', 'available', 5.00, 60.00, 12, 20),
+            (11, None, 'scooter', 'green', 'unavailable', 4.25, 85.00, 20, 30),
+            (12, 'WXYZ789', 'car', 'silver', 'on_delivery', 4.95, 49.50, 10, 15)])
 
    # Suppliers data
    insert("""INSERT INTO suppliers (user_id, company_name, company_address, contact_phone, is_open) VALUES (%s, %s, %s, %s, %s)""",
@@ -138,5 +139,19 @@ def populate_db():
          [(1, 1),
             (2, 2)])
 
+   # The rows above bypass the services, so build the dashboard and sales report summaries from them
+   rebuild_summaries()
+
+# Rebuild the summary tables through the app, against the same database
+def rebuild_summaries():
+   from app.app import create_app
+   from app.services.theatre_stats_service import TheatreStatsService
+   from app.services.sales_rollup_service import SalesRollupService
+
+   config_name = {'movie_munchers_prod': 'production', 'movie_munchers_test': 'testing'}.get(db_name, 'development')
+   with create_app(config_name).app_context():
+      TheatreStatsService().rebuild()
+      SalesRollupService().rebuild()
+
 # Call function to populate database
 populate_db()
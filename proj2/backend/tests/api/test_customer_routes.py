@@ -246,6 +246,35 @@ class TestCustomerRoutes:
         data = json.loads(response.data)
         assert 'error' in data
 
+    # Test listing the ledger entries recorded by top-ups
+    def test_get_payment_transactions_success(self, client, sample_customer):
+        add_response = client.post(f'/api/customers/{sample_customer}/payment-methods', json={
+            'card_number': '1234567812345678',
+            'expiration_month': 12,
+            'expiration_year': 2027,
+            'billing_address': '789 Pine St',
+            'balance': 10.00,
+            'is_default': True
+        })
+        pm_id = json.loads(add_response.data)['payment_method_id']
+        client.post(f'/api/payment-methods/{pm_id}/add-funds', json={'amount': 5.00})
+        client.post(f'/api/payment-methods/{pm_id}/add-funds', json={'amount': 7.50})
+
+        response = client.get(f'/api/payment-methods/{pm_id}/transactions')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [t['amount'] for t in data['transactions']] == [7.50, 5.00]
+        assert all(t['kind'] == 'top_up' for t in data['transactions'])
+
+    # Test listing transactions for a missing payment method
+    def test_get_payment_transactions_not_found(self, client):
+        response = client.get('/api/payment-methods/99999/transactions')
+
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert 'error' in data
+
     # Test adding item to cart
     def test_add_to_cart_success(self, client, app, sample_customer, sample_product):
         with app.app_context():
@@ -270,6 +299,25 @@ class TestCustomerRoutes:
         data = json.loads(response.data)
         assert 'error' in data
 
+    # Test the cart listing includes co-purchase suggestions from the neighbor table
+    def test_get_cart_with_suggestions(self, client, app, sample_customer, sample_product, sample_product_extra):
+        from app.app import db
+        from app.models import ProductNeighbors
+        with app.app_context():
+            db.session.add(ProductNeighbors(product_id=sample_product, neighbor_id=sample_product_extra, co_count=3, score=0.75))
+            db.session.commit()
+        client.post(f'/api/customers/{sample_customer}/cart', json={
+            'product_id': sample_product,
+            'quantity': 1
+        })
+
+        response = client.get(f'/api/customers/{sample_customer}/cart')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [item['product_id'] for item in data['items']] == [sample_product]
+        assert data['suggestions'] == [{'product_id': sample_product_extra, 'name': 'Soda', 'unit_price': 2.99, 'score': 0.75}]
+
     # Test updating cart item quantity
     def test_update_cart_item_success(self, client, sample_customer, sample_product_extra):
         add_response = client.post(f'/api/customers/{sample_customer}/cart', json={
@@ -378,6 +426,69 @@ class TestCustomerRoutes:
         data = json.loads(response.data)
         assert 'error' in data
 
+    # Seat map marks the booked seat and 404s for an unknown showing
+    def test_get_seat_map(self, client, app, sample_customer_showing, sample_showing):
+        response = client.get(f'/api/showings/{sample_showing}/seats')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['total'] == 1
+        assert data['available'] == 0
+        assert len(data['aisles']['A']['runs']) == 1
+
+        response = client.get('/api/showings/99999/seats')
+        assert response.status_code == 404
+
+    # Hold a seat, see it unavailable in the seat map, then confirm the booking
+    def test_seat_hold_and_confirm(self, client, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat = Seats(aisle='A', number=1, auditorium_id=sample_auditorium)
+            db.session.add(seat)
+            db.session.commit()
+            seat_id = seat.id
+
+        response = client.post(f'/api/customers/{sample_customer}/seat-holds', json={
+            'movie_showing_id': sample_showing,
+            'seat_id': seat_id
+        })
+        assert response.status_code == 201
+        hold_id = json.loads(response.data)['hold_id']
+        assert json.loads(client.get(f'/api/showings/{sample_showing}/seats').data)['available'] == 0
+
+        response = client.post(f'/api/customers/{sample_customer}/seat-holds/{hold_id}/confirm')
+        assert response.status_code == 201
+        assert 'customer_showing_id' in json.loads(response.data)
+
+        response = client.delete(f'/api/customers/{sample_customer}/seat-holds/{hold_id}')
+        assert response.status_code == 404
+
+    # Product search returns ranked matches and requires a query
+    def test_search_products(self, client, sample_product, sample_product_extra):
+        response = client.get('/api/products/search?q=pop')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [p['name'] for p in data['products']] == ['Popcorn']
+
+        response = client.get('/api/products/search')
+        assert response.status_code == 400
+
+    # Recommended products for a showing come back ranked with scores
+    def test_get_recommended_products(self, client, app, sample_showing, sample_movie, sample_supplier):
+        with app.app_context():
+            from app.models import Products
+            db.session.add(Products(supplier_id=sample_supplier, name='Test Snack', unit_price=2.00, inventory_quantity=5,
+                                    keywords='test, salty', category='snacks', is_available=True))
+            db.session.commit()
+
+        response = client.get(f'/api/showings/{sample_showing}/recommended-products')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['movie_id'] == sample_movie
+        assert [p['name'] for p in data['products']] == ['Test Snack']
+        assert data['products'][0]['score'] > 0
+
+        assert client.get('/api/showings/99999/recommended-products').status_code == 404
+        assert client.get(f'/api/showings/{sample_showing}/recommended-products?limit=abc').status_code == 400
+
     # Test delivery creation fails with insufficient funds
     def test_create_delivery_insufficient_funds(self, client, app, sample_customer_showing, sample_product):
         with app.app_context():
@@ -493,3 +604,30 @@ class TestCustomerRoutes:
             assert response.status_code == 404
             body = response.get_json()
             assert "error" in body
+
+    # Test the menu serves a strong ETag and answers If-None-Match with 304
+    def test_list_products_etag_not_modified(self, client, sample_product):
+        response = client.get('/api/products/menu')
+        assert response.status_code == 200
+        etag = response.headers.get('ETag')
+        assert etag and not etag.startswith('W/')
+        assert json.loads(response.data)['products'][0]['id'] == sample_product
+
+        cached = client.get('/api/products/menu', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+
+    # Test a supplier product edit invalidates the cached menu
+    def test_list_products_invalidated_by_supplier_edit(self, client, app, sample_supplier, sample_product):
+        from app.services.supplier_service import SupplierService
+        first = client.get('/api/products/menu')
+        etag = first.headers.get('ETag')
+
+        with app.app_context():
+            SupplierService(sample_supplier).edit_product(
+                product_id=sample_product, name='Large Popcorn', unit_price=7.99, inventory_quantity=100,
+                size='large', keywords='popcorn', category='snacks', discount=0.00, is_available=True
+            )
+
+        response = client.get('/api/products/menu', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['products'][0]['name'] == 'Large Popcorn'
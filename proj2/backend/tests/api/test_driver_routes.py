@@ -17,7 +17,7 @@ STATUS_ON_DELIVERY = 'on_delivery'
 
 class TestDriverRoutes:
     # Create a driver (and user) with unique email/phone to prevent IntegrityError on reruns.
-    def _create_test_driver(self, app, duty_status=STATUS_AVAILABLE, rating=5.0, deliveries=0, vehicle_color='Blue'):
+    def _create_test_driver(self, app, duty_status=STATUS_AVAILABLE, rating=5.0, deliveries=0, vehicle_color='Blue', rating_count=0):
         unique_id = uuid.uuid4().hex[:8]
         unique_phone = f'555111{unique_id[:4]}'
         unique_email = f'driver_{unique_id}@test.com'
@@ -42,6 +42,8 @@ class TestDriverRoutes:
                 duty_status=duty_status,
                 rating=rating,
                 total_deliveries=deliveries,
+                rating_sum=rating * rating_count,
+                rating_count=rating_count,
             )
             db.session.add(driver)
             db.session.commit()
@@ -212,6 +214,28 @@ class TestDriverRoutes:
         assert data['message'] == 'Driver created successfully'
         assert 'user_id' in data
 
+    def test_create_driver_hashing_busy(self, client, monkeypatch):
+        # A saturated password hashing pool is reported as 503, not 500.
+        from app.services.password_hashing import password_pool, HashingBusyError
+        def busy(password):
+            raise HashingBusyError("Password hashing is busy, please retry")
+        monkeypatch.setattr(password_pool, 'hash', busy)
+        response = client.post('/api/driver', json={
+            'name': 'Busy Driver',
+            'email': f'busydriver_{uuid.uuid4().hex[:4]}@example.com',
+            'phone': f'555222{uuid.uuid4().hex[:4]}',
+            'birthday': '1985-06-15',
+            'password': 'adminpass',
+            'role': 'driver',
+            'license_plate': 'BSY123',
+            'vehicle_type': 'car',
+            'vehicle_color': 'Red',
+            'duty_status': STATUS_UNAVAILABLE,
+            'rating': 4.8,
+            'total_deliveries': 0,
+        })
+        assert response.status_code == 503
+
     def test_create_driver_missing_fields(self, client):
         # Omits required driver fields; should return a 400 with an error.
         response = client.post('/api/driver', json={
@@ -355,7 +379,7 @@ class TestDriverRoutes:
 
     def test_rate_driver_success(self, client, app):
         # Rates a fulfilled delivery and checks the updated average rating.
-        driver_id, _ = self._create_test_driver(app, rating=4.0, deliveries=10)
+        driver_id, _ = self._create_test_driver(app, rating=4.0, deliveries=10, rating_count=10)
         delivery_id, _, _ = self._create_test_delivery(app, driver_id=driver_id, delivery_status='fulfilled')
         response = client.put(f'/api/deliveries/{delivery_id}/rate', json={'rating': 5})
         if response.status_code != 200:
@@ -385,6 +409,30 @@ class TestDriverRoutes:
         assert 'error' in data
         assert 'Can only rate fulfilled deliveries' in data['error']
 
+    def test_get_driver_stats(self, client, app):
+        # Stats reflect a rating applied through the rate endpoint.
+        driver_id, _ = self._create_test_driver(app, deliveries=4)
+        delivery_id, _, _ = self._create_test_delivery(app, driver_id=driver_id, delivery_status='fulfilled')
+        client.put(f'/api/deliveries/{delivery_id}/rate', json={'rating': 4.5})
+        response = client.get(f'/api/driver/{driver_id}/stats')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['total_deliveries'] == 4
+        assert data['rating'] == 4.5
+        assert data['rating_count'] == 1
+        assert data['recent_ratings'] == [4.5]
+        assert client.get('/api/driver/999999/stats').status_code == 404
+
+    def test_get_driver_leaderboard(self, client, app):
+        # The leaderboard ranks rated drivers and rejects a bad limit.
+        first_id, _ = self._create_test_driver(app, rating=4.9, rating_count=3)
+        second_id, _ = self._create_test_driver(app, rating=4.1, rating_count=3)
+        response = client.get('/api/drivers/leaderboard?limit=5')
+        assert response.status_code == 200
+        board = json.loads(response.data)['leaderboard']
+        assert [(row['rank'], row['user_id']) for row in board] == [(1, first_id), (2, second_id)]
+        assert client.get('/api/drivers/leaderboard?limit=0').status_code == 400
+
     # -------- Driver delivery views --------
 
     def test_get_active_delivery_found(self, client, app):
@@ -437,6 +485,12 @@ class TestDriverRoutes:
         data = json.loads(response.data)
         assert 'No previous deliveries found' in data['message']
 
+    def test_show_completed_deliveries_invalid_cursor(self, client, app):
+        # A malformed cursor or limit is a bad request, not a missing driver.
+        driver_id, _ = self._create_test_driver(app)
+        assert client.get(f'/api/driver/{driver_id}/history?after=not-base64!!').status_code == 400
+        assert client.get(f'/api/driver/{driver_id}/history?limit=0').status_code == 400
+
     def test_show_completed_deliveries_driver_not_found(self, client):
         # Unknown driver id should return 404 for history lookup.
         response = client.get('/api/driver/999999/history')
@@ -22,6 +22,25 @@ class TestStaffRoutes:
         assert data['user_id'] is not None
         assert data['staff_role'] == "runner"
 
+    # A saturated password hashing pool is reported as 503, not 500
+    def test_add_staff_hashing_busy(self, client, sample_theatre, sample_admin, monkeypatch):
+        from app.services.password_hashing import password_pool, HashingBusyError
+        def busy(password):
+            raise HashingBusyError("Password hashing is busy, please retry")
+        monkeypatch.setattr(password_pool, 'hash', busy)
+        response = client.post('/api/staff', json={
+            'user_id': sample_admin,
+            'name': 'Busy Staff',
+            'email': 'busy@example.com',
+            'phone': '5559997777',
+            'birthday': '1985-05-15',
+            'password': 'password123',
+            'role': 'runner',
+            'theatre_id': sample_theatre
+        })
+        assert response.status_code == 503
+        assert Users.query.filter_by(email='busy@example.com').first() is None
+
     # Test missing required fields for staff creation   
     def test_add_staff_missing_fields(self, client, sample_admin):
         response = client.post('/api/staff', json={
@@ -215,6 +234,25 @@ class TestStaffRoutes:
         data = json.loads(response.data)
         assert 'not found' in data['error']
 
+    def test_generate_seat_grid_success(self, client, sample_admin, sample_auditorium):
+        response = client.post(f'/api/auditoriums/{sample_auditorium}/seats', json={
+            'user_id': sample_admin,
+            'aisles': 4,
+            'seats_per_aisle': 10
+        })
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['created'] == 40
+        assert data['capacity'] == 40
+
+    def test_generate_seat_grid_missing_layout(self, client, sample_admin, sample_auditorium):
+        response = client.post(f'/api/auditoriums/{sample_auditorium}/seats', json={
+            'user_id': sample_admin
+        })
+
+        assert response.status_code == 400
+
     def test_add_showing_success(self, client, sample_admin, sample_movie, sample_auditorium):
         response = client.post(f'/api/showings', json={
             'user_id': sample_admin,
@@ -227,6 +265,42 @@ class TestStaffRoutes:
         data = json.loads(response.data)
         assert data['message'] == 'Movie Showing created successfully'
     
+    def test_bulk_add_showings_success(self, client, sample_admin, sample_movie, sample_auditorium):
+        response = client.post('/api/showings/bulk', json={
+            'user_id': sample_admin,
+            'start_date': '2025-01-01',
+            'end_date': '2025-01-07',
+            'slots': [
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '12:00'},
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '13:00'}
+            ]
+        })
+
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['created'] == 7
+        assert len(data['failed']) == 7
+
+    def test_bulk_add_showings_missing_fields(self, client, sample_admin):
+        response = client.post('/api/showings/bulk', json={
+            'user_id': sample_admin,
+            'start_date': '2025-01-01'
+        })
+
+        assert response.status_code == 400
+
+    def test_bulk_add_showings_malformed_slot(self, client, sample_admin):
+        response = client.post('/api/showings/bulk', json={
+            'user_id': sample_admin,
+            'start_date': '2025-01-01',
+            'end_date': '2025-01-07',
+            'slots': ['12:00']
+        })
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['error'] == "Slots must be a list of objects"
+
     def test_edit_showing_success(self, client, sample_admin, sample_showing, sample_movie, sample_auditorium):
         response = client.put(f'/api/showings/{sample_showing}', json={
             'user_id': sample_admin,
@@ -328,6 +402,13 @@ class TestStaffRoutes:
         assert 'deliveries' in data
         assert data['deliveries'] == []
 
+    def test_list_deliveries_by_theatre_invalid_cursor(self, client, sample_admin, sample_theatre):
+        response = client.get(f'/api/deliveries/list/{sample_theatre}?after=not-base64!!', json={
+            'user_id': sample_admin
+        })
+        assert response.status_code == 400
+        assert 'Invalid cursor' in json.loads(response.data)['error']
+
     def test_get_staff_by_id_successful(self, client, sample_admin):
         response = client.get(f'/api/staff/{sample_admin}', json={
             'user_id': sample_admin
@@ -348,3 +429,26 @@ class TestStaffRoutes:
 
 
     
+
+    def test_get_theatre_dashboard(self, client, sample_admin, sample_theatre, sample_auditorium, sample_showing):
+        from datetime import date
+        db.session.add(ShowingOccupancy(movie_showing_id=sample_showing, theatre_id=sample_theatre, auditorium_id=sample_auditorium,
+                                        start_time='2025-12-01 19:00:00', capacity=100, booked_seats=25))
+        db.session.add(TheatreRevenueDaily(theatre_id=sample_theatre, sales_date=date(2025, 12, 1), deliveries=3, revenue=42.50))
+        db.session.commit()
+
+        response = client.get(f'/api/theatres/{sample_theatre}/dashboard?user_id={sample_admin}&start_date=2025-11-28&end_date=2025-12-04')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['showings'][0]['showing_id'] == sample_showing
+        assert data['occupancy'] == {'booked_seats': 25, 'capacity': 100, 'rate': 0.25}
+        assert data['revenue']['total'] == 42.5
+
+    def test_get_theatre_dashboard_errors(self, client, sample_admin, sample_staff, sample_theatre):
+        assert client.get(f'/api/theatres/{sample_theatre}/dashboard').status_code == 400
+        assert client.get(f'/api/theatres/{sample_theatre}/dashboard?user_id={sample_staff}').status_code == 404
+        assert client.get(f'/api/theatres/999999/dashboard?user_id={sample_admin}').status_code == 404
+        assert client.get(f'/api/theatres/{sample_theatre}/dashboard?user_id={sample_admin}&start_date=soon').status_code == 400
+        response = client.get(f'/api/theatres/{sample_theatre}/dashboard?user_id={sample_admin}&start_date=2025-01-01&end_date=2025-12-31')
+        assert response.status_code == 400
+        assert 'Date range' in json.loads(response.data)['error']
@@ -20,6 +20,21 @@ class TestSupplierRoutes:
         data = json.loads(response.data)
         assert data['error'] == "Supplier 9999 not found"
 
+    # The sales report reads the rollup; an unknown supplier is 404 and a bad range is 400
+    def test_get_sales_report(self, client, sample_supplier, sample_product):
+        from datetime import date
+        db.session.add(SupplierSalesDaily(supplier_id=sample_supplier, product_id=sample_product, sales_date=date(2025, 3, 1), units=2, revenue=Decimal('11.98')))
+        db.session.commit()
+
+        response = client.get(f'/api/suppliers/{sample_supplier}/sales?start_date=2025-03-01&end_date=2025-03-07')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['units'] == 2
+        assert data['products'] == [{'product_id': sample_product, 'units': 2, 'revenue': 11.98}]
+
+        assert client.get('/api/suppliers/9999/sales').status_code == 404
+        assert client.get(f'/api/suppliers/{sample_supplier}/sales?start_date=soon').status_code == 400
+
     # Edit supplier details and confirm they persist in the database
     def test_edit_supplier_success(self, client, sample_supplier):
         response = client.put('/api/suppliers', json={
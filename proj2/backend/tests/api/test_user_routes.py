@@ -92,6 +92,23 @@ class TestUserRoutes:
         data = json.loads(response.data)
         assert 'Invalid email or password' in data['error']
 
+    # Repeated failures lock the email out with 429 before the password is checked
+    def test_login_throttled_after_failures(self, client, sample_user):
+        for _ in range(5):
+            response = client.post('/api/users/login', json={
+                'email': 'test@example.com',
+                'password': 'wrongpassword'
+            })
+            assert response.status_code == 401
+        response = client.post('/api/users/login', json={
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) > 0
+        data = json.loads(response.data)
+        assert 'Too many failed login attempts' in data['error']
+
     # Login should require an email field
     def test_login_missing_email(self, client):
         response = client.post('/api/users/login', json={
@@ -4,6 +4,7 @@ import pytest
 from app.app import create_app, db
 from database import create_tables, drop_all_tables, get_database
 from app.models import *
+from app.services.cache import clear_all
 
 # Create a fresh Flask app per test function and reset the MySQL test database
 @pytest.fixture(scope='function')
@@ -14,9 +15,30 @@ def app():
         drop_all_tables(test_db)
         create_tables(test_db)
         test_db.close()
+        clear_all()
         yield app
         db.session.remove()
 
+# Record SQL statements issued inside a `with count_queries() as statements:` block
+@pytest.fixture(scope='function')
+def count_queries(app):
+    from contextlib import contextmanager
+    from sqlalchemy import event
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return counter
+
 # Provide a Flask test client bound to the app fixture
 @pytest.fixture
 def client(app):
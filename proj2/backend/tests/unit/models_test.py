@@ -486,3 +486,15 @@ class TestModels:
             did = d.id
             db.session.delete(d); db.session.commit()
             assert DeliveryItems.query.filter_by(delivery_id=did).first() is None
+
+    # Secondary indexes declared in __table_args__ match the create_tables DDL
+    def test_declared_indexes_match_database(self, app):
+        with app.app_context():
+            for table in db.metadata.sorted_tables:
+                declared = {index.name: [c.name for c in index.columns] for index in table.indexes}
+                rows = db.session.execute(db.text(f"SHOW INDEX FROM {table.name}")).mappings().all()
+                actual = {}
+                for row in sorted(rows, key=lambda r: (r["Key_name"], r["Seq_in_index"])):
+                    if row["Key_name"].startswith("idx_"):
+                        actual.setdefault(row["Key_name"], []).append(row["Column_name"])
+                assert declared == actual, table.name
@@ -0,0 +1,26 @@
+import time
+from app.services.cache import LRUCache
+
+
+# Tests for cache.py
+class TestLRUCache:
+    # Least recently used entries are evicted first and counters track lookups
+    def test_eviction_and_stats(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 2, 'max_size': 2}
+
+    # Entries expire after the ttl and can be invalidated explicitly
+    def test_ttl_and_invalidate(self):
+        cache = LRUCache(max_size=4, ttl=0.05)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('b')
+        assert cache.get('b') is None
+        time.sleep(0.06)
+        assert cache.get('a') is None
@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+from app.app import db
+from app.models import Products, CartItems, Deliveries, DeliveryItems, ProductNeighbors
+from app.services.co_purchase_service import CoPurchaseService, basket_pairs, merge_counts
+
+
+# Create a third product for the sample supplier and return its id
+def _add_product(supplier_id, name='Candy', inventory=20, available=True):
+    product = Products(supplier_id=supplier_id, name=name, unit_price=1.99, inventory_quantity=inventory,
+                       category='candy', is_available=available)
+    db.session.add(product)
+    db.session.commit()
+    return product.id
+
+
+# Record a delivery containing the given products and return its id
+def _add_delivery(delivery_id, customer_id, product_ids):
+    base = db.session.get(Deliveries, delivery_id)
+    delivery = Deliveries(driver_id=base.driver_id, customer_showing_id=base.customer_showing_id,
+                          payment_method_id=base.payment_method_id, total_price=10.00, delivery_status='fulfilled')
+    db.session.add(delivery)
+    db.session.flush()
+    for product_id in product_ids:
+        item = CartItems(customer_id=customer_id, product_id=product_id, quantity=1)
+        db.session.add(item)
+        db.session.flush()
+        db.session.add(DeliveryItems(cart_item_id=item.id, delivery_id=delivery.id))
+    db.session.commit()
+    return delivery.id
+
+
+# Tests for co_purchase_service.py
+class TestCoPurchaseService:
+    # Every ordered pair of distinct products in a basket is emitted, nothing across baskets
+    def test_basket_pairs(self):
+        left, right = basket_pairs(np.array([0, 0, 0, 1, 1]), np.array([0, 1, 2, 0, 3]))
+        pairs = sorted(zip(left.tolist(), right.tolist()))
+        assert pairs == [(0, 1), (0, 2), (0, 3), (1, 0), (1, 2), (2, 0), (2, 1), (3, 0)]
+
+    # Counts for repeated keys are summed and returned in key order
+    def test_merge_counts(self):
+        keys, counts = merge_counts(np.array([5, 3, 5, 1]), np.array([1, 2, 3, 4]))
+        assert keys.tolist() == [1, 3, 5]
+        assert counts.tolist() == [4, 2, 4]
+
+    # Neighbors are scored by cosine similarity and cancelled deliveries are ignored
+    def test_build_neighbors(self, app, sample_delivery, sample_customer, sample_supplier, sample_product, sample_product_extra):
+        with app.app_context():
+            candy = _add_product(sample_supplier)
+            _add_delivery(sample_delivery, sample_customer, [sample_product, sample_product_extra])
+            _add_delivery(sample_delivery, sample_customer, [sample_product, sample_product_extra])
+            _add_delivery(sample_delivery, sample_customer, [sample_product, candy])
+            cancelled = _add_delivery(sample_delivery, sample_customer, [sample_product_extra, candy])
+            db.session.get(Deliveries, cancelled).delivery_status = 'cancelled'
+            db.session.commit()
+
+            written = CoPurchaseService().build_neighbors(top_k=10, batch_size=2)
+            rows = {(row.product_id, row.neighbor_id): row for row in ProductNeighbors.query.all()}
+
+            assert written == 4
+            assert set(rows) == {(sample_product, sample_product_extra), (sample_product_extra, sample_product),
+                                 (sample_product, candy), (candy, sample_product)}
+            popcorn_soda = rows[(sample_product, sample_product_extra)]
+            assert popcorn_soda.co_count == 2
+            assert popcorn_soda.score == pytest.approx(2 / np.sqrt(3 * 2))
+            assert rows[(sample_product, candy)].score == pytest.approx(1 / np.sqrt(3 * 1))
+
+    # top_k limits neighbors per product and a rebuild replaces the old rows
+    def test_build_neighbors_top_k(self, app, sample_delivery, sample_customer, sample_supplier, sample_product, sample_product_extra):
+        with app.app_context():
+            candy = _add_product(sample_supplier)
+            _add_delivery(sample_delivery, sample_customer, [sample_product, sample_product_extra])
+            _add_delivery(sample_delivery, sample_customer, [sample_product, sample_product_extra, candy])
+            service = CoPurchaseService()
+            service.build_neighbors()
+
+            assert service.build_neighbors(top_k=1) == 3
+            neighbors = ProductNeighbors.query.filter_by(product_id=sample_product).all()
+            assert [row.neighbor_id for row in neighbors] == [sample_product_extra]
+
+    # Suggestions sum scores across the cart, skip cart items, and skip unavailable or sold-out products
+    def test_suggest_for_products(self, app, sample_delivery, sample_customer, sample_supplier, sample_product, sample_product_extra):
+        with app.app_context():
+            candy = _add_product(sample_supplier)
+            sold_out = _add_product(sample_supplier, name='Nachos', inventory=0)
+            _add_delivery(sample_delivery, sample_customer, [sample_product, sample_product_extra, candy, sold_out])
+            _add_delivery(sample_delivery, sample_customer, [sample_product_extra, candy])
+            service = CoPurchaseService()
+            service.build_neighbors()
+
+            suggestions = service.suggest_for_products([sample_product, sample_product_extra])
+            assert [product.id for product, _ in suggestions] == [candy]
+            assert suggestions[0][1] > 0
+            assert service.suggest_for_products([]) == []
+
+    # The CLI command rebuilds the table and reports the row count
+    def test_build_command(self, app):
+        result = app.test_cli_runner().invoke(args=['build-product-neighbors', '--top-k', '5'])
+        assert result.exit_code == 0
+        assert 'Wrote 0 product neighbor rows' in result.output
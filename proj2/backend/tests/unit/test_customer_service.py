@@ -466,3 +466,87 @@ class TestCustomerService:
             )
             with pytest.raises(ValueError, match=f"Delivery {delivery.id} not found"):
                 _ = svc.get_delivery_details(delivery.id)
+
+    # create_delivery writes the delivery, items, charge, inventory, and assignments in one commit
+    def test_create_delivery_single_commit(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_product, sample_product_extra, sample_driver, sample_staff):
+        from sqlalchemy import event
+        from app.models import Deliveries, DeliveryItems, Products, Drivers, Staff
+        with app.app_context():
+            svc = CustomerService()
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product, quantity=2))
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product_extra, quantity=1))
+            db.session.commit()
+
+            commits = []
+            def on_commit(conn):
+                commits.append(conn)
+            event.listen(db.engine, 'commit', on_commit)
+            try:
+                delivery = svc.create_delivery(sample_customer_showing, sample_payment_method)
+            finally:
+                event.remove(db.engine, 'commit', on_commit)
+
+            assert len(commits) == 1
+            delivery_id = delivery.id
+            db.session.expire_all()
+
+            delivery = db.session.get(Deliveries, delivery_id)
+            assert delivery.payment_status == "completed"
+            assert delivery.driver_id == sample_driver
+            assert delivery.staff_id == sample_staff
+            assert DeliveryItems.query.filter_by(delivery_id=delivery_id).count() == 2
+            assert db.session.get(Products, sample_product).inventory_quantity == 98
+            assert float(PaymentMethods.query.filter_by(id=sample_payment_method).first().balance) == 100.00 - float(delivery.total_price)
+            assert db.session.get(Drivers, sample_driver).duty_status == "on_delivery"
+            assert db.session.get(Staff, sample_staff).is_available is False
+
+    # Every checkout decrements stock, so cached menu pages are dropped even when nothing sells out
+    def test_create_delivery_clears_menu_cache(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_product):
+        from app.services.cache import menu_cache
+        with app.app_context():
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product, quantity=1))
+            db.session.commit()
+            menu_cache.set((None, 50), (b'{}', 'etag'))
+
+            CustomerService().create_delivery(sample_customer_showing, sample_payment_method)
+
+            assert menu_cache.get((None, 50)) is None
+
+    # A failed charge leaves no delivery, no items, and untouched inventory
+    def test_create_delivery_insufficient_funds_rolls_back(self, app, sample_customer, sample_customer_showing, sample_payment_method_low_balance, sample_product, sample_driver):
+        from app.models import Deliveries, DeliveryItems, Products, Drivers
+        with app.app_context():
+            svc = CustomerService()
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product, quantity=3))
+            db.session.commit()
+
+            with pytest.raises(ValueError, match="Insufficient funds"):
+                svc.create_delivery(sample_customer_showing, sample_payment_method_low_balance)
+
+            db.session.expire_all()
+            assert Deliveries.query.count() == 0
+            assert DeliveryItems.query.count() == 0
+            assert db.session.get(Products, sample_product).inventory_quantity == 100
+            assert float(PaymentMethods.query.filter_by(id=sample_payment_method_low_balance).first().balance) == 5.00
+            assert db.session.get(Drivers, sample_driver).duty_status == "available"
+
+    # The menu pages through every available product without repeats using the cursor
+    def test_show_all_products_keyset_pages(self, app, sample_supplier):
+        from app.models import Products
+        from app.services.pagination import next_cursor
+        with app.app_context():
+            for i in range(7):
+                db.session.add(Products(supplier_id=sample_supplier, name=f'Item {i:02d}', unit_price=1.00, inventory_quantity=5, category='snacks'))
+            db.session.add(Products(supplier_id=sample_supplier, name='Hidden', unit_price=1.00, inventory_quantity=5, category='snacks', is_available=False))
+            db.session.commit()
+
+            svc = CustomerService()
+            seen = []
+            cursor = None
+            while True:
+                page = svc.show_all_products(after=cursor, limit=3)
+                seen.extend(p.name for p in page)
+                cursor = next_cursor(page, 3, svc.menu_sort_key)
+                if cursor is None:
+                    break
+            assert seen == [f'Item {i:02d}' for i in range(7)]
@@ -0,0 +1,54 @@
+import pytest
+from app.services.delivery_service import DeliveryService
+from app.models import Products, CartItems, DeliveryItems, Deliveries, CustomerShowings
+from app.app import db
+
+
+# Attach `count` products to an existing delivery through cart items
+def _add_delivery_items(delivery_id, supplier_id, count):
+    delivery = Deliveries.query.filter_by(id=delivery_id).first()
+    customer_id = CustomerShowings.query.filter_by(id=delivery.customer_showing_id).first().customer_id
+    for i in range(count):
+        product = Products(supplier_id=supplier_id, name=f'Item {i}', unit_price=1.00, inventory_quantity=10, category='snacks')
+        db.session.add(product)
+        db.session.flush()
+        cart_item = CartItems(customer_id=customer_id, product_id=product.id, quantity=i + 1)
+        db.session.add(cart_item)
+        db.session.flush()
+        db.session.add(DeliveryItems(cart_item_id=cart_item.id, delivery_id=delivery_id))
+    db.session.commit()
+
+
+# Tests for delivery_service.py
+class TestDeliveryService:
+    # Detail view includes venue, movie, and every item in insertion order
+    def test_get_delivery_detail_success(self, app, sample_delivery, sample_supplier):
+        with app.app_context():
+            _add_delivery_items(sample_delivery, sample_supplier, 3)
+            details = DeliveryService().get_delivery_detail(sample_delivery)
+            assert details["id"] == sample_delivery
+            assert details["theatre_name"] == "Theatre 1"
+            assert details["theatre_address"] == "1 Theatre St"
+            assert details["movie_title"] == "Test Movie"
+            assert details["items"] == [
+                {"name": "Item 0", "quantity": 1},
+                {"name": "Item 1", "quantity": 2},
+                {"name": "Item 2", "quantity": 3},
+            ]
+
+    # Missing deliveries raise the same error the customer service used to raise
+    def test_get_delivery_detail_not_found(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Delivery 99999 not found"):
+                DeliveryService().get_delivery_detail(99999)
+
+    # Query count stays at two no matter how many items the delivery has
+    @pytest.mark.parametrize("item_count", [1, 10, 25])
+    def test_get_delivery_detail_bounded_queries(self, app, sample_delivery, sample_supplier, count_queries, item_count):
+        with app.app_context():
+            _add_delivery_items(sample_delivery, sample_supplier, item_count)
+            db.session.expire_all()
+            with count_queries() as statements:
+                details = DeliveryService().get_delivery_detail(sample_delivery)
+            assert len(details["items"]) == item_count
+            assert len(statements) == 2
@@ -32,7 +32,7 @@ def driver_service():
 # Helper builders (DB objects)
 # ----------------------------
 
-def _create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('5.0'), deliveries=0, vehicle_color='Blue'):
+def _create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('5.0'), deliveries=0, vehicle_color='Blue', rating_count=0):
     # Create a driver user and driver record with unique email/phone
     unique_id = uuid.uuid4().hex[:8]
     unique_phone = f'555111{unique_id[:4]}'
@@ -57,7 +57,9 @@ def _create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('5.0')
             vehicle_color=vehicle_color,
             duty_status=duty_status,
             rating=rating,
-            total_deliveries=deliveries
+            total_deliveries=deliveries,
+            rating_sum=Decimal(str(rating)) * rating_count,
+            rating_count=rating_count
         )
         db.session.add(driver)
         db.session.commit()
@@ -422,6 +424,7 @@ class TestDriverService:
             updated_driver = Drivers.query.filter_by(user_id=driver_id).first()
             assert updated_driver.duty_status == STATUS_AVAILABLE
             assert updated_driver.total_deliveries == 6
+            assert updated_driver.total_earnings == Decimal('10.00')
 
     def test_complete_delivery_not_found(self, app, driver_service):
         # Completing a non-existent delivery should raise
@@ -448,7 +451,7 @@ class TestDriverService:
 
     def test_rate_driver_success_new_average(self, app, driver_service, setup_prerequisites):
         # Apply a new rating and verify the recalculated average and delivery flag
-        driver_id, driver = self._create_test_driver(app, rating=Decimal('4.00'), deliveries=10)
+        driver_id, driver = self._create_test_driver(app, rating=Decimal('4.00'), deliveries=10, rating_count=10)
         delivery_id = _create_delivery(
             app, driver_id=driver_id,
             showing_id=setup_prerequisites['customer_showing_id'],
@@ -500,6 +503,89 @@ class TestDriverService:
             with pytest.raises(ValueError, match="Can only rate fulfilled deliveries"):
                 driver_service.rate_driver(delivery_id, 5.0)
 
+    def test_rate_driver_weights_by_ratings_not_deliveries(self, app, driver_service, setup_prerequisites):
+        # A driver with many deliveries but no ratings takes the first rating as-is
+        driver_id, _ = self._create_test_driver(app, rating=Decimal('5.00'), deliveries=10)
+        delivery_id = _create_delivery(
+            app, driver_id=driver_id,
+            showing_id=setup_prerequisites['customer_showing_id'],
+            payment_id=setup_prerequisites['payment_method_id'],
+            status='fulfilled'
+        )
+        with app.app_context():
+            rated_driver, _ = driver_service.rate_driver(delivery_id, 2)
+            assert rated_driver.rating == Decimal('2.00')
+            assert rated_driver.rating_count == 1
+            assert rated_driver.rating_sum == Decimal('2.00')
+            db.session.expire_all()
+            assert db.session.get(Drivers, driver_id).is_rated is True
+
+    def test_rate_driver_keeps_legacy_rating(self, app, driver_service, setup_prerequisites):
+        # A non-default rating with no rating_count behind it counts as one earlier rating
+        driver_id, _ = self._create_test_driver(app, rating=Decimal('4.00'), deliveries=10)
+        delivery_id = _create_delivery(
+            app, driver_id=driver_id,
+            showing_id=setup_prerequisites['customer_showing_id'],
+            payment_id=setup_prerequisites['payment_method_id'],
+            status='fulfilled'
+        )
+        with app.app_context():
+            rated_driver, _ = driver_service.rate_driver(delivery_id, 2)
+            assert rated_driver.rating == Decimal('3.00')
+            assert rated_driver.rating_count == 2
+            assert rated_driver.rating_sum == Decimal('6.00')
+
+    def test_rate_driver_recent_window(self, app, driver_service, setup_prerequisites):
+        # Only the last RECENT_RATINGS_WINDOW ratings are kept in the window; the totals keep all
+        from app.services.driver_service import RECENT_RATINGS_WINDOW
+        driver_id, _ = self._create_test_driver(app)
+        ratings = [1, 2, 3, 4, 5] * 3
+        for rating in ratings:
+            delivery_id = _create_delivery(
+                app, driver_id=driver_id,
+                showing_id=setup_prerequisites['customer_showing_id'],
+                payment_id=setup_prerequisites['payment_method_id'],
+                status='fulfilled'
+            )
+            with app.app_context():
+                driver_service.rate_driver(delivery_id, rating)
+        with app.app_context():
+            stats = driver_service.get_driver_stats(driver_id)
+            assert stats['rating_count'] == 15
+            assert stats['rating'] == 3.0
+            assert stats['recent_ratings'] == [float(r) for r in ratings[-RECENT_RATINGS_WINDOW:]]
+            assert stats['recent_average'] == 3.0
+
+    def test_get_driver_stats_unrated(self, app, driver_service):
+        # Stats come from the driver row; an unrated driver has no recent average
+        driver_id, _ = self._create_test_driver(app, deliveries=3)
+        with app.app_context():
+            stats = driver_service.get_driver_stats(driver_id)
+            assert stats == {
+                'user_id': driver_id, 'total_deliveries': 3, 'total_earnings': 0.0, 'rating': 5.0,
+                'rating_count': 0, 'recent_ratings': [], 'recent_average': None
+            }
+            with pytest.raises(ValueError, match="Driver 999999 not found"):
+                driver_service.get_driver_stats(999999)
+
+    def test_get_leaderboard(self, app, driver_service, count_queries):
+        # Rated drivers are ranked by rating in one query; unrated ones are left out by default
+        low_id, _ = self._create_test_driver(app, rating=Decimal('3.50'), rating_count=4)
+        high_id, _ = self._create_test_driver(app, rating=Decimal('4.80'), rating_count=2)
+        mid_id, _ = self._create_test_driver(app, rating=Decimal('4.20'), rating_count=9)
+        unrated_id, _ = self._create_test_driver(app)
+        with app.app_context():
+            assert db.session.get(Drivers, unrated_id).is_rated is False
+            with count_queries() as statements:
+                board = driver_service.get_leaderboard(limit=2)
+            assert len(statements) == 1
+            assert [driver.user_id for driver, _ in board] == [high_id, mid_id]
+            assert board[0][1] == 'Test Driver'
+            assert [driver.user_id for driver, _ in driver_service.get_leaderboard(min_ratings=3)] == [mid_id, low_id]
+            assert driver_service.get_leaderboard(min_ratings=0)[0][0].user_id == unrated_id
+            with pytest.raises(ValueError, match="min_ratings"):
+                driver_service.get_leaderboard(min_ratings=-1)
+
     # ----------------------------
     # Retrieval methods
     # ----------------------------
@@ -541,3 +627,56 @@ class TestDriverService:
         with app.app_context():
             with pytest.raises(ValueError, match=f"No active delivery found for driver {driver_id}"):
                 driver_service.get_active_delivery(driver_id)
+
+    # ----------------------------
+    # Concurrent dispatch
+    # ----------------------------
+
+    def test_claim_best_available_driver_marks_on_delivery(self, app, driver_service):
+        # Claiming picks the top-rated available driver and flips its status
+        self._create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('4.0'))
+        best_id, _ = self._create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('4.9'))
+        with app.app_context():
+            driver = driver_service.claim_best_available_driver()
+            db.session.commit()
+            assert driver.user_id == best_id
+            assert Drivers.query.filter_by(user_id=best_id).first().duty_status == STATUS_ON_DELIVERY
+
+    def test_try_assign_driver_concurrent_checkouts(self, app):
+        # 50 concurrent checkouts against 20 drivers: exactly 20 claims succeed, each with a distinct driver
+        import threading
+        driver_count = 20
+        checkout_count = 50
+        for i in range(driver_count):
+            self._create_test_driver(app, duty_status=STATUS_AVAILABLE, rating=Decimal('4.0') + Decimal(i % 10) / 10)
+
+        barrier = threading.Barrier(checkout_count)
+        assigned = []
+        claims = []
+        lock = threading.Lock()
+
+        def checkout():
+            with app.app_context():
+                barrier.wait()
+                delivery = Deliveries()
+                try:
+                    claimed = DriverService().try_assign_driver(delivery)
+                    with lock:
+                        claims.append(claimed)
+                        if claimed:
+                            assigned.append(delivery.driver_id)
+                finally:
+                    db.session.remove()
+
+        threads = [threading.Thread(target=checkout) for _ in range(checkout_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claims) == checkout_count
+        assert claims.count(False) == checkout_count - driver_count
+        assert len(assigned) == driver_count
+        assert len(set(assigned)) == driver_count
+        with app.app_context():
+            assert Drivers.query.filter_by(duty_status=STATUS_AVAILABLE).count() == 0
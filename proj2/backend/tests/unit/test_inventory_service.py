@@ -0,0 +1,78 @@
+import pytest
+import threading
+from app.services.inventory_service import InventoryService
+from app.models import Products
+from app.app import db
+
+
+# Tests for inventory_service.py
+class TestInventoryService:
+    # Decrement several products with one guarded UPDATE
+    def test_decrement_stock_batches_lines(self, app, count_queries, sample_product, sample_product_extra):
+        with app.app_context():
+            with count_queries() as statements:
+                updated = InventoryService().decrement_stock([(sample_product, 3), (sample_product_extra, 5)])
+            db.session.commit()
+            assert updated == 2
+            assert len(statements) == 1
+            assert db.session.get(Products, sample_product).inventory_quantity == 97
+            assert db.session.get(Products, sample_product_extra).inventory_quantity == 45
+
+    # Repeated product ids are summed into one guarded amount
+    def test_decrement_stock_sums_repeated_products(self, app, sample_product):
+        with app.app_context():
+            InventoryService().decrement_stock([(sample_product, 40), (sample_product, 60)])
+            db.session.commit()
+            assert db.session.get(Products, sample_product).inventory_quantity == 0
+
+    # One short line fails the batch and a rollback leaves every product untouched
+    def test_decrement_stock_insufficient_rolls_back(self, app, sample_product, sample_product_extra):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Product inventory is insufficient"):
+                InventoryService().decrement_stock([(sample_product, 1), (sample_product_extra, 51)])
+            db.session.rollback()
+            assert db.session.get(Products, sample_product).inventory_quantity == 100
+            assert db.session.get(Products, sample_product_extra).inventory_quantity == 50
+
+    # Non-positive quantities are rejected before touching the database
+    def test_decrement_stock_invalid_quantity(self, app, sample_product):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Quantity must be greater than zero"):
+                InventoryService().decrement_stock([(sample_product, 0)])
+
+    # Concurrent checkouts of the last units never oversell
+    def test_decrement_stock_concurrent_no_oversell(self, app, sample_product):
+        with app.app_context():
+            db.session.get(Products, sample_product).inventory_quantity = 10
+            db.session.commit()
+
+        thread_count = 20
+        barrier = threading.Barrier(thread_count)
+        outcomes = []
+        lock = threading.Lock()
+
+        def checkout():
+            with app.app_context():
+                barrier.wait()
+                try:
+                    InventoryService().decrement_stock([(sample_product, 1)])
+                    db.session.commit()
+                    result = True
+                except ValueError:
+                    db.session.rollback()
+                    result = False
+                finally:
+                    db.session.remove()
+                with lock:
+                    outcomes.append(result)
+
+        threads = [threading.Thread(target=checkout) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            assert outcomes.count(True) == 10
+            assert outcomes.count(False) == 10
+            assert db.session.get(Products, sample_product).inventory_quantity == 0
@@ -0,0 +1,68 @@
+import pytest
+from app.services.login_throttle import LoginThrottle, LoginThrottledError, MemoryWindowStore, SQLiteWindowStore
+
+
+# Tests for login_throttle.py
+class TestLoginThrottle:
+    # The email window fills after email_limit failures and reports a retry delay
+    def test_email_limit(self):
+        throttle = LoginThrottle(email_limit=3, client_limit=10, window=60)
+        for _ in range(3):
+            throttle.check('a@example.com')
+            throttle.record_failure('a@example.com')
+        with pytest.raises(LoginThrottledError) as excinfo:
+            throttle.check('A@Example.com ')
+        assert 1 <= excinfo.value.retry_after <= 60
+        throttle.check('b@example.com')
+
+    # One client spraying many emails is stopped by the client window
+    def test_client_limit(self):
+        throttle = LoginThrottle(email_limit=5, client_limit=3, window=60)
+        for i in range(3):
+            throttle.record_failure(f'user{i}@example.com', '10.0.0.1')
+        with pytest.raises(LoginThrottledError):
+            throttle.check('fresh@example.com', '10.0.0.1')
+        throttle.check('fresh@example.com', '10.0.0.2')
+
+    # Success clears the email window but not the client window
+    def test_success_resets_email_only(self):
+        throttle = LoginThrottle(email_limit=2, client_limit=2, window=60)
+        throttle.record_failure('a@example.com', '10.0.0.1')
+        throttle.record_failure('a@example.com', '10.0.0.1')
+        throttle.record_success('a@example.com')
+        throttle.check('a@example.com')
+        with pytest.raises(LoginThrottledError):
+            throttle.check('a@example.com', '10.0.0.1')
+
+    # Failures older than the window no longer count
+    def test_window_expires(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('app.services.login_throttle.time.time', lambda: now[0])
+        throttle = LoginThrottle(email_limit=2, client_limit=2, window=60)
+        throttle.record_failure('a@example.com')
+        throttle.record_failure('a@example.com')
+        with pytest.raises(LoginThrottledError):
+            throttle.check('a@example.com')
+        now[0] += 61
+        throttle.check('a@example.com')
+
+    # The memory store tracks a bounded number of keys
+    def test_memory_store_evicts_oldest_key(self):
+        store = MemoryWindowStore(max_events=2, max_keys=2)
+        store.add('a', 1.0)
+        store.add('b', 1.0)
+        store.add('c', 1.0)
+        assert store.failures('a', 0) == (0, None)
+        assert store.failures('c', 0) == (1, 1.0)
+
+    # Two throttles over one SQLite file see each other's failures
+    def test_sqlite_store_is_shared(self, tmp_path):
+        path = str(tmp_path / 'throttle.db')
+        first = LoginThrottle(email_limit=2, client_limit=5, window=60, store=SQLiteWindowStore(path, 60))
+        second = LoginThrottle(email_limit=2, client_limit=5, window=60, store=SQLiteWindowStore(path, 60))
+        first.record_failure('a@example.com')
+        second.record_failure('a@example.com')
+        with pytest.raises(LoginThrottledError):
+            first.check('a@example.com')
+        second.record_success('a@example.com')
+        first.check('a@example.com')
@@ -0,0 +1,67 @@
+import base64
+import pytest
+from datetime import date
+from app.app import db
+from app.services.pagination import encode_cursor, decode_cursor, parse_limit, next_cursor, parse_date_range, InvalidPageError, DEFAULT_LIMIT, MAX_LIMIT
+
+
+# Tests for pagination.py
+class TestPagination:
+    # Cursors round-trip their key values and are URL safe
+    def test_cursor_round_trip(self):
+        token = encode_cursor(["Snack Co", "Popcorn", 42])
+        assert "=" not in token and "/" not in token and "+" not in token
+        assert decode_cursor(token, 3) == ["Snack Co", "Popcorn", 42]
+
+    # Missing cursors mean the first page
+    def test_decode_cursor_none(self):
+        assert decode_cursor(None, 1) is None
+        assert decode_cursor("", 1) is None
+
+    # Garbage, wrong-size, or non-list cursors are rejected
+    @pytest.mark.parametrize("token", [
+        "not-base64!!",
+        encode_cursor([1, 2]),
+        base64.urlsafe_b64encode(b'{"id":1}').decode('ascii').rstrip('=')
+    ])
+    def test_decode_cursor_invalid(self, token):
+        with pytest.raises(InvalidPageError, match="Invalid cursor"):
+            decode_cursor(token, 1)
+
+    # Only lists and tuples can be encoded, so a dict key is not silently reduced to its keys
+    def test_encode_cursor_rejects_non_sequence(self):
+        assert decode_cursor(encode_cursor((7,)), 1) == [7]
+        with pytest.raises(TypeError):
+            encode_cursor({"id": 1})
+
+    # Limits default, validate, and cap
+    def test_parse_limit(self):
+        assert parse_limit(None) == DEFAULT_LIMIT
+        assert parse_limit("10") == 10
+        with pytest.raises(InvalidPageError):
+            parse_limit(MAX_LIMIT + 1)
+        with pytest.raises(InvalidPageError):
+            parse_limit("ten")
+
+    # Only full pages produce a next cursor
+    def test_next_cursor(self):
+        assert next_cursor([1, 2], 3, lambda r: [r]) is None
+        assert decode_cursor(next_cursor([1, 2, 3], 3, lambda r: [r]), 1) == [3]
+
+    # Date ranges parse, check their length, and require both dates when there is no default
+    def test_parse_date_range(self):
+        assert parse_date_range('2025-03-01', date(2025, 3, 31), 31) == (date(2025, 3, 1), date(2025, 3, 31))
+        with pytest.raises(ValueError, match="YYYY-MM-DD"):
+            parse_date_range('March', '2025-03-31', 31)
+        with pytest.raises(ValueError, match="YYYY-MM-DD"):
+            parse_date_range('2025-03-01', None, 31)
+        with pytest.raises(ValueError, match="Date range must cover 1 to 31 days"):
+            parse_date_range('2025-03-02', '2025-03-01', 31)
+
+    # A missing end date defaults to the database's current date, not the app server's
+    def test_parse_date_range_defaults(self, app):
+        with app.app_context():
+            today = db.session.query(db.func.current_date()).scalar()
+            start_date, end_date = parse_date_range(None, None, 31, default_days=7)
+            assert end_date == today
+            assert (end_date - start_date).days == 6
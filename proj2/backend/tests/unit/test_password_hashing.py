@@ -0,0 +1,50 @@
+import pytest
+import threading
+from argon2 import PasswordHasher
+from app.services.password_hashing import PasswordHashingPool, HashingBusyError
+
+
+# Cheap parameters keep these tests fast
+def _pool(**overrides):
+    params = dict(time_cost=1, memory_cost=8, parallelism=1, workers=1, max_pending=0)
+    params.update(overrides)
+    return PasswordHashingPool(**params)
+
+
+# Tests for password_hashing.py
+class TestPasswordHashingPool:
+    # Hashes verify on the pool and mismatches return False
+    def test_hash_and_verify(self):
+        pool = _pool()
+        password_hash = pool.hash("secret")
+        assert pool.verify(password_hash, "secret") is True
+        assert pool.verify(password_hash, "wrong") is False
+        assert pool.verify("not-a-hash", "secret") is False
+
+    # Hashes made with other cost parameters are flagged for rehash
+    def test_needs_rehash(self):
+        pool = _pool()
+        assert pool.needs_rehash(pool.hash("secret")) is False
+        old_hash = PasswordHasher(time_cost=2, memory_cost=16, parallelism=1).hash("secret")
+        assert pool.needs_rehash(old_hash) is True
+
+    # A saturated pool rejects new work immediately instead of queueing
+    def test_rejects_when_full(self):
+        pool = _pool()
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=pool._run, args=(block,))
+        worker.start()
+        started.wait()
+        try:
+            with pytest.raises(HashingBusyError):
+                pool.hash("secret")
+        finally:
+            release.set()
+            worker.join()
+        assert pool.verify(pool.hash("secret"), "secret") is True
@@ -0,0 +1,63 @@
+import pytest
+from decimal import Decimal
+from app.services.pricing_service import PricingService
+from app.models import Products, CartItems
+from app.app import db
+
+
+# Build a cart of `line_count` distinct products for the customer
+def _build_cart(customer_id, supplier_id, line_count):
+    products = [
+        Products(supplier_id=supplier_id, name=f'Bench {i}', unit_price=Decimal('2.50'),
+                 discount=Decimal('0.50'), inventory_quantity=1000, category='snacks')
+        for i in range(line_count)
+    ]
+    db.session.add_all(products)
+    db.session.flush()
+    cart_items = [CartItems(customer_id=customer_id, product_id=p.id, quantity=2) for p in products]
+    db.session.add_all(cart_items)
+    db.session.commit()
+    return CartItems.query.filter_by(customer_id=customer_id).all()
+
+
+# Tests for pricing_service.py
+class TestPricingService:
+    # Quote returns the total and one breakdown line per cart item
+    def test_quote_cart_lines_and_total(self, app, sample_customer, sample_product, sample_product_extra):
+        with app.app_context():
+            db.session.add_all([
+                CartItems(customer_id=sample_customer, product_id=sample_product, quantity=2),
+                CartItems(customer_id=sample_customer, product_id=sample_product_extra, quantity=3),
+            ])
+            db.session.commit()
+            cart_items = CartItems.query.filter_by(customer_id=sample_customer).all()
+            quote = PricingService().quote_cart(cart_items)
+            assert float(quote["total"]) == 20.95
+            assert len(quote["lines"]) == 2
+            by_product = {line["product_id"]: line for line in quote["lines"]}
+            assert float(by_product[sample_product]["line_total"]) == 11.98
+            assert by_product[sample_product_extra]["quantity"] == 3
+
+    # Missing products are reported with the same message as before
+    def test_quote_cart_missing_product(self, app, sample_customer):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Product 99999 not found"):
+                PricingService().quote_cart([CartItems(customer_id=sample_customer, product_id=99999, quantity=1)])
+
+    # Invalid (empty) cart entries are rejected
+    def test_quote_cart_invalid_item(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Invalid cart item"):
+                PricingService().quote_cart([None])
+
+    # Pricing issues one query whether the cart has 1 or 500 lines
+    @pytest.mark.parametrize("line_count", [1, 10, 100, 500])
+    def test_quote_cart_query_count_is_constant(self, app, sample_customer, sample_supplier, count_queries, line_count):
+        with app.app_context():
+            cart_items = _build_cart(sample_customer, sample_supplier, line_count)
+            db.session.expunge_all()
+            with count_queries() as statements:
+                quote = PricingService().quote_cart(cart_items)
+            assert len(statements) == 1
+            assert len(quote["lines"]) == line_count
+            assert quote["total"] == Decimal('4.00') * line_count
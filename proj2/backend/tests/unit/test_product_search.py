@@ -0,0 +1,79 @@
+import pytest
+from app.app import db
+from app.models import Products
+from app.services.product_search import ProductSearchIndex, tokenize
+from app.services.supplier_service import SupplierService
+from app.services.customer_service import CustomerService
+
+
+# Add a product for the supplier directly and return its id
+def _add_product(supplier_id, name, keywords, category, is_available=True):
+    product = Products(supplier_id=supplier_id, name=name, unit_price=3.00, inventory_quantity=10,
+                       keywords=keywords, category=category, is_available=is_available)
+    db.session.add(product)
+    db.session.commit()
+    return product.id
+
+
+# Tests for product_search.py
+class TestProductSearch:
+    # Terms are lowercase alphanumeric words
+    def test_tokenize(self):
+        assert tokenize("Sweet, Refreshing, ICE-cold 7up") == ['sweet', 'refreshing', 'ice', 'cold', '7up']
+        assert tokenize(None) == []
+
+    # Exact and prefix matches are ranked by field weight; unavailable products are skipped
+    def test_search_ranking_and_prefix(self, app, sample_supplier):
+        with app.app_context():
+            lemonade = _add_product(sample_supplier, 'Lemonade', 'sweet, refreshing, cold', 'beverages')
+            cola = _add_product(sample_supplier, 'Cola', 'sweet, fizzy, cold', 'beverages')
+            candy = _add_product(sample_supplier, 'Sweet Tarts', 'sour, chewy', 'candy')
+            _add_product(sample_supplier, 'Iced Tea', 'sweet, cold', 'beverages', is_available=False)
+            index = ProductSearchIndex()
+
+            assert [pid for pid, _ in index.search('sweet')] == [candy, lemonade, cola]
+            assert [pid for pid, _ in index.search('cold swe')] == [lemonade, cola]
+            assert [pid for pid, _ in index.search('lemon')] == [lemonade]
+            assert index.search('fizzy sour') == []
+            assert index.search('   ') == []
+
+    # Supplier writes update the index without a rebuild
+    def test_incremental_updates(self, app, sample_supplier, count_queries):
+        with app.app_context():
+            customer_service = CustomerService()
+            supplier_service = SupplierService(sample_supplier)
+            assert customer_service.search_products('nachos') == []
+
+            product = supplier_service.add_product('Nachos', 6.50, 20, 'large', 'cheesy, salty', 'food', 0.00, True)
+            with count_queries() as queries:
+                ids = [p.id for p in customer_service.search_products('chee')]
+            assert ids == [product.id]
+            assert len(queries) == 1
+
+            supplier_service.edit_product(product.id, 'Loaded Nachos', 6.50, 20, 'large', 'spicy', 'food', 0.00, True)
+            assert customer_service.search_products('cheesy') == []
+            assert [p.id for p in customer_service.search_products('load spic')] == [product.id]
+
+            supplier_service.edit_product(product.id, 'Loaded Nachos', 6.50, 20, 'large', 'spicy', 'food', 0.00, False)
+            assert customer_service.search_products('nachos') == []
+
+            supplier_service.edit_product(product.id, 'Loaded Nachos', 6.50, 20, 'large', 'spicy', 'food', 0.00, True)
+            supplier_service.remove_product(product.id)
+            assert customer_service.search_products('nachos') == []
+
+    # Products hidden outside this process's index are filtered when the rows are fetched
+    def test_search_products_skips_hidden(self, app, sample_supplier):
+        with app.app_context():
+            customer_service = CustomerService()
+            product = SupplierService(sample_supplier).add_product('Pretzel', 4.00, 20, 'large', 'salty', 'food', 0.00, True)
+            assert [p.id for p in customer_service.search_products('pretzel')] == [product.id]
+
+            Products.query.filter_by(id=product.id).update({'is_available': False})
+            db.session.commit()
+            assert customer_service.search_products('pretzel') == []
+
+    # Empty queries are rejected by the service
+    def test_search_products_empty_query(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Search query cannot be empty"):
+                CustomerService().search_products('')
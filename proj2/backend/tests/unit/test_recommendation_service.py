@@ -0,0 +1,89 @@
+import pytest
+from app.app import db
+from app.models import Products, Movies
+from app.services.recommendation_service import PairingRecommender, pairing_recommender, keyword_terms
+from app.services.customer_service import CustomerService
+from app.services.supplier_service import SupplierService
+from app.services.staff_service import StaffService
+
+
+# Add an available product for the supplier directly and return its id
+def _add_product(supplier_id, name, keywords, category='snacks'):
+    product = Products(supplier_id=supplier_id, name=name, unit_price=3.00, inventory_quantity=10,
+                       keywords=keywords, category=category, is_available=True)
+    db.session.add(product)
+    db.session.commit()
+    return product.id
+
+
+# Add a movie directly and return its id
+def _add_movie(title, keywords):
+    movie = Movies(title=title, genre='Drama', length_mins=100, release_year=2020, keywords=keywords, rating=4.0)
+    db.session.add(movie)
+    db.session.commit()
+    return movie.id
+
+
+# Tests for recommendation_service.py
+class TestPairingRecommender:
+    # Keywords are comma-separated, case-insensitive tags
+    def test_keyword_terms(self):
+        assert keyword_terms(" Sweet, COLD ,, classic ") == {'sweet', 'cold', 'classic'}
+        assert keyword_terms(None) == set()
+
+    # Pairings are ranked by cosine similarity and exclude products sharing no tags
+    def test_recommend_ranking(self, app, sample_supplier):
+        with app.app_context():
+            movie_id = _add_movie('Romance Classic', 'classic, romance, sweet')
+            candy = _add_product(sample_supplier, 'Candy', 'sweet, classic')
+            popcorn = _add_product(sample_supplier, 'Popcorn', 'classic, salty')
+            _add_product(sample_supplier, 'Energy Drink', 'energy, cold')
+
+            pairings = PairingRecommender().recommend(movie_id, limit=5)
+            assert [product.id for product, _ in pairings] == [candy, popcorn]
+            assert pairings[0][1] == pytest.approx(2 / (3 ** 0.5 * 2 ** 0.5), rel=1e-5)
+
+    # Top-k is precomputed in batch so lookups make no queries
+    def test_recommend_served_from_memory(self, app, sample_supplier, count_queries):
+        with app.app_context():
+            movie_ids = [_add_movie(f'Movie {i}', 'intense, action' if i % 2 else 'sweet, classic') for i in range(6)]
+            for i in range(30):
+                _add_product(sample_supplier, f'Product {i}', 'sweet' if i % 3 else 'intense, energy')
+            recommender = PairingRecommender(top_k=5, chunk_size=4)
+            recommender.recommend(movie_ids[0])
+            with count_queries() as queries:
+                for movie_id in movie_ids:
+                    assert len(recommender.recommend(movie_id, limit=5)) == 5
+            assert len(queries) == 0
+
+    # Catalog writes refresh pairings incrementally
+    def test_incremental_refresh(self, app, sample_supplier, sample_admin):
+        with app.app_context():
+            movie_id = _add_movie('Action Movie', 'intense, action, energy')
+            drink = _add_product(sample_supplier, 'Energy Drink', 'energy, cold')
+            assert [p.id for p, _ in pairing_recommender.recommend(movie_id)] == [drink]
+
+            supplier_service = SupplierService(sample_supplier)
+            bar = supplier_service.add_product('Protein Bar', 2.50, 10, None, 'intense, energy', 'snacks', 0.00, True)
+            assert [p.id for p, _ in pairing_recommender.recommend(movie_id)] == [bar.id, drink]
+
+            supplier_service.remove_product(bar.id)
+            assert [p.id for p, _ in pairing_recommender.recommend(movie_id)] == [drink]
+
+            staff_service = StaffService(sample_admin)
+            staff_service.edit_movie(movie_id, 'Action Movie', 'Action', 100, 2020, 'romance', 4.0)
+            assert pairing_recommender.recommend(movie_id) == []
+
+            new_movie = staff_service.add_movie('Cold Open', 'Drama', 90, 2021, 'cold', 3.5)
+            assert [p.id for p, _ in pairing_recommender.recommend(new_movie.id)] == [drink]
+
+    # Unknown showings and out-of-range limits are rejected
+    def test_get_recommended_products_errors(self, app, sample_showing):
+        with app.app_context():
+            customer_service = CustomerService()
+            with pytest.raises(ValueError, match="Movie Showing 99999 not found"):
+                customer_service.get_recommended_products(99999)
+            with pytest.raises(ValueError, match="Limit must be between"):
+                customer_service.get_recommended_products(sample_showing, limit=50)
+            movie_id, pairings = customer_service.get_recommended_products(sample_showing)
+            assert pairings == []
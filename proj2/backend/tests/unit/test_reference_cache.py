@@ -0,0 +1,77 @@
+import pytest
+from app.services.reference_cache import reference_cache
+from app.services.staff_service import StaffService
+from app.models import Seats, Movies
+from app.app import db
+
+
+# Tests for reference_cache.py
+class TestReferenceCache:
+    # A warm cache resolves theatres, auditoriums, seats, and movies without queries
+    def test_warm_lookups_issue_no_queries(self, app, count_queries, sample_theatre, sample_auditorium, sample_movie):
+        with app.app_context():
+            seat = Seats(aisle='A', number=1, auditorium_id=sample_auditorium)
+            db.session.add(seat)
+            db.session.commit()
+            seat_id = seat.id
+            reference_cache.snapshot()
+
+            with count_queries() as statements:
+                assert reference_cache.seat(seat_id).auditorium_id == sample_auditorium
+                assert reference_cache.auditorium(sample_auditorium).theatre_id == sample_theatre
+                assert reference_cache.theatre(sample_theatre).id == sample_theatre
+                assert reference_cache.movie(sample_movie).title == 'Test Movie'
+                assert [a.id for a in reference_cache.auditoriums_for(sample_theatre)] == [sample_auditorium]
+                assert [s.id for s in reference_cache.seats_for(sample_auditorium)] == [seat_id]
+            assert statements == []
+
+    # Staff writes bump the version so the next read sees the change
+    def test_staff_writes_invalidate(self, app, sample_admin, sample_theatre, sample_movie):
+        with app.app_context():
+            version = reference_cache.snapshot().version
+            svc = StaffService(sample_admin)
+            svc.edit_movie(sample_movie, "Renamed", "Drama", 100, 2024, "new", 4)
+            assert reference_cache.version > version
+            assert reference_cache.movie(sample_movie).title == "Renamed"
+            svc.set_theatre_status(sample_theatre, False)
+            assert reference_cache.theatre(sample_theatre).is_open is False
+
+    # Rows added outside this process are found by a primary key fallback
+    def test_missing_id_falls_back_to_database(self, app, count_queries, sample_movie):
+        with app.app_context():
+            reference_cache.snapshot()
+            movie = Movies(title='Late Add', genre='Drama', length_mins=90, release_year=2024, keywords='x', rating=3)
+            db.session.add(movie)
+            db.session.commit()
+            version = reference_cache.version
+            with count_queries() as statements:
+                assert reference_cache.movie(movie.id).title == 'Late Add'
+                assert reference_cache.movie(movie.id).title == 'Late Add'
+            assert len(statements) == 1
+            assert reference_cache.version == version
+
+    # Nonexistent ids are remembered, so repeated misses neither query nor reload
+    def test_missing_id_is_cached(self, app, count_queries, sample_movie):
+        with app.app_context():
+            snapshot = reference_cache.snapshot()
+            with count_queries() as statements:
+                assert reference_cache.movie(99999) is None
+                assert reference_cache.movie(99999) is None
+                assert reference_cache.seat(99999) is None
+            assert len(statements) == 2
+            assert reference_cache.snapshot() is snapshot
+
+    # A remembered miss expires, so a row created after the miss is found without a reload
+    def test_missing_id_expires(self, app, monkeypatch, sample_movie):
+        with app.app_context():
+            reference_cache.snapshot()
+            movie = Movies(title='Soon', genre='Drama', length_mins=90, release_year=2024, keywords='x', rating=3)
+            db.session.add(movie)
+            db.session.flush()
+            missing_id = movie.id + 1
+            assert reference_cache.movie(missing_id) is None
+            db.session.add(Movies(id=missing_id, title='Later', genre='Drama', length_mins=90, release_year=2024, keywords='x', rating=3))
+            db.session.commit()
+            assert reference_cache.movie(missing_id) is None
+            monkeypatch.setattr(reference_cache, 'miss_ttl', 0)
+            assert reference_cache.movie(missing_id).title == 'Later'
@@ -0,0 +1,93 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from app.app import db
+from app.models import CartItems, DeliveryItems, Deliveries, SupplierSalesDaily
+from app.services.customer_service import CustomerService
+from app.services.sales_rollup_service import SalesRollupService
+
+
+# Fill the cart and check out; return the delivery id
+def _checkout(customer_id, customer_showing_id, payment_method_id, quantities):
+    for product_id, quantity in quantities.items():
+        db.session.add(CartItems(customer_id=customer_id, product_id=product_id, quantity=quantity))
+    db.session.commit()
+    return CustomerService().create_delivery(customer_showing_id, payment_method_id).id
+
+
+# Map product id -> (units, revenue) across every rollup row
+def _rollup():
+    db.session.expire_all()
+    return {row.product_id: (row.units, row.revenue) for row in SupplierSalesDaily.query.all()}
+
+
+# Tests for sales_rollup_service.py
+class TestSalesRollupService:
+    # Checkout snapshots each line onto delivery_items and adds it to today's rollup
+    def test_checkout_records_sale(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_supplier, sample_product, sample_product_extra):
+        with app.app_context():
+            delivery_id = _checkout(sample_customer, sample_customer_showing, sample_payment_method, {sample_product: 2, sample_product_extra: 1})
+
+            items = {item.cart_item_id: item for item in DeliveryItems.query.filter_by(delivery_id=delivery_id)}
+            assert sorted(item.quantity for item in items.values()) == [1, 2]
+            assert sorted(item.line_total for item in items.values()) == [Decimal('2.99'), Decimal('11.98')]
+            assert _rollup() == {sample_product: (2, Decimal('11.98')), sample_product_extra: (1, Decimal('2.99'))}
+            row = SupplierSalesDaily.query.first()
+            assert row.supplier_id == sample_supplier
+            assert row.sales_date == db.session.get(Deliveries, delivery_id).date_added.date()
+
+    # Cancelling subtracts the snapshotted lines even after the cart changed
+    def test_cancel_reverses_sale(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_driver, sample_product, sample_product_extra):
+        with app.app_context():
+            first = _checkout(sample_customer, sample_customer_showing, sample_payment_method, {sample_product: 2})
+            CartItems.query.filter_by(customer_id=sample_customer).delete()
+            db.session.commit()
+            _checkout(sample_customer, sample_customer_showing, sample_payment_method, {sample_product: 1, sample_product_extra: 1})
+            assert _rollup()[sample_product] == (3, Decimal('17.97'))
+
+            for item in CartItems.query.filter_by(customer_id=sample_customer):
+                item.quantity = 5
+            db.session.commit()
+            CustomerService().cancel_delivery(first)
+
+            assert _rollup() == {sample_product: (1, Decimal('5.99')), sample_product_extra: (1, Decimal('2.99'))}
+
+    # Cancelling a delivery that was never charged leaves the rollup alone
+    def test_cancel_uncharged_delivery(self, app, sample_delivery):
+        with app.app_context():
+            CustomerService().cancel_delivery(sample_delivery)
+            assert SupplierSalesDaily.query.count() == 0
+
+    # Rebuild reproduces the incremental totals and skips cancelled deliveries
+    def test_rebuild_matches_incremental(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_driver, sample_product, sample_product_extra):
+        with app.app_context():
+            first = _checkout(sample_customer, sample_customer_showing, sample_payment_method, {sample_product: 2, sample_product_extra: 3})
+            CustomerService().cancel_delivery(first)
+            CartItems.query.filter_by(customer_id=sample_customer).delete()
+            db.session.commit()
+            _checkout(sample_customer, sample_customer_showing, sample_payment_method, {sample_product: 1})
+            incremental = {product_id: totals for product_id, totals in _rollup().items() if totals[0]}
+
+            SupplierSalesDaily.query.delete()
+            db.session.commit()
+            assert SalesRollupService().rebuild() == 1
+            assert _rollup() == incremental == {sample_product: (1, Decimal('5.99'))}
+
+    # Rebuild only touches rows inside the requested range
+    def test_rebuild_range(self, app, sample_supplier, sample_product):
+        with app.app_context():
+            db.session.add(SupplierSalesDaily(supplier_id=sample_supplier, product_id=sample_product, sales_date=date(2020, 1, 1), units=4, revenue=Decimal('23.96')))
+            db.session.commit()
+
+            assert SalesRollupService().rebuild(start_date='2020-02-01', end_date='2020-02-29') == 0
+            assert _rollup() == {sample_product: (4, Decimal('23.96'))}
+            with pytest.raises(ValueError, match="YYYY-MM-DD"):
+                SalesRollupService().rebuild(start_date='yesterday')
+            with pytest.raises(ValueError, match="after end date"):
+                SalesRollupService().rebuild(start_date='2020-02-01', end_date='2020-01-01')
+
+    # The CLI command rebuilds and reports the row count
+    def test_rebuild_command(self, app):
+        result = app.test_cli_runner().invoke(args=['rebuild-sales-rollup', '--start-date', '2020-01-01'])
+        assert result.exit_code == 0
+        assert 'Wrote 0 supplier sales rollup rows' in result.output
@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime, timedelta
+from app.app import db
+from app.models import Seats, SeatHolds, CustomerShowings, ShowingOccupancy
+from app.services.seat_hold_service import SeatHoldService
+from app.services.seat_map_service import SeatMapService
+from app.services.customer_service import CustomerService
+from app.services.theatre_stats_service import TheatreStatsService
+
+
+# Create a seat in the auditorium and return its id
+def _add_seat(auditorium_id, number=1):
+    seat = Seats(aisle='A', number=number, auditorium_id=auditorium_id)
+    db.session.add(seat)
+    db.session.commit()
+    return seat.id
+
+
+# Create a second customer and return its user id
+def _other_customer(theatre_id):
+    customer = CustomerService().create_customer(
+        name='Other User', email='other@example.com', phone='5550001111', birthday='1991-01-01',
+        password='password123', role='customer', default_theatre_id=theatre_id
+    )
+    return customer.user_id
+
+
+# Tests for seat_hold_service.py
+class TestSeatHoldService:
+    # A held seat cannot be held or booked by another customer
+    def test_acquire_blocks_other_customers(self, app, sample_customer, sample_theatre, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            other_id = _other_customer(sample_theatre)
+            hold_service = SeatHoldService()
+            hold = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            assert hold.expires_at > datetime.now()
+
+            with pytest.raises(ValueError, match="held by another customer"):
+                hold_service.acquire_hold(other_id, sample_showing, seat_id)
+            with pytest.raises(ValueError, match="held by another customer"):
+                CustomerService().create_customer_showing(other_id, sample_showing, seat_id)
+            assert SeatMapService().get_seat_map(sample_showing)["available"] == 0
+
+    # Re-acquiring your own hold extends it instead of failing
+    def test_acquire_extends_own_hold(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            hold_service = SeatHoldService(ttl=60)
+            first = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            first_expiry = first.expires_at
+            second = SeatHoldService(ttl=600).acquire_hold(sample_customer, sample_showing, seat_id)
+            assert second.id == first.id
+            assert second.expires_at > first_expiry
+
+    # An expired hold is replaced by the next customer's acquire
+    def test_expired_hold_is_replaced(self, app, sample_customer, sample_theatre, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            other_id = _other_customer(sample_theatre)
+            hold_service = SeatHoldService()
+            hold = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            hold.expires_at = datetime.now() - timedelta(seconds=1)
+            db.session.commit()
+
+            replacement = hold_service.acquire_hold(other_id, sample_showing, seat_id)
+            assert replacement.customer_id == other_id
+            assert SeatHolds.query.count() == 1
+
+    # Confirming books the seat and removes the hold
+    def test_confirm_hold(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            hold_service = SeatHoldService()
+            hold = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            customer_showing = hold_service.confirm_hold(hold.id, sample_customer)
+            assert customer_showing.seat_id == seat_id
+            assert SeatHolds.query.count() == 0
+            with pytest.raises(ValueError, match="already booked"):
+                hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+
+    # Confirming a hold counts the booking on the showing's occupancy row
+    def test_confirm_hold_records_occupancy(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            TheatreStatsService().sync_showings()
+            db.session.commit()
+            assert db.session.get(ShowingOccupancy, sample_showing).booked_seats == 0
+            hold_service = SeatHoldService()
+            hold = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            hold_service.confirm_hold(hold.id, sample_customer)
+            db.session.expire_all()
+            assert db.session.get(ShowingOccupancy, sample_showing).booked_seats == 1
+
+    # Expired or foreign holds cannot be confirmed
+    def test_confirm_rejects_expired_and_foreign(self, app, sample_customer, sample_theatre, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_id = _add_seat(sample_auditorium)
+            other_id = _other_customer(sample_theatre)
+            hold_service = SeatHoldService()
+            hold = hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            with pytest.raises(ValueError, match="not found"):
+                hold_service.confirm_hold(hold.id, other_id)
+            hold.expires_at = datetime.now() - timedelta(seconds=1)
+            db.session.commit()
+            with pytest.raises(ValueError, match="has expired"):
+                hold_service.confirm_hold(hold.id, sample_customer)
+            assert CustomerShowings.query.count() == 0
+
+    # Seats from another auditorium cannot be held for the showing
+    def test_acquire_rejects_foreign_seat(self, app, sample_customer, sample_showing):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Seat 99999 not found"):
+                SeatHoldService().acquire_hold(sample_customer, sample_showing, 99999)
+
+    # The sweeper removes only expired holds, in batches
+    def test_sweep_expired(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            hold_service = SeatHoldService()
+            seat_ids = [_add_seat(sample_auditorium, number) for number in range(1, 6)]
+            for seat_id in seat_ids:
+                hold_service.acquire_hold(sample_customer, sample_showing, seat_id)
+            SeatHolds.query.filter(SeatHolds.seat_id.in_(seat_ids[:3])).update(
+                {SeatHolds.expires_at: datetime.now() - timedelta(seconds=1)}, synchronize_session=False)
+            db.session.commit()
+
+            assert hold_service.sweep_expired(batch_size=2) == 3
+            assert sorted(h.seat_id for h in SeatHolds.query.all()) == seat_ids[3:]
+
+    # The CLI command runs the sweeper
+    def test_sweep_command(self, app):
+        result = app.test_cli_runner().invoke(args=['sweep-seat-holds', '--batch-size', '10'])
+        assert result.exit_code == 0
+        assert 'Released 0 expired seat holds' in result.output
@@ -0,0 +1,65 @@
+import pytest
+from app.app import db
+from app.models import Seats, CustomerShowings
+from app.services.seat_map_service import SeatMapService, encode_aisle, decode_aisle
+from app.services.customer_service import CustomerService
+
+
+# Add a row of seats to an auditorium and return their ids in number order
+def _add_seats(auditorium_id, aisle, numbers):
+    seats = [Seats(aisle=aisle, number=number, auditorium_id=auditorium_id) for number in numbers]
+    db.session.add_all(seats)
+    db.session.commit()
+    return [seat.id for seat in seats]
+
+
+# Tests for seat_map_service.py
+class TestSeatMapService:
+    # Consecutive seats collapse into one run and the bitmap round-trips
+    def test_encode_decode_round_trip(self):
+        seats = [(10, 1, False), (11, 2, True), (12, 3, False), (20, 5, True)] + [(21 + i, 6 + i, i % 3 == 0) for i in range(8)]
+        entry = encode_aisle(seats)
+        assert entry["runs"] == [[1, 10, 3], [5, 20, 9]]
+        assert decode_aisle(entry) == seats
+
+    # Map reports every seat and marks booked ones as taken
+    def test_get_seat_map(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            a_ids = _add_seats(sample_auditorium, 'A', range(1, 6))
+            b_ids = _add_seats(sample_auditorium, 'B', range(1, 4))
+            CustomerService().create_customer_showing(sample_customer, sample_showing, a_ids[2])
+
+            seat_map = SeatMapService().get_seat_map(sample_showing)
+            assert seat_map["auditorium_id"] == sample_auditorium
+            assert seat_map["total"] == 8
+            assert seat_map["available"] == 7
+            assert [taken for _, _, taken in decode_aisle(seat_map["aisles"]["A"])] == [False, False, True, False, False]
+            assert [seat_id for seat_id, _, _ in decode_aisle(seat_map["aisles"]["B"])] == b_ids
+
+    # Map is built with one query and then served from cache
+    def test_get_seat_map_cached(self, app, sample_auditorium, sample_showing, count_queries):
+        with app.app_context():
+            _add_seats(sample_auditorium, 'A', range(1, 4))
+            seat_map_service = SeatMapService()
+            with count_queries() as queries:
+                seat_map_service.get_seat_map(sample_showing)
+                seat_map_service.get_seat_map(sample_showing)
+            assert len(queries) == 1
+
+    # Booking a seat invalidates the cached map for that showing
+    def test_booking_invalidates_map(self, app, sample_customer, sample_auditorium, sample_showing):
+        with app.app_context():
+            seat_ids = _add_seats(sample_auditorium, 'A', range(1, 4))
+            seat_map_service = SeatMapService()
+            assert seat_map_service.get_seat_map(sample_showing)["available"] == 3
+            CustomerService().create_customer_showing(sample_customer, sample_showing, seat_ids[0])
+            assert seat_map_service.get_seat_map(sample_showing)["available"] == 2
+
+    # Showing without seats yields an empty map; unknown showing raises
+    def test_get_seat_map_empty_and_missing(self, app, sample_showing):
+        with app.app_context():
+            seat_map = SeatMapService().get_seat_map(sample_showing)
+            assert seat_map["total"] == 0
+            assert seat_map["aisles"] == {}
+            with pytest.raises(ValueError, match="Movie Showing 99999 not found"):
+                SeatMapService().get_seat_map(99999)
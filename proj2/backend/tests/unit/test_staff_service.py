@@ -1,8 +1,8 @@
 import pytest
-from app.services.staff_service import StaffService
+from app.services.staff_service import StaffService, MAX_SEATS_PER_AISLE
 from app.services.user_service import UserService
 from app.models import *
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 # Test class for staff_service.py
 class TestStaffService:
@@ -183,6 +183,43 @@ class TestStaffService:
             with pytest.raises(ValueError):
                 staff_service.remove_movie(9999)
 
+    # Generate a seat grid in chunks and sync capacity to the real seat count
+    def test_generate_seat_grid(self, app, sample_admin, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            result = staff_service.generate_seat_grid(sample_auditorium, 3, 7, chunk_size=5)
+            assert result == {"auditorium_id": sample_auditorium, "created": 21, "capacity": 21}
+            assert Seats.query.filter_by(auditorium_id=sample_auditorium).count() == 21
+            assert db.session.get(Auditoriums, sample_auditorium).capacity == 21
+
+    # Re-running or growing a grid keeps existing seats and only adds the missing ones
+    def test_generate_seat_grid_idempotent(self, app, sample_admin, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            db.session.add(Seats(aisle='A', number=1, auditorium_id=sample_auditorium))
+            db.session.commit()
+            assert staff_service.generate_seat_grid(sample_auditorium, 2, 2)["created"] == 3
+            assert staff_service.generate_seat_grid(sample_auditorium, 2, 2)["created"] == 0
+            result = staff_service.generate_seat_grid(sample_auditorium, 2, 3)
+            assert result["created"] == 2
+            assert result["capacity"] == 6
+
+    # Invalid layouts, unknown auditoriums, and non-admins are rejected
+    def test_generate_seat_grid_invalid(self, app, sample_admin, sample_staff, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            with pytest.raises(ValueError, match="Aisles must be between 1 and 26"):
+                staff_service.generate_seat_grid(sample_auditorium, 27, 10)
+            with pytest.raises(ValueError, match="Seats per aisle"):
+                staff_service.generate_seat_grid(sample_auditorium, 2, 0)
+            with pytest.raises(ValueError, match="Seats per aisle"):
+                staff_service.generate_seat_grid(sample_auditorium, 2, MAX_SEATS_PER_AISLE + 1)
+            assert Seats.query.filter_by(auditorium_id=sample_auditorium).count() == 0
+            with pytest.raises(ValueError, match="Auditorium 9999 not found"):
+                staff_service.generate_seat_grid(9999, 2, 2)
+            with pytest.raises(ValueError, match="Not an admin"):
+                StaffService(sample_staff).generate_seat_grid(sample_auditorium, 2, 2)
+
     # Add a showing with valid movie, auditorium, and datetime
     def test_add_showing_success(self, app, sample_admin, sample_movie, sample_auditorium):
         with app.app_context():
@@ -190,6 +227,178 @@ class TestStaffService:
             showing = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 9, 0, 0))
             assert showing.movie_id == sample_movie
 
+    # Showings may not overlap in one auditorium once length and cleaning buffer are counted
+    def test_add_showing_overlap(self, app, sample_admin, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            long_movie = staff_service.add_movie('Long Movie', 'Drama', 169, 2024, 'long', 4.0)
+            first = staff_service.add_showing(long_movie.id, sample_auditorium, datetime(2025, 1, 1, 19, 30, 0))
+            with pytest.raises(ValueError, match=f"overlaps Movie Showing {first.id}"):
+                staff_service.add_showing(long_movie.id, sample_auditorium, datetime(2025, 1, 1, 20, 0, 0))
+            with pytest.raises(ValueError, match="overlaps"):
+                staff_service.add_showing(long_movie.id, sample_auditorium, datetime(2025, 1, 1, 17, 0, 0))
+            # 19:30 + 169 min + 15 min buffer = 22:34
+            staff_service.add_showing(long_movie.id, sample_auditorium, datetime(2025, 1, 1, 22, 34, 0))
+            staff_service.add_showing(long_movie.id, sample_auditorium, datetime(2025, 1, 1, 16, 26, 0))
+
+    # Editing a showing ignores itself but still rejects overlaps with others
+    def test_edit_showing_overlap(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            first = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 12, 0, 0))
+            second = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 18, 0, 0))
+            staff_service.edit_showing(first.id, sample_movie, sample_auditorium, datetime(2025, 1, 1, 12, 30, 0))
+            with pytest.raises(ValueError, match=f"overlaps Movie Showing {second.id}"):
+                staff_service.edit_showing(first.id, sample_movie, sample_auditorium, datetime(2025, 1, 1, 17, 0, 0))
+
+    # Aware start times are compared and stored as the same instant in local time
+    def test_add_showing_converts_aware_start(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            local = datetime(2025, 1, 1, 18, 0, 0)
+            first = staff_service.add_showing(sample_movie, sample_auditorium, local)
+            same_instant = local.astimezone().astimezone(timezone(timedelta(hours=5, minutes=30)))
+            with pytest.raises(ValueError, match=f"overlaps Movie Showing {first.id}"):
+                staff_service.add_showing(sample_movie, sample_auditorium, same_instant)
+            later = staff_service.add_showing(sample_movie, sample_auditorium, (local + timedelta(days=1)).astimezone(timezone.utc))
+            assert later.start_time == local + timedelta(days=1)
+
+    # A movie lengthened after the reference snapshot was loaded still widens the scan
+    def test_check_showing_conflict_sees_fresh_lengths(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            first = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 12, 0, 0))
+            db.session.get(Movies, sample_movie).length_mins = 600
+            db.session.commit()
+            with pytest.raises(ValueError, match=f"overlaps Movie Showing {first.id}"):
+                staff_service.check_showing_conflict(sample_auditorium, datetime(2025, 1, 1, 21, 0, 0), 90)
+
+    # The new showing's own length is read from the database, not the per-process cache
+    def test_add_showing_uses_fresh_movie_length(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            later = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 22, 0, 0))
+            db.session.get(Movies, sample_movie).length_mins = 600
+            db.session.commit()
+            with pytest.raises(ValueError, match=f"overlaps Movie Showing {later.id}"):
+                staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 1, 14, 0, 0))
+
+    # Only existing auditoriums are locked and reported
+    def test_lock_auditoriums(self, app, sample_admin, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            assert staff_service.lock_auditoriums([sample_auditorium, 999999, sample_auditorium]) == {sample_auditorium}
+            db.session.rollback()
+
+    # The conflict check scans only the window a showing could reach
+    def test_check_showing_conflict_single_query(self, app, sample_admin, sample_movie, sample_auditorium, count_queries):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            for day in range(1, 11):
+                staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, day, 12, 0, 0))
+            assert len(staff_service.showing_intervals(sample_auditorium, datetime(2025, 1, 5, 14, 0, 0), datetime(2025, 1, 5, 16, 0, 0))) == 1
+            with count_queries() as queries:
+                staff_service.check_showing_conflict(sample_auditorium, datetime(2025, 1, 5, 16, 0, 0), 120)
+            assert len(queries) == 1
+
+    # Bulk scheduling creates every slot on every date and reports conflicts per slot
+    def test_bulk_add_showings(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            existing = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 1, 3, 13, 0, 0))
+            result = staff_service.bulk_add_showings('2025-01-01', '2025-01-07', [
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '12:00'},
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '15:00'},
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '16:00'},
+                {'movie_id': 9999, 'auditorium_id': sample_auditorium, 'time': '20:00'},
+            ])
+            # On Jan 3 the existing 13:00 showing blocks 12:00 and 15:00; on other days 16:00 clashes with 15:00
+            assert result['created'] == 13
+            assert len(result['failed']) == 9
+            errors = [failure['error'] for failure in result['failed']]
+            assert sum(f"Movie Showing {existing.id}" in e for e in errors) == 2
+            assert sum('another showing in this request' in e for e in errors) == 6
+            assert 'Movie 9999 not found' in errors
+            assert MovieShowings.query.filter_by(auditorium_id=sample_auditorium).count() == 14
+
+    # Slot ids are coerced to integers, so the same auditorium given as int and string is checked as one
+    def test_bulk_add_showings_coerces_ids(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            result = staff_service.bulk_add_showings('2025-04-01', '2025-04-01', [
+                {'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '12:00'},
+                {'movie_id': str(sample_movie), 'auditorium_id': str(sample_auditorium), 'time': '13:00'},
+                {'movie_id': [sample_movie], 'auditorium_id': sample_auditorium, 'time': '20:00'},
+            ])
+            assert result['created'] == 1
+            errors = [failure['error'] for failure in result['failed']]
+            assert sum('another showing in this request' in e for e in errors) == 1
+            assert 'Movie and auditorium ids must be integers' in errors
+            assert MovieShowings.query.filter_by(auditorium_id=sample_auditorium).count() == 1
+
+    # Bulk scheduling inserts rows in a single transaction with multi-row statements
+    def test_bulk_add_showings_batched(self, app, sample_admin, sample_movie, sample_auditorium, count_queries):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            slots = [{'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': f'{hour:02d}:00'} for hour in (9, 12, 15, 18, 21)]
+            with count_queries() as queries:
+                result = staff_service.bulk_add_showings('2025-02-01', '2025-02-28', slots, chunk_size=100)
+            assert result['created'] == 140
+            inserts = [q for q in queries if q.lstrip().upper().startswith('INSERT INTO MOVIE_SHOWINGS')]
+            assert len(inserts) == 2
+
+    # Bulk scheduling creates an occupancy row for every new showing
+    def test_bulk_add_showings_tracks_occupancy(self, app, sample_admin, sample_movie, sample_auditorium):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            result = staff_service.bulk_add_showings('2025-03-01', '2025-03-03', [{'movie_id': sample_movie, 'auditorium_id': sample_auditorium, 'time': '18:00'}])
+            assert result['created'] == 3
+            assert ShowingOccupancy.query.filter_by(auditorium_id=sample_auditorium, booked_seats=0).count() == 3
+
+    # The dashboard reads the occupancy and revenue summaries for the range only
+    def test_get_dashboard(self, app, sample_admin, sample_theatre, sample_movie, sample_auditorium):
+        from datetime import date
+        from decimal import Decimal
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            inside = staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 5, 2, 20, 0)).id
+            staff_service.add_showing(sample_movie, sample_auditorium, datetime(2025, 5, 9, 20, 0))
+            ShowingOccupancy.query.filter_by(movie_showing_id=inside).update({'booked_seats': 40})
+            for day, deliveries, revenue in [(date(2025, 5, 1), 2, '20.00'), (date(2025, 5, 3), 1, '7.50'), (date(2025, 5, 20), 9, '99.00')]:
+                db.session.add(TheatreRevenueDaily(theatre_id=sample_theatre, sales_date=day, deliveries=deliveries, revenue=Decimal(revenue)))
+            db.session.commit()
+
+            dashboard = staff_service.get_dashboard(sample_theatre, '2025-05-01', '2025-05-07')
+            assert [showing['showing_id'] for showing in dashboard['showings']] == [inside]
+            assert dashboard['showings'][0]['occupancy'] == 0.4
+            assert dashboard['occupancy'] == {'booked_seats': 40, 'capacity': 100, 'rate': 0.4}
+            assert dashboard['revenue']['deliveries'] == 3
+            assert dashboard['revenue']['total'] == 27.5
+            assert [day['date'] for day in dashboard['revenue']['days']] == ['2025-05-01', '2025-05-03']
+
+    # The dashboard is admin-only and validates the theatre and range
+    def test_get_dashboard_invalid(self, app, sample_admin, sample_staff, sample_theatre):
+        with app.app_context():
+            with pytest.raises(ValueError, match="Not an admin"):
+                StaffService(sample_staff).get_dashboard(sample_theatre)
+            staff_service = StaffService(sample_admin)
+            with pytest.raises(ValueError, match="Theatre 999999 not found"):
+                staff_service.get_dashboard(999999)
+            with pytest.raises(ValueError, match="Date range"):
+                staff_service.get_dashboard(sample_theatre, '2025-01-01', '2025-12-31')
+            assert staff_service.get_dashboard(sample_theatre)['showings'] == []
+
+    # Invalid date ranges are rejected outright
+    def test_bulk_add_showings_invalid_range(self, app, sample_admin):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            with pytest.raises(ValueError, match="Date range"):
+                staff_service.bulk_add_showings('2025-01-07', '2025-01-01', [])
+            with pytest.raises(ValueError, match="YYYY-MM-DD"):
+                staff_service.bulk_add_showings('next week', '2025-01-01', [])
+            with pytest.raises(ValueError, match="Slots must be a list of objects"):
+                staff_service.bulk_add_showings('2025-01-01', '2025-01-07', [12])
+
     # Adding a showing with an invalid movie id should raise
     def test_add_showing_invalid_movie(self, app, sample_admin, sample_auditorium):
         with app.app_context():
@@ -404,6 +613,22 @@ class TestStaffService:
             assert isinstance(deliveries, list)
             assert deliveries == []
 
+    # A status filter pages through only that status, however much newer history exists
+    def test_show_all_deliveries_status_filter(self, app, sample_admin, sample_theatre, sample_delivery):
+        with app.app_context():
+            pending = db.session.get(Deliveries, sample_delivery)
+            for _ in range(3):
+                db.session.add(Deliveries(
+                    customer_showing_id=pending.customer_showing_id, payment_method_id=pending.payment_method_id,
+                    total_price=10.00, payment_status='completed', delivery_status='fulfilled'
+                ))
+            db.session.commit()
+            svc = StaffService(sample_admin)
+            assert [d.id for d in svc.show_all_deliveries(sample_theatre, limit=1, status='pending')] == [sample_delivery]
+            assert len(svc.show_all_deliveries(sample_theatre, status='fulfilled')) == 3
+            with pytest.raises(ValueError, match="Invalid delivery status"):
+                svc.show_all_deliveries(sample_theatre, status='lost')
+
     # Get a staff record by id and verify user_id
     def test_get_staff_success(self, app, sample_admin, sample_staff):
         with app.app_context():
@@ -418,3 +643,25 @@ class TestStaffService:
             with pytest.raises(ValueError, match="Unauthorized User - Not a staff member"):
                 staff = svc.get_staff(sample_customer)
                 assert staff is None
+
+    # Claiming staff reads one locked row and marks it unavailable
+    def test_claim_available_staff_single_locked_row(self, app, count_queries, sample_staff, sample_theatre):
+        with app.app_context():
+            with count_queries() as statements:
+                staff = StaffService(0).claim_available_staff(sample_theatre)
+            assert staff.user_id == sample_staff
+            assert staff.is_available is False
+            assert len(statements) == 1
+            assert "LIMIT" in statements[0].upper()
+            assert "SKIP LOCKED" in statements[0].upper()
+            db.session.commit()
+            assert Staff.query.filter_by(user_id=sample_staff).first().is_available is False
+
+    # Assigning staff with nobody available leaves the delivery untouched
+    def test_try_assign_staff_none_available(self, app, sample_staff, sample_theatre):
+        with app.app_context():
+            Staff.query.filter_by(user_id=sample_staff).first().is_available = False
+            db.session.commit()
+            delivery = Deliveries()
+            assert StaffService(0).try_assign_staff(sample_theatre, delivery) is False
+            assert delivery.staff_id is None
@@ -71,6 +71,39 @@ class TestSupplierService:
             products = service.get_products()
             assert products == []
 
+    # The sales report totals the rollup by day and by product within the range
+    def test_get_sales_report(self, app, sample_supplier, sample_product, sample_product_extra):
+        from datetime import date
+        with app.app_context():
+            for sales_date, product_id, units, revenue in [
+                (date(2025, 3, 1), sample_product, 2, '11.98'),
+                (date(2025, 3, 1), sample_product_extra, 1, '2.99'),
+                (date(2025, 3, 2), sample_product_extra, 4, '11.96'),
+                (date(2025, 4, 1), sample_product, 9, '53.91'),
+            ]:
+                db.session.add(SupplierSalesDaily(supplier_id=sample_supplier, product_id=product_id, sales_date=sales_date, units=units, revenue=Decimal(revenue)))
+            db.session.commit()
+
+            report = SupplierService(sample_supplier).get_sales_report('2025-03-01', '2025-03-31')
+            assert report['units'] == 7
+            assert report['revenue'] == pytest.approx(26.93)
+            assert report['days'] == [
+                {'date': '2025-03-01', 'units': 3, 'revenue': pytest.approx(14.97)},
+                {'date': '2025-03-02', 'units': 4, 'revenue': pytest.approx(11.96)},
+            ]
+            assert [entry['product_id'] for entry in report['products']] == [sample_product_extra, sample_product]
+
+    # The sales report rejects malformed or oversized ranges
+    def test_get_sales_report_invalid_range(self, app, sample_supplier):
+        with app.app_context():
+            service = SupplierService(sample_supplier)
+            with pytest.raises(ValueError, match="YYYY-MM-DD"):
+                service.get_sales_report('March', None)
+            with pytest.raises(ValueError, match="Date range"):
+                service.get_sales_report('2025-03-02', '2025-03-01')
+            with pytest.raises(ValueError, match="Date range"):
+                service.get_sales_report('2020-01-01', '2025-01-01')
+
     # Add a product and verify core fields
     def test_add_product_success(self, app, sample_supplier):
         with app.app_context():
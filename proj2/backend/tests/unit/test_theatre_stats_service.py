@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from app.app import db
+from app.models import Seats, CartItems, ShowingOccupancy, TheatreRevenueDaily, Deliveries
+from app.services.customer_service import CustomerService
+from app.services.staff_service import StaffService
+from app.services.theatre_stats_service import TheatreStatsService
+from app.services.user_service import UserService
+
+
+# Create seats in the auditorium and return their ids
+def _add_seats(auditorium_id, count):
+    seats = [Seats(aisle='B', number=number, auditorium_id=auditorium_id) for number in range(1, count + 1)]
+    db.session.add_all(seats)
+    db.session.commit()
+    return [seat.id for seat in seats]
+
+
+# Read a showing's occupancy row fresh from the database
+def _occupancy(showing_id):
+    db.session.expire_all()
+    return db.session.get(ShowingOccupancy, showing_id)
+
+
+# Tests for theatre_stats_service.py
+class TestTheatreStatsService:
+    # Scheduling creates the occupancy row and each booking bumps it
+    def test_add_showing_and_bookings(self, app, sample_admin, sample_customer, sample_theatre, sample_movie, sample_auditorium):
+        with app.app_context():
+            showing = StaffService(sample_admin).add_showing(sample_movie, sample_auditorium, datetime(2025, 6, 1, 18, 0))
+            row = _occupancy(showing.id)
+            assert (row.theatre_id, row.auditorium_id, row.capacity, row.booked_seats) == (sample_theatre, sample_auditorium, 100, 0)
+
+            service = CustomerService()
+            for seat_id in _add_seats(sample_auditorium, 3):
+                service.create_customer_showing(sample_customer, showing.id, seat_id)
+            assert _occupancy(showing.id).booked_seats == 3
+
+    # A showing scheduled before tracking gets its row recounted on the first booking
+    def test_booking_untracked_showing(self, app, sample_customer_showing, sample_showing):
+        with app.app_context():
+            assert _occupancy(sample_showing).booked_seats == 1
+
+    # Deleting a customer recounts the showings they had booked
+    def test_delete_customer_recounts(self, app, sample_customer, sample_customer_showing, sample_showing):
+        with app.app_context():
+            CustomerService().delete_customer(sample_customer)
+            assert _occupancy(sample_showing).booked_seats == 0
+
+    # Deleting the customer's user directly recounts in the same way
+    def test_delete_user_recounts(self, app, sample_customer, sample_customer_showing, sample_showing):
+        with app.app_context():
+            UserService().delete_user(sample_customer)
+            assert _occupancy(sample_showing).booked_seats == 0
+
+    # Moving a showing and regrowing the seat grid keep the row current
+    def test_edit_showing_and_capacity(self, app, sample_admin, sample_movie, sample_auditorium, sample_showing):
+        with app.app_context():
+            staff_service = StaffService(sample_admin)
+            staff_service.edit_showing(sample_showing, sample_movie, sample_auditorium, datetime(2025, 12, 2, 10, 0))
+            assert _occupancy(sample_showing).start_time == datetime(2025, 12, 2, 10, 0)
+
+            staff_service.generate_seat_grid(sample_auditorium, 2, 5)
+            assert _occupancy(sample_showing).capacity == 10
+
+    # Checkout adds to the theatre's revenue for today and cancellation takes it back out
+    def test_checkout_and_cancel_revenue(self, app, sample_customer, sample_customer_showing, sample_payment_method, sample_driver, sample_theatre, sample_product):
+        with app.app_context():
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product, quantity=2))
+            db.session.commit()
+            service = CustomerService()
+            first = service.create_delivery(sample_customer_showing, sample_payment_method).id
+            service.create_delivery(sample_customer_showing, sample_payment_method)
+
+            db.session.expire_all()
+            day = TheatreRevenueDaily.query.filter_by(theatre_id=sample_theatre).one()
+            assert (day.deliveries, day.revenue) == (2, Decimal('23.96'))
+            assert day.sales_date == db.session.get(Deliveries, first).date_added.date()
+
+            service.cancel_delivery(first)
+            db.session.expire_all()
+            day = TheatreRevenueDaily.query.filter_by(theatre_id=sample_theatre).one()
+            assert (day.deliveries, day.revenue) == (1, Decimal('11.98'))
+
+    # Rebuild reproduces the incrementally maintained summaries
+    def test_rebuild(self, app, sample_customer, sample_customer_showing, sample_showing, sample_payment_method, sample_driver, sample_theatre, sample_product):
+        with app.app_context():
+            db.session.add(CartItems(customer_id=sample_customer, product_id=sample_product, quantity=1))
+            db.session.commit()
+            service = CustomerService()
+            cancelled = service.create_delivery(sample_customer_showing, sample_payment_method).id
+            service.cancel_delivery(cancelled)
+            service.create_delivery(sample_customer_showing, sample_payment_method)
+            db.session.expire_all()
+            incremental = [(row.sales_date, row.deliveries, row.revenue) for row in TheatreRevenueDaily.query.all()]
+
+            assert TheatreStatsService().rebuild() == {"showings": 1, "revenue_days": 1}
+            db.session.expire_all()
+            assert [(row.sales_date, row.deliveries, row.revenue) for row in TheatreRevenueDaily.query.all()] == incremental
+            assert incremental[0][1:] == (1, Decimal('5.99'))
+            assert _occupancy(sample_showing).booked_seats == 1
+
+    # The CLI command rebuilds and reports both row counts
+    def test_rebuild_command(self, app):
+        result = app.test_cli_runner().invoke(args=['rebuild-theatre-stats'])
+        assert result.exit_code == 0
+        assert 'Wrote 0 showing occupancy rows and 0 theatre revenue rows' in result.output
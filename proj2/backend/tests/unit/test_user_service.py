@@ -97,6 +97,29 @@ class TestUserService:
             with pytest.raises(ValueError, match="Fields cannot be empty"):
                 user_service.validate_credentials('test@example.com', '')
 
+    # Throttled attempts are rejected without touching the hashing pool
+    def test_validate_credentials_throttled_skips_hashing(self, app, sample_user, monkeypatch):
+        from app.services.login_throttle import LoginThrottledError
+        with app.app_context():
+            user_service = UserService()
+            for _ in range(5):
+                assert user_service.validate_credentials('test@example.com', 'wrongpassword') is None
+            calls = []
+            monkeypatch.setattr(user_service.password_pool, 'verify', lambda *args: calls.append(args))
+            with pytest.raises(LoginThrottledError):
+                user_service.validate_credentials('test@example.com', 'password123')
+            assert calls == []
+
+    # A successful login clears the email's failure window
+    def test_validate_credentials_success_resets_throttle(self, app, sample_user):
+        with app.app_context():
+            user_service = UserService()
+            for _ in range(4):
+                user_service.validate_credentials('test@example.com', 'wrongpassword')
+            assert user_service.validate_credentials('test@example.com', 'password123') is not None
+            for _ in range(4):
+                assert user_service.validate_credentials('test@example.com', 'wrongpassword') is None
+
     # Get an existing user by id and verify fields
     def test_get_user_success(self, app, sample_user):
         with app.app_context():
@@ -263,3 +286,40 @@ class TestUserService:
             password_hash = user_service.generate_password_hash('mypassword')
             result = user_service.check_password_hash(password_hash, 'wrongpassword')
             assert result is False
+
+    # Session identities are served from the cache after the first load
+    def test_load_session_user_cached(self, app, count_queries, sample_user):
+        from app.services.cache import user_cache
+        with app.app_context():
+            user_service = UserService()
+            first = user_service.load_session_user(sample_user)
+            with count_queries() as statements:
+                second = user_service.load_session_user(sample_user)
+            assert statements == []
+            assert second is first
+            assert second.get_id() == str(sample_user)
+            assert second.is_active is True
+            assert user_cache.stats()['hits'] >= 1
+
+    # Profile updates drop the cached identity so the next load sees new fields
+    def test_load_session_user_invalidated_by_update(self, app, sample_user):
+        from datetime import date
+        with app.app_context():
+            user_service = UserService()
+            user_service.load_session_user(sample_user)
+            user_service.update_user_profile(
+                user_id=sample_user,
+                name='Renamed User',
+                email='renamed@example.com',
+                phone='5550009999',
+                birthday=date(1990, 1, 1)
+            )
+            assert user_service.load_session_user(sample_user).name == 'Renamed User'
+
+    # Deleted users no longer load
+    def test_load_session_user_invalidated_by_delete(self, app, sample_user):
+        with app.app_context():
+            user_service = UserService()
+            user_service.load_session_user(sample_user)
+            user_service.delete_user(sample_user)
+            assert user_service.load_session_user(sample_user) is None
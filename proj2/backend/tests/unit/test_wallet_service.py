@@ -0,0 +1,95 @@
+import pytest
+import threading
+from decimal import Decimal
+from app.services.wallet_service import WalletService
+from app.models import PaymentMethods, PaymentTransactions
+from app.app import db
+
+
+# Tests for wallet_service.py
+class TestWalletService:
+    # Debit lowers the balance in one statement and records a charge
+    def test_debit_success_records_charge(self, app, count_queries, sample_payment_method):
+        with app.app_context():
+            with count_queries() as statements:
+                charged = WalletService().debit(sample_payment_method, Decimal('30.25'))
+            db.session.commit()
+            assert charged is True
+            assert any(s.lstrip().upper().startswith('UPDATE') for s in statements)
+            assert not any(s.lstrip().upper().startswith('SELECT') for s in statements)
+            assert float(db.session.get(PaymentMethods, sample_payment_method).balance) == 69.75
+            entry = PaymentTransactions.query.filter_by(payment_method_id=sample_payment_method).one()
+            assert entry.kind == 'charge'
+            assert float(entry.amount) == 30.25
+
+    # Debit returns False and leaves no trace when funds are insufficient
+    def test_debit_insufficient_funds(self, app, sample_payment_method_low_balance):
+        with app.app_context():
+            charged = WalletService().debit(sample_payment_method_low_balance, Decimal('5.01'))
+            db.session.commit()
+            assert charged is False
+            assert float(db.session.get(PaymentMethods, sample_payment_method_low_balance).balance) == 5.00
+            assert PaymentTransactions.query.count() == 0
+
+    # Credit raises a top-up and refuses unknown payment methods
+    def test_credit_top_up_and_missing_method(self, app, sample_payment_method):
+        with app.app_context():
+            svc = WalletService()
+            svc.credit(sample_payment_method, 12.5)
+            db.session.commit()
+            assert float(db.session.get(PaymentMethods, sample_payment_method).balance) == 112.50
+            with pytest.raises(ValueError, match="Payment method not found"):
+                svc.credit(99999, 1)
+
+    # Zero amounts succeed without a ledger row; negative amounts are rejected
+    def test_zero_and_negative_amounts(self, app, sample_payment_method):
+        with app.app_context():
+            svc = WalletService()
+            assert svc.debit(sample_payment_method, 0) is True
+            svc.credit(sample_payment_method, Decimal('0.00'), kind='refund')
+            db.session.commit()
+            assert float(db.session.get(PaymentMethods, sample_payment_method).balance) == 100.00
+            assert PaymentTransactions.query.count() == 0
+            with pytest.raises(ValueError, match="negative"):
+                svc.debit(sample_payment_method, -1)
+            with pytest.raises(ValueError, match="negative"):
+                svc.credit(sample_payment_method, -1)
+
+    # History is returned newest first
+    def test_get_transactions_newest_first(self, app, sample_payment_method):
+        with app.app_context():
+            svc = WalletService()
+            svc.debit(sample_payment_method, 10)
+            svc.credit(sample_payment_method, 10, kind='refund')
+            db.session.commit()
+            kinds = [t.kind for t in svc.get_transactions(sample_payment_method)]
+            assert kinds == ['refund', 'charge']
+
+    # Concurrent charges never spend more than the balance
+    def test_debit_concurrent_no_overdraft(self, app, sample_payment_method):
+        thread_count = 10
+        barrier = threading.Barrier(thread_count)
+        outcomes = []
+        lock = threading.Lock()
+
+        def charge():
+            with app.app_context():
+                barrier.wait()
+                try:
+                    result = WalletService().debit(sample_payment_method, Decimal('30.00'))
+                    db.session.commit()
+                finally:
+                    db.session.remove()
+                with lock:
+                    outcomes.append(result)
+
+        threads = [threading.Thread(target=charge) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            assert outcomes.count(True) == 3
+            assert float(db.session.get(PaymentMethods, sample_payment_method).balance) == 10.00
+            assert PaymentTransactions.query.filter_by(kind='charge').count() == 3
@@ -241,12 +241,19 @@ export default function CheckoutPage() {
    */
   const loadProducts = async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/products/menu`, {
-        credentials: 'include',
-      });
-      if (!response.ok) throw new Error('Failed to fetch products.');
-      const data = await response.json();
-      setProducts(data.products);
+      const allProducts: any[] = [];
+      let cursor: string | null = null;
+      do {
+        const query: string = cursor ? `?after=${encodeURIComponent(cursor)}` : '';
+        const response = await fetch(`${API_BASE_URL}/products/menu${query}`, {
+          credentials: 'include',
+        });
+        if (!response.ok) throw new Error('Failed to fetch products.');
+        const data = await response.json();
+        allProducts.push(...data.products);
+        cursor = data.next_cursor || null;
+      } while (cursor);
+      setProducts(allProducts);
     } catch (error) {
       console.error('Error loading products:', error);
       setError('Could not load product data.');
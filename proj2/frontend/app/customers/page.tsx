@@ -101,11 +101,19 @@ export default function CustomerDashboardPage() {
      */
     const fetchDeliveries = async () => {
         try {
-            const res = await fetch(
-                `http://localhost:5000/api/customers/${customerId}/deliveries`
-            );
-            const data = await res.json();
-            setDeliveries(data.deliveries || []);
+            // Deliveries are paginated; follow next_cursor until the last page
+            const allDeliveries: any[] = [];
+            let cursor: string | null = null;
+            do {
+                const query: string = cursor ? `?after=${encodeURIComponent(cursor)}` : '';
+                const res = await fetch(
+                    `http://localhost:5000/api/customers/${customerId}/deliveries${query}`
+                );
+                const data = await res.json();
+                allDeliveries.push(...(data.deliveries || []));
+                cursor = data.next_cursor || null;
+            } while (cursor);
+            setDeliveries(allDeliveries);
         } catch (err) {
             console.error(err);
         } finally {
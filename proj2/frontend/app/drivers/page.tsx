@@ -86,17 +86,28 @@ export default function DriverDashboardPage() {
     /** Fetch driver data + active + history */
     const fetchAllDriverData = async () => {
         try {
-            const [driverRes, activeRes, historyRes] = await Promise.all([
+            const [driverRes, activeRes] = await Promise.all([
                 fetch(`http://localhost:5000/api/driver/${driverId}`),
                 fetch(
                     `http://localhost:5000/api/driver/${driverId}/active-delivery`
                 ),
-                fetch(`http://localhost:5000/api/driver/${driverId}/history`),
             ]);
 
             const driverData = await driverRes.json();
             const activeData = await activeRes.json();
-            const historyData = await historyRes.json();
+
+            // History is paginated; follow next_cursor until the last page
+            const history: any[] = [];
+            let cursor: string | null = null;
+            do {
+                const query: string = cursor ? `?after=${encodeURIComponent(cursor)}` : '';
+                const historyRes = await fetch(
+                    `http://localhost:5000/api/driver/${driverId}/history${query}`
+                );
+                const historyData = await historyRes.json();
+                history.push(...(historyData.history || []));
+                cursor = historyData.next_cursor || null;
+            } while (cursor);
 
             setDriver(driverData.driver);
             setVehicleForm({
@@ -106,7 +117,7 @@ export default function DriverDashboardPage() {
             });
 
             setActiveDelivery(activeData.active_delivery || null);
-            setDeliveryHistory(historyData.history || []);
+            setDeliveryHistory(history);
         } catch (err) {
             console.error(err);
         }
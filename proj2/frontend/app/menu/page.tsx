@@ -163,19 +163,29 @@ const App = () => {
       // 1. FETCH SUPPLIERS FIRST
       const suppliers = await fetchSuppliers(); // Gets the ID -> Name Map
 
-      // 2. FETCH PRODUCTS using the new /products/menu route
-      const response = await exponentialBackoffFetch('http://localhost:5000/api/products/menu', {
-        method: 'GET',
-        // NOTE: No headers or body are needed for this standard GET route!
-      });
-
-      if (!response) throw new Error("Network request failed or returned no response.");
-
-      const data = await response.json();
-      if (data.error) throw new Error(data.error);
+      // 2. FETCH PRODUCTS using the paginated /products/menu route, following next_cursor
+      const allProducts: any[] = [];
+      let cursor: string | null = null;
+      do {
+        const url: string = cursor
+          ? `http://localhost:5000/api/products/menu?after=${encodeURIComponent(cursor)}`
+          : 'http://localhost:5000/api/products/menu';
+        const response = await exponentialBackoffFetch(url, {
+          method: 'GET',
+          // NOTE: No headers or body are needed for this standard GET route!
+        });
+
+        if (!response) throw new Error("Network request failed or returned no response.");
+
+        const data = await response.json();
+        if (data.error) throw new Error(data.error);
+
+        allProducts.push(...data.products);
+        cursor = data.next_cursor || null;
+      } while (cursor);
 
       // 3. ENRICH AND SANITIZE PRODUCT DATA
-      const enrichedProducts = data.products.map((p: any) => {
+      const enrichedProducts = allProducts.map((p: any) => {
         // Find the supplier name using the product's supplier_id
         const name = suppliers[String(p.supplier_id)] || "Unknown Supplier";
 
@@ -134,22 +134,35 @@ export default function StaffPage() {
         }
         setStaff(staffList);
 
+        // Pending deliveries are listed first through ?status=pending, then the rest of the
+        // history; both are paginated, so follow next_cursor until the last page
         const deliveryList: Delivery[] = [];
+        const seen = new Set<number>();
         for (const theatre of theatreData.theatres || []) {
-          const res = await fetch(
-            `http://localhost:5000/api/deliveries/list/${theatre.id}`
-          );
-          const data = await res.json();
-          deliveryList.push(
-            ...(data.deliveries || []).map((d: any) => ({
-              id: d.id,
-              productName: 'Order',
-              theatreName: theatre.name,
-              quantity: 1,
-              delivery_status: d.delivery_status,
-              staff_id: d.staff_id,
-            }))
-          );
+          for (const filter of ['status=pending', '']) {
+            let cursor: string | null = null;
+            do {
+              const params: string[] = [filter, cursor ? `after=${encodeURIComponent(cursor)}` : ''].filter(Boolean);
+              const query: string = params.length ? `?${params.join('&')}` : '';
+              const res = await fetch(
+                `http://localhost:5000/api/deliveries/list/${theatre.id}${query}`
+              );
+              const data = await res.json();
+              for (const d of data.deliveries || []) {
+                if (seen.has(d.id)) continue;
+                seen.add(d.id);
+                deliveryList.push({
+                  id: d.id,
+                  productName: 'Order',
+                  theatreName: theatre.name,
+                  quantity: 1,
+                  delivery_status: d.delivery_status,
+                  staff_id: d.staff_id,
+                });
+              }
+              cursor = data.next_cursor || null;
+            } while (cursor);
+          }
         }
         console.log(deliveryList);
         setDeliveries(deliveryList);